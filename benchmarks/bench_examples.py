@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Geometry-kernel benchmark over the curated examples corpus.
+
+Runs every script in src/utilities/prompts/context/examples.yaml and
+examples_expert.yaml through ValidationWorker, tessellation, both exporters
+and the off-screen thumbnail renderer, without any LLM calls. For each example
+it reports the median time per phase and the peak RSS growth (sampled, so OCC
+allocations are included), then compares them with the stored baseline.
+
+The corpus is stored for prompting rather than execution, so scripts are
+adapted first: literal "\\n" escapes are decoded, stray indentation is
+stripped when that makes a script parse, and scripts that never assign
+``result`` get ``result = <last assigned name>`` appended (the expert corpus
+uses ``solid``), with an assembly flattened to its compound. Scripts that
+still fail are reported, not skipped.
+
+Phases run in order on fresh shapes each repeat: exec, tessellate (tolerance
+0.1, as used for display), export_step, export_stl (meshes again at the
+exporter's finer tolerance) and render.
+
+Usage: python benchmarks/bench_examples.py [--repeat N] [--filter TEXT] [--no-render]
+                                           [--save-baseline] [--check] [--tolerance 0.25]
+"""
+import argparse
+import ast
+import json
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import cadquery as cq
+import yaml
+from loguru import logger
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler import shape_io
+from src.output_handler.exporter import export_model_with_name
+from src.output_handler.visualizer import visualizer
+from src.utilities.memory import rss_bytes
+from src.workers.validation_worker import ValidationWorker
+
+CONTEXT_DIR = project_root / "src" / "utilities" / "prompts" / "context"
+CORPORA = {"basic": "examples.yaml", "expert": "examples_expert.yaml"}
+BASELINE_PATH = Path(__file__).parent / "baselines" / "examples.json"
+PHASES = ("exec", "tessellate", "export_step", "export_stl", "render")
+# Differences below this are timer and scheduler noise, whatever the ratio.
+NOISE_FLOOR = 0.005
+
+_ESCAPES = {"n": "\n", "t": "\t", '"': '"', "'": "'"}
+
+
+@dataclass
+class Example:
+    id: str
+    name: str
+    code: str
+
+
+def as_script(code: str) -> str:
+    """Turn a corpus entry into a runnable script that assigns ``result``."""
+    if "\\n" in code:
+        code = re.sub(r"\\([nt\"'])", lambda match: _ESCAPES[match.group(1)], code)
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        stripped = "\n".join(line.lstrip() for line in code.splitlines())
+        try:
+            tree = ast.parse(stripped)
+        except SyntaxError:
+            return code  # reported as the example's error
+        code = stripped
+
+    assigned = [
+        node.targets[0].id
+        for node in tree.body
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+    ]
+    if assigned and "result" not in assigned:
+        code += (
+            f"\nresult = {assigned[-1]}\n"
+            "if isinstance(result, cq.Assembly):\n"
+            "    result = cq.Workplane('XY').newObject([result.toCompound()])\n"
+        )
+    return code
+
+
+def load_examples() -> List[Example]:
+    examples = []
+    for corpus, filename in CORPORA.items():
+        for entry in yaml.safe_load((CONTEXT_DIR / filename).read_text(encoding="utf-8")):
+            examples.append(Example(
+                id=f"{corpus}-{int(entry['#']):02d}",
+                name=str(entry.get("Name of Part", "")).strip(),
+                code=as_script(entry["Code"]),
+            ))
+    return examples
+
+
+class PeakRSS:
+    """Samples process RSS on a background thread; ``peak_mb`` is the growth over the starting RSS."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "PeakRSS":
+        self._start = self._peak = rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._peak = max(self._peak, rss_bytes())
+        self.peak_mb = (self._peak - self._start) / (1024 * 1024)
+        return False
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, rss_bytes())
+
+
+def run_once(example: Example, worker: ValidationWorker, workdir: Path, render: bool) -> Dict[str, Any]:
+    timings: Dict[str, Any] = {}
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        validation = worker.validate(example.code)
+        timings["exec"] = time.perf_counter() - start
+        if not validation["success"]:
+            return {"status": "error", "error": validation["error"]}
+        model = validation["object"]
+
+        start = time.perf_counter()
+        shape_io.to_shape(model).tessellate(0.1, 0.2)
+        timings["tessellate"] = time.perf_counter() - start
+
+        for fmt in ("step", "stl"):
+            start = time.perf_counter()
+            export_model_with_name(model, str(workdir), example.id, format=fmt)
+            timings[f"export_{fmt}"] = time.perf_counter() - start
+
+        if render:
+            start = time.perf_counter()
+            rendered = visualizer.generate_thumbnail(model, str(workdir / f"{example.id}.png"))
+            timings["render"] = time.perf_counter() - start if rendered else None
+        del model, validation
+
+    timings["peak_rss_mb"] = rss.peak_mb
+    return {"status": "success", **timings}
+
+
+def uncached_worker() -> ValidationWorker:
+    """No incremental executor or disk cache: every run builds the geometry from scratch."""
+    return ValidationWorker(incremental=False, cache=False, profile=False)
+
+
+def run_example(example: Example, repeat: int, workdir: Path, render: bool) -> Dict[str, Any]:
+    worker = uncached_worker()
+    runs = [run_once(example, worker, workdir, render) for _ in range(repeat)]
+    if any(run["status"] != "success" for run in runs):
+        return next(run for run in runs if run["status"] != "success")
+
+    summary: Dict[str, Any] = {"status": "success"}
+    for phase in PHASES:
+        values = [run.get(phase) for run in runs]
+        summary[phase] = statistics.median(values) if all(value is not None for value in values) else None
+    summary["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+    return summary
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Regressions of more than ``tolerance`` (fraction) against the baseline, one line each."""
+    regressions = []
+    for example_id, result in results.items():
+        base = baseline.get(example_id)
+        if base is None:
+            continue
+        if base["status"] == "success" and result["status"] != "success":
+            regressions.append(f"{example_id}: now fails ({result['error']})")
+            continue
+        for phase in PHASES:
+            current, previous = result.get(phase), base.get(phase)
+            if current is None or previous is None:
+                continue
+            if current > previous * (1 + tolerance) and current - previous > NOISE_FLOOR:
+                regressions.append(
+                    f"{example_id}: {phase} {previous * 1e3:.1f} -> {current * 1e3:.1f} ms "
+                    f"({current / previous:.2f}x)"
+                )
+    return regressions
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1e3:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per example; the median is reported")
+    parser.add_argument("--filter", help="Only run examples whose id or name contains this text")
+    parser.add_argument("--no-render", action="store_true", help="Skip the thumbnail renderer")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any example regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    logger.disable("src")
+    examples = load_examples()
+    if args.filter:
+        needle = args.filter.lower()
+        examples = [example for example in examples if needle in example.id or needle in example.name.lower()]
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text())["examples"] if baseline_path.exists() else {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    header = f"{'example':<10} " + " ".join(f"{phase + ' ms':>13}" for phase in PHASES) + f" {'peak MiB':>9}  vs base"
+    print(header)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Load the OCC, exporter and VTK libraries before anything is measured.
+        warm_up = Example("warm-up", "", "import cadquery as cq\nresult = cq.Workplane().box(1, 1, 1)\n")
+        run_once(warm_up, uncached_worker(), Path(tmp), not args.no_render)
+
+        for example in examples:
+            result = results[example.id] = run_example(example, args.repeat, Path(tmp), not args.no_render)
+            if result["status"] != "success":
+                print(f"{example.id:<10} FAILED: {result['error']}")
+                continue
+            base = baseline.get(example.id, {})
+            total = sum(result[phase] or 0 for phase in PHASES)
+            base_total = sum(base.get(phase) or 0 for phase in PHASES) if base.get("status") == "success" else 0
+            ratio = f"{total / base_total:6.2f}x" if base_total else "      -"
+            print(
+                f"{example.id:<10} " + " ".join(f"{_ms(result[phase]):>13}" for phase in PHASES)
+                + f" {result['peak_rss_mb']:9.1f}  {ratio}"
+            )
+
+    succeeded = [result for result in results.values() if result["status"] == "success"]
+    print()
+    print(f"{len(succeeded)}/{len(results)} examples ran; totals per phase (ms):")
+    for phase in PHASES:
+        values = [result[phase] for result in succeeded if result[phase] is not None]
+        print(f"  {phase:<12} {sum(values) * 1e3:10.1f}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if baseline:
+        print()
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+        else:
+            print(f"No regressions beyond {args.tolerance:.0%} against {baseline_path}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "python": platform.python_version(),
+            "cadquery": cq.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        }
+        baseline_path.write_text(json.dumps({"meta": meta, "examples": results}, indent=2, sort_keys=True))
+        print(f"Baseline saved to {baseline_path}")
+
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
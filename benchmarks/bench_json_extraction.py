@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for SpecWorker response parsing.
+
+Compares the previous parse (fence regex + json.loads + ast.literal_eval round trip)
+with the tolerant single-pass extractor over the response corpus, reporting the
+parse failure rate and mean parse time per response.
+
+Usage: python benchmarks/bench_json_extraction.py [--repeat N]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from ast import literal_eval
+from pathlib import Path
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utilities.json_extractor import extract_json_object
+
+CORPUS_PATH = Path(__file__).parent / "corpus" / "spec_responses.yaml"
+
+
+def legacy_parse(llm_response: str) -> dict:
+    """The parse SpecWorker used before the tolerant extractor."""
+    cleaned_response = re.sub(r'```(json)?\s*|\s*```', '', llm_response, flags=re.IGNORECASE).strip()
+    if not cleaned_response:
+        raise ValueError("empty response")
+    try:
+        data = json.loads(cleaned_response)
+    except json.JSONDecodeError:
+        data = json.loads(json.dumps(literal_eval(cleaned_response)))
+    if not isinstance(data, dict):
+        raise ValueError("not an object")
+    return data
+
+
+def load_corpus() -> list:
+    return yaml.safe_load(CORPUS_PATH.read_text(encoding="utf-8"))
+
+
+def run_parser(parser, corpus: list, repeat: int) -> dict:
+    """Run ``parser`` over the corpus and collect per-entry correctness and mean time."""
+    results = {}
+    for entry in corpus:
+        ok = True
+        start = time.perf_counter()
+        for _ in range(repeat):
+            try:
+                parser(entry["response"])
+            except Exception:
+                ok = False
+        elapsed = (time.perf_counter() - start) / repeat
+        results[entry["name"]] = {
+            "correct": ok == (entry["expect"] == "valid"),
+            "seconds": elapsed,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spec JSON extraction")
+    parser.add_argument("--repeat", type=int, default=200, help="Parses per corpus entry")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"Corpus: {len(corpus)} responses ({sum(e['expect'] == 'valid' for e in corpus)} recoverable)")
+
+    runs = {name: run_parser(fn, corpus, args.repeat)
+            for name, fn in (("legacy", legacy_parse), ("extractor", extract_json_object))}
+
+    # Time is only comparable on responses both parsers handle correctly.
+    common = [e["name"] for e in corpus if all(run[e["name"]]["correct"] for run in runs.values())]
+
+    print(f"{'parser':<12} {'wrong':>6} {'rate':>7} {'mean/parse':>12} {'mean/parse (common)':>20}")
+    for name, run in runs.items():
+        wrong = [entry for entry, r in run.items() if not r["correct"]]
+        mean_all = sum(r["seconds"] for r in run.values()) / len(run) * 1e6
+        mean_common = sum(run[entry]["seconds"] for entry in common) / max(len(common), 1) * 1e6
+        print(f"{name:<12} {len(wrong):>6} {len(wrong) / len(corpus):>7.1%} "
+              f"{mean_all:>9.1f} us {mean_common:>17.1f} us")
+        if wrong:
+            print(f"   mis-handled: {', '.join(wrong)}")
+
+
+if __name__ == "__main__":
+    main()
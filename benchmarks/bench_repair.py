@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Repair-loop benchmark: two-call feedback repair vs single-call repair.
+
+Every case in corpus/repair_cases.yaml starts from the same failing first
+attempt (CodeWorker's first answer is the corpus code). The director then runs
+its repair loop in each REPAIR_MODE:
+
+  feedback  FeedbackWorker advice, then CodeWorker writes new code (2 calls)
+  single    RepairWorker returns the fixed code directly (1 call)
+
+Reported per mode: LLM calls and tokens, and the time from the first failure
+to a valid part; with ``--live`` also success rate and iterations.
+
+Offline (default) the workers talk to a scripted backend that answers with
+the corpus fix and advice, and LLM latency is modelled as
+``--ttft + completion_tokens / --tokens-per-second`` per call instead of slept,
+so the comparison shows the cost of the call structure only. Every scripted
+repair succeeds at once, so success rate and iterations are not reported
+offline; they compare the two modes only with ``--live``, where the
+configured backends are called and wall-clock time is reported.
+
+Usage: python benchmarks/bench_repair.py [--live] [--repeat N] [--filter TEXT] [--max-iterations 3]
+                                         [--ttft 0.8] [--tokens-per-second 60]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+from loguru import logger
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.iteration_policy import BudgetIterationPolicy
+from src.utilities.llm_backends import DeterministicBackend, close_backends
+from src.utilities.usage import UsageTracker, track_usage
+from src.workers.code_worker import CodeWorker
+from src.workers.feedback_worker import FeedbackWorker
+from src.workers.repair_worker import RepairWorker
+from src.workers.validation_worker import ValidationWorker
+
+CORPUS_PATH = Path(__file__).parent / "corpus" / "repair_cases.yaml"
+MODES = ("feedback", "single")
+
+
+def load_cases() -> List[Dict[str, Any]]:
+    return yaml.safe_load(CORPUS_PATH.read_text(encoding="utf-8"))
+
+
+class LatencyModel:
+    """Books the time an LLM call would have taken: time to first token plus output at a fixed rate."""
+
+    def __init__(self, ttft: float, tokens_per_second: float):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.seconds = 0.0
+
+    def book(self, completion_tokens: int):
+        self.seconds += self.ttft + completion_tokens / self.tokens_per_second
+
+
+class ScriptedBackend(DeterministicBackend):
+    """Always gives ``answer``, like a model that gets the fix right first time; the latency is booked, not slept."""
+
+    def __init__(self, answer: str, latency: LatencyModel):
+        super().__init__(responder=lambda messages: answer)
+        self.latency = latency
+
+    async def chat_completion_with_usage(self, messages, **kwargs):
+        content, usage = await super().chat_completion_with_usage(messages, **kwargs)
+        self.latency.book(usage.completion_tokens)
+        return content, usage
+
+
+class SeededCodeWorker:
+    """CodeWorker whose first answer is the case's failing code; later calls go to ``worker``."""
+
+    def __init__(self, case: Dict[str, Any], worker: CodeWorker):
+        self.case = case
+        self.worker = worker
+        self.seeded = False
+
+    async def execute(self, specification, feedback=None, model=None):
+        if not self.seeded:
+            self.seeded = True
+            return self.case["code"]
+        return await self.worker.execute(specification, feedback, model=model)
+
+
+async def run_case(case: Dict[str, Any], mode: str, args) -> Dict[str, Any]:
+    policy = BudgetIterationPolicy(max_iterations=args.max_iterations, escalation_model="")
+    director = CadDirector(iteration_policy=policy, repair_mode=mode)
+    # Every run builds the geometry; a cached verdict would hide the validation cost.
+    director.validation_worker = ValidationWorker(incremental=False, cache=False, profile=False)
+
+    latency: Optional[LatencyModel] = None
+    code_backend = None
+    if not args.live:
+        latency = LatencyModel(args.ttft, args.tokens_per_second)
+        code_backend = ScriptedBackend(case["fixed"], latency)
+        director.feedback_worker = FeedbackWorker(backend=ScriptedBackend(case["advice"], latency))
+        director.repair_worker = RepairWorker(backend=ScriptedBackend(f"RATIONALE: {case['advice']}\n{case['fixed']}", latency))
+    director.code_worker = SeededCodeWorker(case, CodeWorker(backend=code_backend))
+
+    usage = UsageTracker()
+    start = time.perf_counter()
+    with track_usage(usage):
+        result = await director._generate_and_validate(case["spec"])
+    seconds = time.perf_counter() - start
+    if latency is not None:
+        seconds += latency.seconds
+
+    return {
+        "valid": result["status"] == "success",
+        "iterations": result.get("iterations"),
+        "calls": len(usage.records),
+        "tokens": usage.total.total_tokens,
+        "seconds": seconds,
+    }
+
+
+def summarise(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    valid = [run for run in runs if run["valid"]]
+    return {
+        "success_rate": len(valid) / len(runs) if runs else 0.0,
+        "iterations": statistics.mean(run["iterations"] for run in valid) if valid else None,
+        "calls": statistics.mean(run["calls"] for run in runs) if runs else 0.0,
+        "tokens": statistics.mean(run["tokens"] for run in runs) if runs else 0.0,
+        "time_to_valid": statistics.median(run["seconds"] for run in valid) if valid else None,
+    }
+
+
+async def run(args):
+    try:
+        await compare_modes(args)
+    finally:
+        await close_backends()
+
+
+async def compare_modes(args):
+    cases = load_cases()
+    if args.filter:
+        cases = [case for case in cases if args.filter.lower() in case["name"].lower()]
+
+    # Scripted repairs always succeed first time: outcome columns only mean something live.
+    outcome_header = f" {'valid':>5} {'iter':>5}" if args.live else ""
+    print(f"{'case':<22} {'mode':<9}{outcome_header} {'calls':>6} {'tokens':>7} {'seconds':>8}")
+    runs: Dict[str, List[Dict[str, Any]]] = {mode: [] for mode in MODES}
+    for case in cases:
+        for mode in MODES:
+            for _ in range(args.repeat):
+                result = await run_case(case, mode, args)
+                runs[mode].append(result)
+                outcome = f" {'yes' if result['valid'] else 'no':>5} {result['iterations'] or '-':>5}" if args.live else ""
+                print(
+                    f"{case['name']:<22} {mode:<9}{outcome} "
+                    f"{result['calls']:>6} {result['tokens']:>7} {result['seconds']:8.2f}"
+                )
+
+    summaries = {mode: summarise(mode_runs) for mode, mode_runs in runs.items()}
+    print()
+    print("LLM time is " + ("wall clock" if args.live else
+          f"modelled: {args.ttft}s to first token + {args.tokens_per_second:g} tokens/s"))
+    if not args.live:
+        print("Success rate and iterations are only measured with --live (scripted repairs always succeed)")
+    outcome_header = f" {'success':>8} {'iter':>6}" if args.live else ""
+    print(f"{'mode':<9}{outcome_header} {'calls':>6} {'tokens':>8} {'median time-to-valid':>21}")
+    for mode, summary in summaries.items():
+        outcome = ""
+        if args.live:
+            iterations = f"{summary['iterations']:6.2f}" if summary["iterations"] is not None else f"{'-':>6}"
+            outcome = f" {summary['success_rate']:8.0%} {iterations}"
+        time_to_valid = f"{summary['time_to_valid']:20.2f}s" if summary["time_to_valid"] is not None else f"{'-':>21}"
+        print(f"{mode:<9}{outcome} {summary['calls']:6.2f} {summary['tokens']:8.0f} {time_to_valid}")
+
+    feedback, single = summaries["feedback"]["time_to_valid"], summaries["single"]["time_to_valid"]
+    if feedback and single:
+        print(f"\nSingle-call repair: {single / feedback:.2f}x the time-to-valid of the feedback loop")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="Call the configured LLM backends instead of the scripted one")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case and mode")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--max-iterations", type=int, default=3, help="Attempts per case, including the failing first one")
+    parser.add_argument("--ttft", type=float, default=0.8, help="Modelled seconds to first token per call (offline)")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Modelled output rate (offline)")
+    args = parser.parse_args()
+
+    logger.disable("src")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Round-trip benchmark for shape serialisation.
+
+Writes and reads a set of representative parts as STEP (exporter.py's format),
+text BREP and the shape_io binary BREP container (plain, zlib-compressed and
+without the bbox/volume header), reporting mean write/read time and size per
+format. Each shape is rebuilt per round trip so that cached bounding boxes and
+triangulations do not flatter later runs.
+
+Usage: python benchmarks/bench_shape_io.py [--repeat N]
+"""
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cadquery as cq
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler import shape_io
+
+
+def mounting_plate():
+    plate = cq.Workplane("XY").box(80, 60, 10)
+    plate = plate.faces(">Z").workplane().rarray(60, 40, 2, 2).cboreHole(6, 10, 4)
+    return plate.edges("|Z").fillet(5)
+
+
+def flange():
+    profile = cq.Workplane("XZ").polyline([(10, 0), (40, 0), (40, 8), (18, 8), (18, 30), (10, 30)]).close()
+    body = profile.revolve(360, (0, 0, 0), (0, 1, 0))
+    return body.faces(">Z").workplane().polarArray(30, 0, 360, 8).hole(5)
+
+
+def shelled_housing():
+    return cq.Workplane("XY").box(50, 40, 30).edges().fillet(4).faces(">Z").shell(-2)
+
+
+def lofted_nozzle():
+    return cq.Workplane("XY").circle(20).workplane(offset=40).rect(12, 8).loft()
+
+
+def pin_array():
+    pins = cq.Workplane("XY").rarray(10, 10, 6, 6).circle(2).extrude(15)
+    return cq.Workplane("XY").newObject([cq.Compound.makeCompound(pins.vals())])
+
+
+PARTS = {
+    "mounting_plate": mounting_plate,
+    "flange": flange,
+    "shelled_housing": shelled_housing,
+    "lofted_nozzle": lofted_nozzle,
+    "pin_array": pin_array,
+}
+
+
+def step_round_trip(shape, workdir: Path):
+    path = workdir / "part.step"
+    start = time.perf_counter()
+    shape.exportStep(str(path))
+    written = time.perf_counter()
+    cq.importers.importStep(str(path))
+    return written - start, time.perf_counter() - written, path.stat().st_size
+
+
+def brep_round_trip(shape, workdir: Path):
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    shape.exportBrep(buffer)
+    written = time.perf_counter()
+    buffer.seek(0)
+    cq.Shape.importBrep(buffer)
+    return written - start, time.perf_counter() - written, len(buffer.getvalue())
+
+
+def shape_io_round_trip(compress, metadata=True):
+    def round_trip(shape, workdir: Path):
+        start = time.perf_counter()
+        data = shape_io.dumps_view(shape, compress=compress, metadata=metadata)
+        written = time.perf_counter()
+        shape_io.loads(data)
+        return written - start, time.perf_counter() - written, len(data)
+    return round_trip
+
+
+FORMATS = {
+    "step": step_round_trip,
+    "brep (text)": brep_round_trip,
+    "shape_io": shape_io_round_trip(False),
+    "shape_io+zlib": shape_io_round_trip(True),
+    "shape_io -meta": shape_io_round_trip(False, metadata=False),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Round trips per part and format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"{'part':<16} {'format':<14} {'write ms':>9} {'read ms':>9} {'size KiB':>9}")
+        totals = {fmt: [0.0, 0.0, 0] for fmt in FORMATS}
+        for name, build in PARTS.items():
+            for fmt, round_trip in FORMATS.items():
+                runs = [round_trip(shape_io.to_shape(build()), workdir) for _ in range(args.repeat)]
+                write = sum(r[0] for r in runs) / len(runs)
+                read = sum(r[1] for r in runs) / len(runs)
+                size = runs[-1][2]
+                totals[fmt][0] += write
+                totals[fmt][1] += read
+                totals[fmt][2] += size
+                print(f"{name:<16} {fmt:<14} {write * 1e3:9.2f} {read * 1e3:9.2f} {size / 1024:9.1f}")
+
+        print()
+        step_time = totals["step"][0] + totals["step"][1]
+        for fmt, (write, read, size) in totals.items():
+            speedup = step_time / (write + read)
+            print(f"{'all parts':<16} {fmt:<14} {write * 1e3:9.2f} {read * 1e3:9.2f} {size / 1024:9.1f}  "
+                  f"({speedup:.1f}x vs STEP round trip, {size / totals['step'][2]:.2f}x size)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+The CLI commands: single prompts, batches, assemblies and parameter sweeps.
+
+Kept apart from main.py, which only parses the arguments, so that a CLI run
+that is forwarded to the daemon never imports CadQuery or VTK.
+"""
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
+import sys
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director import events
+from src.director.events import GenerationEvent
+from src.director.batch import run_batch, read_prompts
+from src.director.assembly import AssemblyDirector
+from src.director.sweep import ParameterSweep, parse_ranges, extract_parameters
+from src.director.model_stats import shared_store
+from src.output_handler.exporter import export_assembly
+from src.output_handler.visualizer import visualizer
+from src.output_handler.postprocess import PostProcessor, PostProcessResult
+from src.config.settings import settings
+
+
+async def run(args, warm_up=None, director: Optional[CadDirector] = None, sweep: Optional[ParameterSweep] = None):
+    """
+    Generate (and export) the requested model(s) with the parsed CLI arguments.
+
+    ``director`` and ``sweep`` are a director and a sweep pool to reuse (the
+    daemon keeps warm ones); by default they are built for this run.
+    """
+    if args.route_stats:
+        report_route_stats()
+        return
+
+    if args.sweep:
+        await run_sweep(args, sweep)
+        return
+
+    director = director or make_director(args)
+
+    if args.batch:
+        prompts = read_prompts(args.batch)
+        if warm_up:
+            await warm_up
+        manifest = await run_batch(
+            prompts, args.output, export_format=args.format[0], director=director, deadline=args.deadline
+        )
+        print(f"✅ Batch finished: {manifest['succeeded']} succeeded, {manifest['failed']} failed")
+        print(f"   Tokens: {manifest['usage']['total_tokens']}, cost: ${manifest['usage']['cost']:.4f}")
+        print(f"   Manifest: {Path(args.output) / 'manifest.json'}")
+        return
+
+    if args.assembly:
+        if warm_up:
+            await warm_up
+        await run_assembly(args, director)
+        return
+    
+    if warm_up:
+        await warm_up
+    if args.progress:
+        result = None
+        async for event in director.stream_from_prompt(args.prompt, deadline=args.deadline):
+            if event.type == events.RESULT:
+                result = event.data["result"]
+            else:
+                report_event(event)
+    else:
+        result = await director.generate_from_prompt(args.prompt, deadline=args.deadline)
+    
+    if result["status"] == "success":
+        print("✅ CAD model generated successfully!")
+        print(f"   Part: {result['specification']['part_name']}")
+        print(f"   Iterations: {result['iterations']}")
+        if "route" in result:
+            print(f"   Route: {result['route']}")
+        if result["code_fixes"]:
+            print(f"   Code fixes: {'; '.join(result['code_fixes'])}")
+        print(f"   Tokens: {result['usage']['total']['total_tokens']}, cost: ${result['usage']['total']['cost']:.4f}")
+        print(f"   Model ready for export to {args.output}")
+        if "profile" in result:
+            print(f"   Validation took {result['profile']['total_time']:.2f}s; slowest operations:")
+            for operation in result["profile"]["operations"][:5]:
+                print(f"     line {operation['line']}: {operation['operation']} {operation['total_time']:.3f}s "
+                      f"x{operation['calls']} -> {operation['faces']} faces")
+            print(f"   Flame graph stacks: {result['profile']['path']}")
+
+        # Exports run concurrently with the renders and the viewer; the
+        # handle releases the OCC shapes once they are all done.
+        with result["model"] as handle:
+            await PostProcessor().run(
+                handle.get(),
+                output_dir=None if args.no_export else args.output,
+                formats=args.format,
+                name=args.name,
+                thumbnail=args.thumbnail,
+                screenshot=args.screenshot,
+                view=args.visualize,
+                on_done=lambda task_result: report_post_processing(task_result, args),
+                split_bodies=args.split_bodies,
+            )
+        if args.no_export:
+            print("   Export skipped as per user request.")
+    else:
+        print("CAD generation failed.")
+        print(f" Error: {result['message']}")
+        if result.get("timed_out"):
+            progress = result["progress"]
+            print(f" Progress: {progress['attempts']} attempt(s) in {progress['elapsed']:.1f}s, stopped in {progress['stage']}")
+            if progress["last_error"]:
+                print(f" Last error: {progress['last_error']}")
+
+
+def make_director(args) -> CadDirector:
+    """The director for ``--repair`` and ``--profile``."""
+    director = CadDirector(repair_mode=args.repair)
+    if args.profile:
+        director.validation_worker.profile = True
+    return director
+
+
+def report_event(event: GenerationEvent):
+    """Print one progress event of a streamed generation."""
+    data = event.data
+    if event.type == events.SPEC_READY:
+        line = f"Specification ready: {data['specification'].get('part_name')}"
+    elif event.type == events.CODE_ATTEMPT:
+        line = f"Attempt {event.attempt}: {len(data['code'].splitlines())} lines of code from {data['worker']}"
+    elif event.type == events.VALIDATION:
+        line = f"Attempt {event.attempt} " + ("is valid" if data["success"] else f"failed: {data['error']}")
+    elif event.type == events.FEEDBACK:
+        line = f"Feedback: {data['feedback'][:100]}"
+    elif event.type == events.REPAIR:
+        line = f"Repair: {data['rationale'][:100]}"
+    elif event.type == events.PREVIEW:
+        line = f"Preview mesh: {len(data['triangles']) // 3} triangles"
+    elif event.type == events.MODEL_READY:
+        line = f"Model ready after {data['iterations']} attempt(s)"
+    else:
+        return
+    print(f"   [{event.elapsed:6.1f}s] {line}")
+
+
+def report_route_stats():
+    """Print latency and success rate of the direct and spec-first prompt routes."""
+    stats = shared_store(settings.model_stats_path).route_stats()
+    if not stats:
+        print("No routed generations recorded yet (PROMPT_ROUTING).")
+        return
+    print(f"   {'route':<8}{'runs':>6}{'success':>9}{'latency':>10}{'tokens':>9}{'attempts':>10}")
+    for route, route_stats in sorted(stats.items()):
+        print(
+            f"   {route:<8}{route_stats.generations:>6}{route_stats.success_rate:>9.0%}"
+            f"{route_stats.mean_latency:>9.1f}s{route_stats.mean_tokens:>9.0f}{route_stats.mean_iterations:>10.2f}"
+        )
+
+
+def report_post_processing(task_result: PostProcessResult, args):
+    """Print the outcome of one post-processing task as soon as it finishes."""
+    if task_result.task.startswith("export_"):
+        if task_result.success and isinstance(task_result.output, dict):
+            print(f"   Exported {task_result.output['body_count']} bodies, manifest: {task_result.output['manifest']}")
+        elif task_result.success:
+            print(f"   Exported to: {task_result.output}")
+        else:
+            print(f"Failed to export model: {task_result.error}")
+    elif task_result.task == "render":
+        if not task_result.success:
+            print(f"Rendering failed: {task_result.error}")
+            return
+        if args.screenshot in task_result.output:
+            print(f"   Screenshot saved to: {task_result.output[args.screenshot]}")
+        if args.thumbnail in task_result.output:
+            print(f"   Thumbnail saved to: {task_result.output[args.thumbnail]}")
+
+
+async def run_sweep(args, sweep: Optional[ParameterSweep] = None):
+    """
+    Run every combination of ``args.param`` over the script ``args.sweep`` and
+    print the results as they arrive. A given ``sweep`` is used and left open.
+    """
+    code = Path(args.sweep).read_text(encoding="utf-8")
+    try:
+        ranges = parse_ranges(args.param)
+    except ValueError as e:
+        print(f"Invalid sweep range: {e}")
+        return
+    output_dir = None if args.no_export else str(Path(args.output) / (args.name or "sweep"))
+
+    print(f"Script parameters: {extract_parameters(code)}")
+    valid = total = 0
+    with nullcontext(sweep) if sweep is not None else ParameterSweep() as sweep:
+        try:
+            async for variant in sweep.run(code, ranges, output_dir, formats=args.format, thumbnails=args.thumbnails):
+                total += 1
+                valid += variant.valid
+                values = " ".join(f"{name}={value}" for name, value in variant.parameters.items())
+                if variant.valid:
+                    print(f"   #{variant.index:04d} {values}  volume={variant.volume:.3f}  {variant.total_time:.2f}s")
+                else:
+                    print(f"   #{variant.index:04d} {values}  INVALID: {variant.error}")
+        except ValueError as e:
+            print(f"Sweep failed: {e}")
+            return
+
+    print(f"✅ Sweep finished: {valid}/{total} variants valid")
+    if output_dir:
+        print(f"   Results table: {Path(output_dir) / 'sweep.csv'}")
+
+
+async def run_assembly(args, director=None):
+    """Generate (and export) a multi-part assembly for ``args.prompt``."""
+    result = await AssemblyDirector(director).generate_from_prompt(args.prompt)
+
+    if result["status"] != "success":
+        print("Assembly generation failed.")
+        print(f" Error: {result['message']}")
+        return
+
+    print("✅ Assembly generated successfully!")
+    print(f"   Assembly: {result['specification']['assembly_name']}")
+    for name, part in result["parts"].items():
+        print(f"   Part: {name} ({part['iterations']} iterations)")
+    print(f"   Tokens: {result['usage']['total']['total_tokens']}, cost: ${result['usage']['total']['cost']:.4f}")
+
+    if args.visualize or args.screenshot:
+        try:
+            import cadquery as cq
+            combined = cq.Workplane("XY").newObject([result["assembly"].toCompound()])
+            screenshot_path = visualizer.visualize_model(combined, args.screenshot)
+            if screenshot_path:
+                print(f"   Screenshot saved to: {screenshot_path}")
+        except Exception as e:
+            print(f"Visualization failed: {e}")
+
+    if not args.no_export:
+        for fmt in args.format:
+            try:
+                export_path = export_assembly(result["assembly"], args.output, args.name, format=fmt)
+                print(f"   Exported to: {export_path}")
+            except Exception as e:
+                print(f"Failed to export assembly: {e}")
+    else:
+        print("   Export skipped as per user request.")
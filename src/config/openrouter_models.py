@@ -32,6 +32,15 @@ class OpenRouterModel(StrEnum):
             cls.DEEPSEEK_R1
         ]
     
+    @classmethod
+    def supports_structured_output(cls, model) -> bool:
+        """Whether the model accepts a JSON-schema ``response_format``."""
+        return model in {
+            cls.GOOGLE_GEMINI_FLASH,
+            cls.OPENAI_GPT_OSS,
+            cls.DEEPSEEK_R1,
+        }
+    
     @classmethod
     def get_model_info(cls, model_enum) -> dict:
         """Get information about a model."""
@@ -69,3 +78,21 @@ class OpenRouterModel(StrEnum):
         }
         return model_info.get(model_enum, {"name": str(model_enum), "free": False})
     
+    
+    @classmethod
+    def get_model_pricing(cls, model_enum) -> dict:
+        """
+        Get the price of a model in USD per million tokens (prompt, cached prompt, completion).
+        Unknown models are priced at zero so accounting never blocks a call.
+        """
+        free = {"prompt": 0.0, "cached": 0.0, "completion": 0.0}
+        model_pricing = {
+            cls.GOOGLE_GEMINI_FLASH: free,
+            cls.OPENAI_GPT_OSS: free,
+            cls.LLAMA_3_405B_INSTRUCT: free,
+            cls.DEEPSEEK_R1: free,
+            cls.MISTRAL_7B_INSTRUCT: {"prompt": 0.028, "cached": 0.028, "completion": 0.054},
+            cls.OPENAI_GPT4_TURBO: {"prompt": 10.0, "cached": 10.0, "completion": 30.0},
+            cls.ANTHROPIC_CLAUDE_3_SONNET: {"prompt": 3.0, "cached": 0.3, "completion": 15.0},
+        }
+        return model_pricing.get(model_enum, free)
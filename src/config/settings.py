@@ -1,8 +1,11 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 from typing import Optional
 from .openrouter_models import OpenRouterModel
 
+project_root = Path(__file__).parent.parent.parent
+
 class Settings(BaseSettings):
     # Configuration for OpenRouter
     openrouter_api_key: str = Field(..., validation_alias="OPENROUTER_API_KEY") 
@@ -16,10 +19,58 @@ class Settings(BaseSettings):
         validation_alias="DEFAULT_MODEL"
     )
 
+    # LLM backends: "openrouter", "local" (OpenAI-compatible server) or "deterministic"
+    llm_backend: str = Field("openrouter", validation_alias="LLM_BACKEND")
+    spec_worker_backend: Optional[str] = Field(None, validation_alias="SPEC_WORKER_BACKEND")
+    code_worker_backend: Optional[str] = Field(None, validation_alias="CODE_WORKER_BACKEND")
+    feedback_worker_backend: Optional[str] = Field(None, validation_alias="FEEDBACK_WORKER_BACKEND")
+    local_llm_base_url: str = Field("http://localhost:8080/v1", validation_alias="LOCAL_LLM_BASE_URL")
+    local_llm_model: str = Field("local-model", validation_alias="LOCAL_LLM_MODEL")
+    local_llm_api_key: Optional[str] = Field(None, validation_alias="LOCAL_LLM_API_KEY")
+    local_llm_structured_output: bool = Field(False, validation_alias="LOCAL_LLM_STRUCTURED_OUTPUT")
+
+    # Adaptive per-worker model routing from recorded history
+    model_routing: bool = Field(False, validation_alias="MODEL_ROUTING")
+    router_models: Optional[str] = Field(None, validation_alias="ROUTER_MODELS")
+    router_exploration_interval: int = Field(10, validation_alias="ROUTER_EXPLORATION_INTERVAL")
+    model_stats_path: str = Field(".cache/model_stats.sqlite3", validation_alias="MODEL_STATS_PATH")
+
     #Application settings
     log_level: str = Field("INFO", validation_alias="LOG_LEVEL")
     max_iterations: int = Field(5, validation_alias="MAX_ITERATIONS")
+    generation_deadline: Optional[float] = Field(None, validation_alias="GENERATION_DEADLINE")
+    validation_timeout: Optional[float] = Field(None, validation_alias="VALIDATION_TIMEOUT")
+    token_budget: Optional[int] = Field(None, validation_alias="TOKEN_BUDGET")
+    cost_budget: Optional[float] = Field(None, validation_alias="COST_BUDGET")
+    escalation_model: Optional[str] = Field(None, validation_alias="ESCALATION_MODEL")
+    code_normalization: bool = Field(True, validation_alias="CODE_NORMALIZATION")
+    # Simple prompts skip SpecWorker and go to DirectCodeWorker (see director/prompt_classifier.py)
+    prompt_routing: bool = Field(True, validation_alias="PROMPT_ROUTING")
+    # Repair loop: "feedback" (FeedbackWorker advice, then CodeWorker) or "single" (one RepairWorker call)
+    repair_mode: str = Field("feedback", validation_alias="REPAIR_MODE")
     request_timeout: int = Field(60, validation_alias="REQUEST_TIMEOUT")
+    http2: bool = Field(True, validation_alias="HTTP2")
+    http_max_connections: int = Field(20, validation_alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(10, validation_alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(30.0, validation_alias="HTTP_KEEPALIVE_EXPIRY")
+    http_warmup: bool = Field(True, validation_alias="HTTP_WARMUP")
+    structured_output: bool = Field(True, validation_alias="STRUCTURED_OUTPUT")
+    incremental_validation: bool = Field(True, validation_alias="INCREMENTAL_VALIDATION")
+    incremental_cache_size: int = Field(256, validation_alias="INCREMENTAL_CACHE_SIZE")
+    validation_cache: bool = Field(True, validation_alias="VALIDATION_CACHE")
+    validation_cache_dir: str = Field(".cache/validation", validation_alias="VALIDATION_CACHE_DIR")
+    validation_cache_max_mb: float = Field(256.0, validation_alias="VALIDATION_CACHE_MAX_MB")
+    validation_profile: bool = Field(False, validation_alias="VALIDATION_PROFILE")
+    validation_profile_dir: str = Field("outputs/profiles", validation_alias="VALIDATION_PROFILE_DIR")
+    slow_operation_seconds: float = Field(1.0, validation_alias="SLOW_OPERATION_SECONDS")
+    memory_ceiling_mb: Optional[float] = Field(None, validation_alias="MEMORY_CEILING_MB")
+    model_spill_dir: str = Field(".cache/spill", validation_alias="MODEL_SPILL_DIR")
+    sweep_workers: Optional[int] = Field(None, validation_alias="SWEEP_WORKERS")
+    preview_tolerance: float = Field(0.02, validation_alias="PREVIEW_TOLERANCE")
+    export_workers: Optional[int] = Field(None, validation_alias="EXPORT_WORKERS")
+    artifact_store: bool = Field(True, validation_alias="ARTIFACT_STORE")
+    artifact_store_dir: str = Field(".cache/artifacts", validation_alias="ARTIFACT_STORE_DIR")
+    daemon_socket: str = Field(".cache/daemon.sock", validation_alias="DAEMON_SOCKET")
 
     @field_validator("log_level")
     def validate_log_level(cls, v):
@@ -27,6 +78,21 @@ class Settings(BaseSettings):
         if v not in valid_levels:
             raise ValueError(f"Invalid log level: {v}. Must be one of {valid_levels}.")
         return v.upper()
+
+    @field_validator("model_stats_path", "validation_cache_dir", "model_spill_dir", "artifact_store_dir")
+    def resolve_cache_path(cls, v):
+        # State shared across runs lives under the project root, not the current
+        # directory: the daemon changes directory for every client it serves.
+        if v == ":memory:" or Path(v).is_absolute():
+            return v
+        return str(project_root / v)
+
+    @field_validator("repair_mode")
+    def validate_repair_mode(cls, v):
+        valid_modes = ["feedback", "single"]
+        if v.lower() not in valid_modes:
+            raise ValueError(f"Invalid repair mode: {v}. Must be one of {valid_modes}.")
+        return v.lower()
     
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Resident CADPilot daemon: keeps CadQuery/OCC, VTK, the prompts, the HTTP
+connection pool and the directors warm between CLI runs.
+
+    python src/daemon.py start     # serve in the foreground (Ctrl-C to stop)
+    python src/daemon.py status
+    python src/daemon.py stop
+
+While it is running, ``python src/main.py ...`` forwards its request over the
+Unix socket DAEMON_SOCKET and prints the daemon's output; when no daemon is
+listening (or with ``--no-daemon``) the CLI runs in-process as before.
+
+Protocol: one JSON object per line. The client sends one request
+(``{"command": "run", "args": {...}, "cwd": "..."}``, ``{"command": "ping"}`` or
+``{"command": "shutdown"}``); for ``run`` the daemon streams
+``{"type": "stdout" | "stderr", "text": ...}`` messages and finishes with
+``{"type": "exit", "code": ...}``.
+
+Requests are served one at a time, in the client's working directory. The
+daemon reads its settings (.env, API keys) when it starts, not per request.
+
+This module is imported by the CLI for the client side, so everything heavy
+is imported in the server only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from loguru import logger
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+
+# Big enough for any CLI request line.
+_STREAM_LIMIT = 1024 * 1024
+
+
+def socket_path(path: Optional[str] = None) -> Path:
+    """The daemon socket; a relative path is taken from the project root, so every shell finds the same daemon."""
+    path = Path(path or settings.daemon_socket)
+    return path if path.is_absolute() else project_root / path
+
+
+# --- client -----------------------------------------------------------------
+
+def _connect(path: Path) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request(message: Dict[str, Any], path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Send one request to the daemon and yield its replies until it closes the connection.
+
+    Raises:
+        OSError: If no daemon is listening on the socket.
+    """
+    with _connect(socket_path(path)) as sock:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("r", encoding="utf-8") as replies:
+            for line in replies:
+                yield json.loads(line)
+
+
+def is_running(path: Optional[str] = None) -> bool:
+    try:
+        return any(reply.get("type") == "status" for reply in request({"command": "ping"}, path))
+    except (OSError, ValueError):
+        return False
+
+
+def forward(args: argparse.Namespace, path: Optional[str] = None) -> Optional[int]:
+    """
+    Run a parsed CLI request on the daemon, echoing its output as it arrives.
+
+    Returns:
+        Optional[int]: The exit code, or None when no daemon is listening (run in-process instead).
+    """
+    message = {"command": "run", "args": vars(args), "cwd": os.getcwd()}
+    replies = request(message, path)
+    try:
+        reply = next(replies)
+    except (OSError, StopIteration, ValueError):
+        # Not listening, a stale socket, or a daemon that is going away.
+        return None
+
+    try:
+        while True:
+            if reply["type"] == "exit":
+                return reply["code"]
+            stream = sys.stderr if reply["type"] == "stderr" else sys.stdout
+            stream.write(reply["text"])
+            stream.flush()
+            reply = next(replies)
+    except StopIteration:
+        print("The daemon closed the connection before the request finished", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Lost the connection to the daemon: {e}", file=sys.stderr)
+    return 1
+
+
+# --- server -----------------------------------------------------------------
+
+class _ClientStream:
+    """
+    File-like object that sends what is written to it to one client. Created
+    on the event loop; writes from other threads (post-processing callbacks)
+    are handed to the loop.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, kind: str, loop: asyncio.AbstractEventLoop):
+        self.writer = writer
+        self.kind = kind
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+
+    def _send(self, data: bytes):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+    def write(self, text: str) -> int:
+        if text:
+            data = json.dumps({"type": self.kind, "text": text}).encode() + b"\n"
+            if threading.get_ident() == self.loop_thread:
+                self._send(data)
+            else:
+                self.loop.call_soon_threadsafe(self._send, data)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class DaemonServer:
+    """
+    Serves CLI requests over a Unix socket from one warm process.
+
+    The commands module (CadQuery, VTK, the directors) is imported and the
+    geometry kernel, renderer and HTTP connections are exercised once at start;
+    directors are kept per ``--repair``/``--profile`` combination, so their
+    workers, prompts and validation caches are reused by every request, and
+    the sweep worker pool is kept once a sweep has started it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = socket_path(path)
+        self.directors: Dict[Tuple[Optional[str], bool], Any] = {}
+        self.sweep = None
+        self.requests = 0
+        self.started = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._warm: Optional[asyncio.Task] = None
+
+    async def warm_up(self):
+        """Import and exercise everything a request needs before the first one arrives."""
+        start = time.perf_counter()
+        import cadquery as cq
+        from src import commands  # noqa: F401  (directors, exporters, post-processing)
+        from src.output_handler.visualizer import visualizer
+        from src.utilities.llm_backends import warm_up_backends
+
+        model = cq.Workplane("XY").box(1, 1, 1).edges().fillet(0.1)
+        model.val().Volume()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                await asyncio.to_thread(visualizer.generate_thumbnail, model, str(Path(directory) / "warm.png"))
+        except Exception as e:
+            logger.warning(f"Renderer warm-up failed: {e}")
+        self._director(argparse.Namespace(repair=None, profile=False))
+        if settings.http_warmup:
+            await warm_up_backends()
+        logger.success(f"Daemon warm in {time.perf_counter() - start:.1f}s")
+
+    def _director(self, args: argparse.Namespace):
+        from src.commands import make_director
+
+        key = (args.repair, args.profile)
+        if key not in self.directors:
+            self.directors[key] = make_director(args)
+        return self.directors[key]
+
+    async def serve(self):
+        """Listen until ``stop`` (or a ``shutdown`` request, SIGINT or SIGTERM)."""
+        from src.utilities.llm_backends import close_backends
+        from src.director.model_stats import close_stores
+
+        if self.path.exists():
+            if is_running(str(self.path)):
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = asyncio.Lock()
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread
+
+        # Listen straight away: requests that come in during warm-up wait for it instead of running cold.
+        server = await asyncio.start_unix_server(self._handle, path=str(self.path), limit=_STREAM_LIMIT)
+        os.chmod(self.path, 0o600)
+        logger.info(f"Daemon listening on {self.path} (pid {os.getpid()})")
+        self._warm = asyncio.create_task(self.warm_up())
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            if not self._warm.done():
+                self._warm.cancel()
+            if self.path.exists():
+                self.path.unlink()
+            if self.sweep is not None:
+                self.sweep.close()
+            await close_backends()
+            close_stores()
+            logger.info("Daemon stopped")
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            message = json.loads(await reader.readline() or "{}")
+            command = message.get("command")
+            if command == "ping":
+                await self._reply(writer, {
+                    "type": "status",
+                    "pid": os.getpid(),
+                    "uptime": time.monotonic() - self.started,
+                    "requests": self.requests,
+                    "warm": self._warm is not None and self._warm.done(),
+                })
+            elif command == "shutdown":
+                await self._reply(writer, {"type": "exit", "code": 0})
+                self.stop()
+            elif command == "run":
+                await self._run(message, writer)
+            else:
+                await self._reply(writer, {"type": "stderr", "text": f"Unknown daemon command: {command}\n"})
+                await self._reply(writer, {"type": "exit", "code": 2})
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Dropped daemon client: {e}")
+        finally:
+            writer.close()
+
+    async def _reply(self, writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    async def _run(self, message: Dict[str, Any], writer: asyncio.StreamWriter):
+        from src.commands import run
+        from src.director.sweep import ParameterSweep
+
+        args = argparse.Namespace(**message["args"])
+        loop = asyncio.get_running_loop()
+        stdout = _ClientStream(writer, "stdout", loop)
+        stderr = _ClientStream(writer, "stderr", loop)
+        code = 0
+        async with self._lock:
+            try:
+                await self._warm
+            except Exception as e:
+                logger.warning(f"Daemon warm-up failed, serving cold: {e}")
+            self.requests += 1
+            sink = logger.add(stderr, level=settings.log_level, format="{time:HH:mm:ss} | {level: <8} | {message}")
+            cwd = os.getcwd()
+            try:
+                os.chdir(message.get("cwd") or cwd)
+                Path(args.output).mkdir(parents=True, exist_ok=True)
+                if args.sweep:
+                    self.sweep = self.sweep or ParameterSweep()
+                    director = None
+                else:
+                    director = self._director(args)
+                with redirect_stdout(stdout):
+                    await run(args, director=director, sweep=self.sweep)
+            except Exception as e:
+                logger.exception(f"Daemon request failed: {e}")
+                stdout.write(f"Request failed: {e}\n")
+                code = 1
+            finally:
+                os.chdir(cwd)
+                logger.remove(sink)
+        await asyncio.sleep(0)  # let writes queued from post-processing threads go first
+        await self._reply(writer, {"type": "exit", "code": code})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident CADPilot daemon for fast CLI runs")
+    parser.add_argument("action", nargs="?", choices=["start", "status", "stop"], default="start")
+    parser.add_argument("--socket", help=f"Unix socket path (default: DAEMON_SOCKET={settings.daemon_socket})")
+    args = parser.parse_args()
+
+    if args.action == "start":
+        from src.utilities.logging_config import configure_logging
+
+        configure_logging()
+        try:
+            asyncio.run(DaemonServer(args.socket).serve())
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        return
+
+    try:
+        replies = list(request({"command": "ping" if args.action == "status" else "shutdown"}, args.socket))
+    except OSError:
+        print(f"No daemon is listening on {socket_path(args.socket)}")
+        sys.exit(1)
+    if args.action == "status":
+        status = replies[0]
+        print(f"Daemon pid {status['pid']} on {socket_path(args.socket)}: up {status['uptime']:.0f}s, "
+              f"{status['requests']} request(s) served, {'warm' if status['warm'] else 'warming up'}")
+    else:
+        print("Daemon stopping")
+
+
+if __name__ == "__main__":
+    main()
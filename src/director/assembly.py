@@ -0,0 +1,134 @@
+from typing import Any, Dict, Optional
+
+import cadquery as cq
+from loguru import logger
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.pipeline import CadPipeline
+from src.workers.assembly_worker import AssemblyWorker
+from src.workers.spec_schema import AssemblySpecification, AssemblyPart, PartLocation
+from src.utilities.usage import UsageTracker, BudgetExceededError, track_usage
+
+class AssemblyDirector:
+    """
+    Generates multi-part products as a cq.Assembly.
+
+    AssemblyWorker decomposes the prompt into parts, placements and constraints.
+    Every part then runs as its own job through the CadPipeline, so parts are
+    generated and validated concurrently and a failing part retries alone.
+    """
+
+    def __init__(self, director: Optional[CadDirector] = None, concurrency: Optional[Dict[str, int]] = None):
+        self.director = director or CadDirector()
+        self.assembly_worker = AssemblyWorker()
+        self.concurrency = concurrency
+
+    async def generate_from_prompt(self, prompt: str) -> Dict[str, Any]:
+        """
+        Complete assembly workflow.
+
+        Returns:
+            Dict[str, Any]: status, the cq.Assembly under "assembly", the decomposition
+            under "specification" and the per-part results under "parts".
+        """
+        logger.info(f"Starting assembly generation for prompt: {prompt[:50]}...")
+        usage = UsageTracker.from_settings()
+
+        try:
+            with track_usage(usage):
+                specification = await self.assembly_worker.execute(prompt)
+        except BudgetExceededError as e:
+            return {"status": "error", "message": f"Generation aborted: {e}", "usage": usage.to_dict()}
+        except Exception as e:
+            logger.error(f"Assembly decomposition failed: {e}")
+            return {"status": "error", "message": f"Assembly decomposition failed: {e}", "usage": usage.to_dict()}
+
+        spec = AssemblySpecification.model_validate(specification)
+        part_prompts = [self._part_prompt(spec, part) for part in spec.parts]
+
+        jobs = {}
+        pipeline = CadPipeline(self.director, concurrency=self.concurrency)
+        async for job in pipeline.run(part_prompts):
+            part = spec.parts[job.index]
+            logger.info(f"Part '{part.name}' finished: {job.status} after {job.iterations} attempts")
+            jobs[part.name] = job
+            # Each part is budgeted on its own; the assembly reports the sum.
+            usage.records.extend(job.usage.records)
+
+        parts = {part.name: jobs[part.name].to_result() for part in spec.parts}
+        failed = [name for name, result in parts.items() if result["status"] != "success"]
+        if failed:
+            logger.error(f"Assembly generation failed for parts: {failed}")
+            return {
+                "status": "error",
+                "message": f"Failed to generate parts: {', '.join(failed)}",
+                "specification": specification,
+                "parts": parts,
+                "usage": usage.to_dict(),
+            }
+
+        assembly = build_assembly(spec, {name: result["model"].get() for name, result in parts.items()})
+        # The assembly now owns the part shapes.
+        for result in parts.values():
+            result["model"].release()
+        logger.success(f"Assembly '{spec.assembly_name}' generated with {len(assembly.children)} parts")
+        return {
+            "status": "success",
+            "assembly": assembly,
+            "specification": specification,
+            "parts": parts,
+            "iterations": sum(result["iterations"] for result in parts.values()),
+            "usage": usage.to_dict(),
+        }
+
+    def _part_prompt(self, spec: AssemblySpecification, part: AssemblyPart) -> str:
+        return (
+            f"{part.description}\n"
+            f"This is the part '{part.name}' of the assembly '{spec.assembly_name}' ({spec.description}). "
+            f"Model only this single part, centred on its own origin."
+        )
+
+
+def build_assembly(spec: AssemblySpecification, models: Dict[str, cq.Workplane]) -> cq.Assembly:
+    """
+    Place the generated part models into a cq.Assembly. Constraints are solved
+    when present; if they cannot be solved the spec locations are kept.
+    """
+    assembly = cq.Assembly(name=spec.assembly_name)
+    for part in spec.parts:
+        color = _color(part.color)
+        for name, location in zip(part.instance_names(), part.instance_locations()):
+            assembly.add(models[part.name], name=name, loc=_location(location), color=color)
+
+    if spec.constraints:
+        constrained = cq.Assembly(name=spec.assembly_name)
+        for child in assembly.children:
+            constrained.add(child.obj, name=child.name, loc=child.loc, color=child.color)
+        try:
+            for constraint in spec.constraints:
+                constrained.constrain(constraint.a, constraint.b, constraint.type)
+            constrained.solve()
+            return constrained
+        except Exception as e:
+            logger.warning(f"Could not solve assembly constraints, keeping the specified locations: {e}")
+
+    return assembly
+
+
+def _location(location: PartLocation) -> cq.Location:
+    return cq.Location(*location.position, *location.rotation)
+
+
+def _color(name: Optional[str]) -> Optional[cq.Color]:
+    if not name:
+        return None
+    try:
+        return cq.Color(name)
+    except ValueError:
+        logger.warning(f"Unknown part color '{name}', using the default")
+        return None
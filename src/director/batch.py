@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from loguru import logger
+import sys
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.pipeline import CadPipeline
+from src.utilities.usage import TokenUsage
+from src.utilities.llm_client import llm_client
+
+MANIFEST_NAME = "manifest.json"
+
+
+def read_prompts(path: str) -> list:
+    """Read one prompt per line, skipping blank lines and # comments."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def run_batch(
+    prompts: Iterable[str],
+    output_dir: str,
+    export_format: str = "step",
+    director: Optional[CadDirector] = None,
+    concurrency: Optional[Dict[str, int]] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run ``prompts`` through the CadPipeline, export every model and write a
+    manifest.json with the per-job results, the token and cost totals and the
+    connection pool statistics. ``deadline`` bounds each job (seconds).
+
+    Returns:
+        Dict[str, Any]: The manifest that was written.
+    """
+    prompts = list(prompts)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    # Models are only needed until they are written, so release them right after export.
+    pipeline = CadPipeline(
+        director,
+        concurrency=concurrency,
+        output_dir=output_dir,
+        export_format=export_format,
+        release_after_export=True,
+        deadline=deadline,
+    )
+
+    jobs = []
+    async for job in pipeline.run(prompts):
+        logger.info(f"Batch job {job.index + 1}/{len(prompts)} finished: {job.status}")
+        jobs.append(job)
+    jobs.sort(key=lambda job: job.index)
+
+    total = TokenUsage()
+    for job in jobs:
+        total = total + job.usage.total
+
+    manifest = {
+        "jobs": [
+            {
+                "index": job.index,
+                "prompt": job.prompt,
+                "status": job.status,
+                "route": job.state.route,
+                "iterations": job.iterations,
+                "code_fixes": job.code_fixes,
+                "message": job.message,
+                "timed_out": job.timed_out,
+                "outputs": job.outputs,
+                "usage": job.usage.to_dict(),
+                "memory": job.memory,
+            }
+            for job in jobs
+        ],
+        "succeeded": sum(job.status == "success" for job in jobs),
+        "failed": sum(job.status != "success" for job in jobs),
+        "usage": total.to_dict(),
+        "http": llm_client.pool_stats.to_dict(),
+        "memory": {
+            "peak_rss_mb": round(pipeline.memory.peak_mb, 1),
+            "ceiling_mb": pipeline.memory.ceiling_mb,
+            "throttled": pipeline.memory.throttled,
+        },
+    }
+
+    manifest_path = Path(output_dir) / MANIFEST_NAME
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logger.success(f"Batch manifest written to {manifest_path}")
+    return manifest
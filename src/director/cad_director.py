@@ -1,5 +1,7 @@
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Dict, Optional, Any
 from loguru import logger
+import asyncio
+import time
 import sys
 from pathlib import Path
 
@@ -8,99 +10,414 @@ sys.path.insert(0, str(project_root))
 
 from src.workers.spec_worker import SpecWorker
 from src.workers.code_worker import CodeWorker
+from src.workers.direct_code_worker import DirectCodeWorker
 from src.workers.validation_worker import ValidationWorker
 from src.workers.feedback_worker import FeedbackWorker
+from src.workers.repair_worker import RepairWorker
+from src.director.iteration_policy import IterationPolicy, BudgetIterationPolicy, IterationState, Action
+from src.director.model_router import ModelRouter, RouteTicket
+from src.director.model_stats import ModelStatsStore, shared_store
+from src.director.prompt_classifier import DIRECT, PromptClass, classify_prompt, direct_specification
+from src.utilities.usage import UsageTracker, BudgetExceededError, track_usage, current_tracker
+from src.output_handler.model_handle import ModelHandle
+from src.output_handler.preview import preview_mesh
+from src.director import events
+from src.director.events import GenerationEvent, emit, listen, listening
+from src.utilities.code_normalizer import NormalizedCode, normalize_code
+from src.utilities.deadline import Deadline, DeadlineExceededError, deadline_scope
+from src.config.settings import settings
 
 class CadDirector:
     """Orchestraters the complete CAD generation workflow."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        iteration_policy: Optional[IterationPolicy] = None,
+        router: Optional[ModelRouter] = None,
+        repair_mode: Optional[str] = None,
+    ):
         self.spec_worker = SpecWorker()
         self.code_worker = CodeWorker()
+        self.direct_code_worker = DirectCodeWorker()
         self.validation_worker = ValidationWorker()
         self.feedback_worker = FeedbackWorker()
-        self.max_iterations = 3  # Max feedback iterations
+        self.repair_worker = RepairWorker()
+        # "feedback": advice from FeedbackWorker, then new code from CodeWorker.
+        # "single": RepairWorker returns the fixed code in one call (REPAIR_MODE).
+        self.repair_mode = repair_mode or settings.repair_mode
+        # Deterministic fixes of formatting defects before validation (CODE_NORMALIZATION).
+        self.code_normalization = settings.code_normalization
+        # Simple prompts skip SpecWorker and go to DirectCodeWorker (PROMPT_ROUTING).
+        self.prompt_routing = settings.prompt_routing
+        # Where per-route outcomes are recorded; the router's store, or the shared one on first use.
+        self.route_store: Optional[ModelStatsStore] = None
+        # Decides after each failed attempt whether to retry, escalate or stop.
+        self.iteration_policy = iteration_policy or BudgetIterationPolicy()
+        # Picks the model per worker call from recorded history (MODEL_ROUTING).
+        if router is None and settings.model_routing:
+            router = ModelRouter.from_settings()
+        self.router = router
 
-    async def generate_from_prompt(self, prompt: str) -> Dict[str, Any]:
+    async def generate_from_prompt(self, prompt: str, deadline: Optional[float] = None) -> Dict[str, Any]:
             """
             Complete workflow.
             
             Args:
                 prompt (str): Natural language description of the desired CAD model.
+                deadline (float, optional): Seconds the whole generation may take
+                    (default: GENERATION_DEADLINE). Every LLM call, retry wait and
+                    validation run is bounded by it; work still in flight when it
+                    passes is cancelled and the result reports how far it got.
                 
                 Returns:
                 Dict[str, Any]: Dictionary with status and outputs."""
             
             logger.info(f"Starting CAD generation for prompt: {prompt[:50]}...")
+            seconds = deadline if deadline is not None else settings.generation_deadline
+            state = IterationState(deadline=Deadline.after(seconds) if seconds is not None else None)
+            usage = UsageTracker.from_settings()
 
-            try:
+            with track_usage(usage), deadline_scope(state.deadline):
+                try:
+                    async with asyncio.timeout(state.deadline.remaining() if state.deadline else None):
+                        result = await self._run_generation(prompt, state)
+                except TimeoutError:
+                    result = self._deadline_result(state)
+
+            result["usage"] = usage.to_dict()
+            if state.route is not None:
+                result["route"] = state.route
+                self.record_route(state, result, usage)
+            return result
+
+    async def stream_from_prompt(self, prompt: str, deadline: Optional[float] = None) -> AsyncIterator[GenerationEvent]:
+        """
+        ``generate_from_prompt`` as a stream of GenerationEvents, yielded as they
+        happen: spec_ready, then per attempt code_attempt, validation and
+        feedback (or repair), a coarse preview mesh as soon as an attempt
+        validates, model_ready, and finally a "result" event whose
+        ``data["result"]`` is what generate_from_prompt returns.
+
+        Closing the generator early cancels the generation.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        start = time.monotonic()
+
+        def on_event(event: GenerationEvent):
+            event.elapsed = round(time.monotonic() - start, 3)
+            queue.put_nowait(event)
+
+        # The task copies the context, listener included, when it is created.
+        with listen(on_event):
+            task = asyncio.create_task(self.generate_from_prompt(prompt, deadline))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+            yield GenerationEvent(events.RESULT, data={"result": task.result()}, elapsed=round(time.monotonic() - start, 3))
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def _deadline_result(self, state: IterationState) -> Dict[str, Any]:
+        """Error result for a generation cut off by its deadline, with the progress it made."""
+        message = f"Deadline of {state.deadline.seconds:.0f}s exceeded during {state.stage or 'start-up'}"
+        logger.error(f"CAD generation aborted: {message}")
+        return {
+            "status": "error",
+            "message": message,
+            "timed_out": True,
+            "specification": state.specification,
+            "progress": {
+                "stage": state.stage,
+                "attempts": len(state.attempts),
+                "last_error": state.attempts[-1].error if state.attempts else None,
+                "code": state.code,
+                "elapsed": round(state.elapsed, 3),
+            },
+        }
+
+    async def _run_generation(self, prompt: str, state: IterationState) -> Dict[str, Any]:
+        """Spec generation (skipped for simple prompts) followed by the code/validation loop."""
+        structured_spec = None
+
+        try:
+            classification = self.classify(prompt)
+            if classification is not None:
+                state.route = classification.route
+
+            if classification is not None and classification.direct:
+                #Step 1: Simple part, the prompt itself stands in for the specification
+                logger.info(f"Simple {classification.part_name} prompt, generating code directly")
+                spec_model = None
+                structured_spec = direct_specification(prompt, classification)
+            else:
                 #Step 1: Generate structured specification
+                if classification is not None:
+                    logger.info(f"Spec-first route: {'; '.join(classification.reasons)}")
                 logger.info("Generating structured specification...")
-                structured_spec = await self.spec_worker.execute(prompt)
+                state.stage = "spec"
+                spec_model = self.route("SpecWorker")
+                spec_ticket = self.start_route("SpecWorker", spec_model)
+                try:
+                    structured_spec = await self.spec_worker.execute(prompt, model=spec_model)
+                finally:
+                    self.finish_route(spec_ticket, structured_spec is not None)
+            state.specification = structured_spec
+            emit(events.SPEC_READY, specification=structured_spec)
 
-                #Step 2-4: Code generation and validation loop
-                result = await self._generate_and_validate(structured_spec)
+            #Step 2-4: Code generation and validation loop
+            result = await self._generate_and_validate(structured_spec, state)
 
-                if result["status"] == "success":
-                    logger.success("CAD generation completed successfully.")
-                    return {
-                        "status": "success",
-                        "model": result["model"],
-                        "specification": structured_spec,
-                        "code": result["code"],
-                        "iterations": result["iterations"]
-                        
-                 }
-                
-                else:
-                    logger.error("CAD generation failed after maximum iterations.")
-                    return {
-                        "status": "error",
-                        "message": result["message"],
-                        "specification": structured_spec,
-                    }
-                
-            except Exception as e:
-                logger.error(f"CAD generation failed: {e}")
+            if result["status"] == "success":
+                if self.router is not None and spec_model is not None:
+                    self.router.record_generation("SpecWorker", spec_model, result["iterations"])
+                logger.success("CAD generation completed successfully.")
+                emit(
+                    events.MODEL_READY, result["iterations"],
+                    part_name=structured_spec.get("part_name"), iterations=result["iterations"], code=result["code"],
+                )
+                success = {
+                    "status": "success",
+                    "model": ModelHandle(result["model"]),
+                    "specification": structured_spec,
+                    "code": result["code"],
+                    "iterations": result["iterations"],
+                    "code_fixes": result["code_fixes"],
+                }
+                if "profile" in result:
+                    success["profile"] = result["profile"]
+                return success
+
+            else:
+                if self.router is not None and spec_model is not None:
+                    self.router.record_generation("SpecWorker", spec_model, len(state.attempts), success=False)
+                logger.error(f"CAD generation stopped: {result['message']}")
                 return {
                     "status": "error",
-                    "message": f"Generation process failed: {e}"
+                    "message": result["message"],
+                    "specification": structured_spec,
                 }
-        
-    async def _generate_and_validate(self, specification: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate and validate code with retry loop"""
+            
+        except DeadlineExceededError:
+            raise
+        except BudgetExceededError as e:
+            logger.error(f"CAD generation aborted: {e}")
+            return {
+                "status": "error",
+                "message": f"Generation aborted: {e}",
+                "specification": structured_spec,
+            }
+        except Exception as e:
+            logger.error(f"CAD generation failed: {e}")
+            return {
+                "status": "error",
+                "message": f"Generation process failed: {e}"
+            }
 
+    async def _generate_and_validate(self, specification: Dict[str, Any], state: Optional[IterationState] = None) -> Dict[str, Any]:
+        """Generate and validate code, retrying while the iteration policy allows it."""
+
+        state = state or IterationState()
         feedback = None
+        # Code from a single-call repair, validated next instead of asking CodeWorker.
+        repaired_code = None
+        repair_model = None
+        repair_start = 0.0
+        # Normaliser fixes across all attempts, reported with the result.
+        code_fixes = []
+        # Feedback (or a repair) is judged by whether the attempt it informed validates.
+        feedback_ticket = None
+        # Direct-route specifications are the bare prompt, for DirectCodeWorker.
+        if specification.get("route") == DIRECT:
+            code_name, code_generator = "DirectCodeWorker", self.direct_code_worker
+        else:
+            code_name, code_generator = "CodeWorker", self.code_worker
 
-        for iteration in range(self.max_iterations):
-            logger.info(f"Code generation attempt {iteration + 1}...")
+        while True:
+            iteration = len(state.attempts) + 1
+            logger.info(f"Code generation attempt {iteration}...")
+            # A repaired attempt includes its repair call, as an attempt includes its code call.
+            attempt_start = repair_start if repaired_code is not None else time.monotonic()
+            code_ticket = None
 
             try:
-                #Generate code
-                generated_code = await self.code_worker.execute(specification, feedback)
+                #Generate code, unless the repair already returned it
+                if repaired_code is None:
+                    state.stage = "code"
+                    code_worker, code_model = code_name, self.route(code_name, state)
+                    code_ticket = self.start_route(code_name, code_model)
+                    generated_code = await code_generator.execute(specification, feedback, model=code_model)
+                    self.stop_route(code_ticket)
+                else:
+                    code_worker, code_model = "RepairWorker", repair_model
+                    generated_code, repaired_code = repaired_code, None
+
+                normalized = self.normalize(generated_code)
+                generated_code = normalized.code
+                code_fixes.extend(normalized.fixes)
+                state.code = generated_code
+                emit(events.CODE_ATTEMPT, iteration, code=generated_code, worker=code_worker, model=code_model, fixes=normalized.fixes)
 
                 #Validate code
+                state.stage = "validation"
                 validation_result = await self.validation_worker.execute(generated_code)
+                emit(events.VALIDATION, iteration, success=validation_result["success"], error=validation_result.get("error"))
+
+                for ticket in (code_ticket, feedback_ticket):
+                    self.finish_route(ticket, validation_result["success"])
+                code_ticket = feedback_ticket = None
 
                 if validation_result["success"]:
-                    return {
+                    if self.router is not None:
+                        self.router.record_generation(code_worker, code_model, iteration)
+                    if listening():
+                        await self._emit_preview(iteration, validation_result["object"])
+                    result = {
                         "status": "success",
                         "model": validation_result["object"],
                         "code": generated_code,
-                        "iterations": iteration + 1
+                        "iterations": iteration,
+                        "code_fixes": code_fixes,
                     }
-                else:
+                    if "profile" in validation_result:
+                        result["profile"] = {
+                            **validation_result["profile"],
+                            "path": validation_result["profile_path"],
+                            "slow_operations": validation_result["slow_operations"],
+                        }
+                    return result
+
+                state.record_failure(validation_result.get("error", "Unknown error"), time.monotonic() - attempt_start)
+                if not self.should_retry(state):
+                    break
 
-                    #Get the feedback for next iteration
-                    feedback = await self.feedback_worker.execute(generated_code, validation_result, specification)
-                    logger.info(f"Feedback for next iteration: {feedback}...")
+                if self.repair_mode == "single":
+                    #Get the fixed code for the next iteration in one call
+                    repair_start = time.monotonic()
+                    state.stage = "repair"
+                    repair_model = self.route("RepairWorker", state)
+                    feedback_ticket = self.start_route("RepairWorker", repair_model)
+                    repair = await self.repair_worker.execute(
+                        generated_code, validation_result, specification, model=repair_model
+                    )
+                    self.stop_route(feedback_ticket)
+                    repaired_code = repair["code"]
+                    logger.info(f"Repair for next iteration: {repair['rationale']}")
+                    emit(events.REPAIR, iteration, rationale=repair["rationale"])
+                    continue
 
+                #Get the feedback for next iteration
+                state.stage = "feedback"
+                feedback_model = self.route("FeedbackWorker")
+                feedback_ticket = self.start_route("FeedbackWorker", feedback_model)
+                feedback = await self.feedback_worker.execute(
+                    generated_code, validation_result, specification, model=feedback_model
+                )
+                self.stop_route(feedback_ticket)
+                logger.info(f"Feedback for next iteration: {feedback}...")
+                emit(events.FEEDBACK, iteration, feedback=feedback)
+
+            except (BudgetExceededError, DeadlineExceededError):
+                raise
             except Exception as e:
-                logger.warning(f"Attempt {iteration + 1} failed: {e}")
+                for ticket in (code_ticket, feedback_ticket):
+                    self.finish_route(ticket, False)
+                feedback_ticket = None
+                logger.warning(f"Attempt {iteration} failed: {e}")
+                state.record_failure(str(e), time.monotonic() - attempt_start)
+                if not self.should_retry(state):
+                    break
                 feedback = f"Previous attempt failed with error: {e}"
 
         return {
             "status": "error",
-            "message": f"Failed to generate valid code after {self.max_iterations} attempts."
+            "message": f"Failed to generate valid code after {len(state.attempts)} attempts: {state.stop_reason}."
         }
-            
+
+    async def _emit_preview(self, attempt: int, model):
+        """Send a coarse mesh of a validated model to the listener, before export and post-processing."""
+        try:
+            mesh = await asyncio.to_thread(preview_mesh, model, settings.preview_tolerance)
+        except Exception as e:
+            logger.warning(f"Preview mesh failed: {e}")
+            return
+        emit(events.PREVIEW, attempt, **mesh.to_dict())
+
+    def normalize(self, code: str) -> NormalizedCode:
+        """Apply the code normaliser, when enabled, and log every fix it makes."""
+        if not self.code_normalization:
+            return NormalizedCode(code)
+        normalized = normalize_code(code)
+        for fix in normalized.fixes:
+            logger.info(f"Normalised generated code: {fix}")
+        return normalized
+
+    def classify(self, prompt: str) -> Optional[PromptClass]:
+        """Route for ``prompt``, or None when prompt routing is off."""
+        if not self.prompt_routing:
+            return None
+        classification = classify_prompt(prompt)
+        logger.debug(f"Prompt route: {classification.to_dict()}")
+        return classification
+
+    def record_route(self, state: IterationState, result: Dict[str, Any], usage: UsageTracker):
+        """Add a finished generation to the per-route latency and success statistics."""
+        try:
+            if self.route_store is None:
+                self.route_store = self.router.store if self.router is not None else shared_store(settings.model_stats_path)
+            self.route_store.record_route(
+                state.route,
+                result["status"] == "success",
+                state.elapsed,
+                usage.total.total_tokens,
+                result.get("iterations", len(state.attempts)),
+            )
+        except Exception as e:
+            logger.warning(f"Could not record route statistics: {e}")
+
+    def route(self, worker: str, state: Optional[IterationState] = None) -> Optional[str]:
+        """
+        Model for the next ``worker`` call: the escalation model for code (and
+        repairs) once the policy escalated, else the router's pick. None keeps
+        the worker's default.
+        """
+        if worker in ("CodeWorker", "DirectCodeWorker", "RepairWorker") and state is not None and state.model:
+            return state.model
+        return self.router.choose(worker) if self.router is not None else None
+
+    def start_route(self, worker: str, model: Optional[str]) -> Optional[RouteTicket]:
+        return self.router.start(worker, model) if self.router is not None and model else None
+
+    def stop_route(self, ticket: Optional[RouteTicket]):
+        """Measure a routed call as soon as it returns; ``finish_route`` records its outcome later."""
+        if ticket is not None:
+            self.router.stop(ticket)
+
+    def finish_route(self, ticket: Optional[RouteTicket], success: bool):
+        if ticket is not None:
+            self.router.finish(ticket, success)
+
+    def should_retry(self, state: IterationState) -> bool:
+        """Apply the iteration policy after a failed attempt; returns False to stop."""
+        tracker = current_tracker.get()
+        if tracker is not None:
+            state.tokens_used = tracker.total.total_tokens
+
+        decision = self.iteration_policy.decide(state)
+
+        if decision.action == Action.STOP:
+            state.stop_reason = decision.reason
+            logger.warning(f"Stopping repair loop: {decision.reason}")
+            return False
+
+        if decision.action == Action.ESCALATE:
+            logger.info(f"Escalating code generation to {decision.model}: {decision.reason}")
+            state.model = decision.model
+            state.escalated = True
+
+        return True
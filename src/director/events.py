@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Event types, in the order a generation produces them.
+SPEC_READY = "spec_ready"           # data: specification
+CODE_ATTEMPT = "code_attempt"       # data: code, worker, model, fixes
+VALIDATION = "validation"           # data: success, error
+FEEDBACK = "feedback"               # data: feedback
+REPAIR = "repair"                   # data: rationale
+PREVIEW = "preview"                 # data: PreviewMesh.to_dict()
+MODEL_READY = "model_ready"         # data: part_name, iterations, code
+RESULT = "result"                   # data: result (what generate_from_prompt returns); always last
+
+
+@dataclass
+class GenerationEvent:
+    """One step of a generation, emitted as it happens."""
+    type: str
+    attempt: Optional[int] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    elapsed: float = 0.0            # seconds since the generation started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+Listener = Callable[[GenerationEvent], None]
+
+# Where the generation running in the current task reports its events, if
+# anywhere; carried into worker tasks like the usage tracker and deadline.
+current_listener: ContextVar[Optional[Listener]] = ContextVar("current_listener", default=None)
+
+
+@contextmanager
+def listen(listener: Optional[Listener]) -> Iterator[Optional[Listener]]:
+    """Send the events of every generation started inside the block to ``listener``."""
+    token = current_listener.set(listener)
+    try:
+        yield listener
+    finally:
+        current_listener.reset(token)
+
+
+def listening() -> bool:
+    return current_listener.get() is not None
+
+
+def emit(type: str, attempt: Optional[int] = None, **data: Any):
+    """Report an event to the current listener; a no-op when nobody listens."""
+    listener = current_listener.get()
+    if listener is not None:
+        listener(GenerationEvent(type, attempt, data))
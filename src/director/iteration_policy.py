@@ -0,0 +1,142 @@
+import hashlib
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Dict, List, Optional
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+from src.utilities.deadline import Deadline
+
+class Action(StrEnum):
+    """What the director should do after a failed attempt."""
+    CONTINUE = "continue"
+    ESCALATE = "escalate"
+    STOP = "stop"
+
+
+@dataclass
+class Decision:
+    action: Action
+    reason: str = ""
+    model: Optional[str] = None
+
+
+@dataclass
+class Attempt:
+    """One failed code generation attempt."""
+    error: str
+    signature: str
+    duration: float
+
+
+@dataclass
+class IterationState:
+    """Per-generation record the policy decides on."""
+    started_at: float = field(default_factory=time.monotonic)
+    attempts: List[Attempt] = field(default_factory=list)
+    tokens_used: int = 0
+    model: Optional[str] = None
+    escalated: bool = False
+    stop_reason: Optional[str] = None
+    # Hard deadline of the generation, if any; the policy plans against it.
+    deadline: Optional[Deadline] = None
+    # Progress so far, reported when the generation is cut off by its deadline.
+    stage: Optional[str] = None
+    specification: Optional[Dict[str, Any]] = None
+    code: Optional[str] = None
+    # "direct" or "spec", once the prompt classifier has picked the route.
+    route: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def record_failure(self, error: str, duration: float) -> Attempt:
+        attempt = Attempt(error=error, signature=error_signature(error), duration=duration)
+        self.attempts.append(attempt)
+        return attempt
+
+
+def error_signature(error: str) -> str:
+    """
+    Reduce an error message to a signature that is stable across attempts.
+
+    Numbers, memory addresses and line references are masked so that the same
+    failure at a different value or location still compares equal.
+    """
+    normalized = error.strip().lower()
+    normalized = re.sub(r"0x[0-9a-f]+", "<addr>", normalized)
+    normalized = re.sub(r"line \d+", "line <n>", normalized)
+    normalized = re.sub(r"-?\d+(\.\d+)?(e-?\d+)?", "<num>", normalized)
+    normalized = re.sub(r"\s+", " ", normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class IterationPolicy(ABC):
+    """Decides, after each failed attempt, whether the repair loop should go on."""
+
+    @abstractmethod
+    def decide(self, state: IterationState) -> Decision:
+        """Called after every failed attempt, before any feedback is requested."""
+        pass
+
+
+class BudgetIterationPolicy(IterationPolicy):
+    """
+    Stops on the first exhausted budget: attempt count, wall-clock deadline or
+    token budget, including when the average attempt so far would overrun the
+    remaining deadline or tokens. When two consecutive attempts fail with the
+    same error signature, escalates once to ``escalation_model`` if configured,
+    otherwise stops.
+    """
+
+    def __init__(
+        self,
+        max_iterations: Optional[int] = None,
+        deadline_seconds: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        escalation_model: Optional[str] = None,
+    ):
+        self.max_iterations = max_iterations or settings.max_iterations
+        self.deadline_seconds = deadline_seconds if deadline_seconds is not None else settings.generation_deadline
+        self.token_budget = token_budget if token_budget is not None else settings.token_budget
+        self.escalation_model = escalation_model if escalation_model is not None else settings.escalation_model
+
+    def decide(self, state: IterationState) -> Decision:
+        attempts = len(state.attempts)
+
+        if attempts >= self.max_iterations:
+            return Decision(Action.STOP, f"reached the maximum of {self.max_iterations} attempts")
+
+        deadline_seconds = state.deadline.seconds if state.deadline is not None else self.deadline_seconds
+        if deadline_seconds is not None:
+            if state.deadline is not None:
+                remaining = state.deadline.remaining()
+            else:
+                remaining = deadline_seconds - state.elapsed
+            average = sum(a.duration for a in state.attempts) / attempts
+            if remaining <= 0:
+                return Decision(Action.STOP, f"deadline of {deadline_seconds:.0f}s exceeded")
+            if average > remaining:
+                return Decision(Action.STOP, f"next attempt (~{average:.0f}s) would overrun the deadline")
+
+        if self.token_budget is not None:
+            remaining_tokens = self.token_budget - state.tokens_used
+            if remaining_tokens <= 0:
+                return Decision(Action.STOP, f"token budget of {self.token_budget} exhausted")
+            if state.tokens_used / attempts > remaining_tokens:
+                return Decision(Action.STOP, "next attempt would exceed the token budget")
+
+        if attempts >= 2 and state.attempts[-1].signature == state.attempts[-2].signature:
+            if self.escalation_model and not state.escalated:
+                return Decision(Action.ESCALATE, "same error twice in a row", model=self.escalation_model)
+            return Decision(Action.STOP, "same error twice in a row")
+
+        return Decision(Action.CONTINUE)
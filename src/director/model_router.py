@@ -0,0 +1,118 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from loguru import logger
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+from src.config.openrouter_models import OpenRouterModel
+from src.director.model_stats import ModelStats, ModelStatsStore, shared_store
+from src.utilities.usage import current_tracker
+
+ROUTED_WORKERS = ("SpecWorker", "CodeWorker", "DirectCodeWorker", "FeedbackWorker", "RepairWorker")
+
+
+@dataclass
+class RouteTicket:
+    """
+    A routed call. ModelRouter.stop measures it when the call returns;
+    ModelRouter.finish records it once its outcome is known, which for code
+    and feedback is only after the next validation.
+    """
+    worker: str
+    model: str
+    started: float
+    tokens_before: int
+    latency: Optional[float] = None
+    tokens: Optional[int] = None
+
+
+def _tokens_so_far() -> int:
+    tracker = current_tracker.get()
+    return tracker.total.total_tokens if tracker is not None else 0
+
+
+class ModelRouter:
+    """
+    Picks the model for each worker call from recorded history.
+
+    The greedy choice minimises expected time to a valid result: mean latency
+    divided by the (smoothed) success rate, i.e. the expected time including
+    retries. For SpecWorker a call succeeds as soon as its JSON parses, so this
+    is further scaled by the code iterations its specs needed and divided by
+    the share of its generations that ended in a valid part: a poor spec shows
+    up downstream, as repair attempts or as a generation that never validates.
+    Every ``exploration_interval``-th choice per worker goes to the least-tried
+    other candidate instead, so the statistics keep up with model changes.
+    """
+
+    def __init__(
+        self,
+        store: ModelStatsStore,
+        candidates: List[str],
+        exploration_interval: int = 10,
+        default_model: Optional[str] = None,
+    ):
+        self.store = store
+        self.candidates = list(candidates)
+        self.exploration_interval = exploration_interval
+        self.default_model = default_model or settings.default_model
+        self._choices: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls) -> "ModelRouter":
+        candidates = (
+            [model.strip() for model in settings.router_models.split(",") if model.strip()]
+            if settings.router_models
+            else [str(model) for model in OpenRouterModel.get_free_models()]
+        )
+        return cls(
+            shared_store(settings.model_stats_path),
+            candidates,
+            exploration_interval=settings.router_exploration_interval,
+        )
+
+    def expected_time(self, worker: str, stats: ModelStats) -> float:
+        expected = stats.mean_latency / stats.success_rate
+        if worker == "SpecWorker":
+            expected *= stats.mean_iterations / stats.generation_success_rate
+        return expected
+
+    def choose(self, worker: str) -> str:
+        """Model for the next ``worker`` call."""
+        self._choices[worker] += 1
+        stats = self.store.stats(worker)
+        tried = {model: stats[model] for model in self.candidates if model in stats and stats[model].calls}
+
+        best = min(tried, key=lambda model: self.expected_time(worker, tried[model])) if tried else self.default_model
+
+        if self.exploration_interval and self._choices[worker] % self.exploration_interval == 0:
+            others = [model for model in self.candidates if model != best]
+            if others:
+                explore = min(others, key=lambda model: stats[model].calls if model in stats else 0)
+                logger.debug(f"Router exploring {explore} for {worker}")
+                return explore
+
+        return best
+
+    def start(self, worker: str, model: str) -> RouteTicket:
+        return RouteTicket(worker, model, time.monotonic(), _tokens_so_far())
+
+    def stop(self, ticket: RouteTicket):
+        """Fix the latency and tokens of a call that has returned, so later work is not counted."""
+        if ticket.latency is None:
+            ticket.latency = time.monotonic() - ticket.started
+            ticket.tokens = max(0, _tokens_so_far() - ticket.tokens_before)
+
+    def finish(self, ticket: RouteTicket, success: bool):
+        """Record the outcome of a routed call, measured up to ``stop`` (or now, if not stopped)."""
+        self.stop(ticket)
+        self.store.record_call(ticket.worker, ticket.model, success, ticket.latency, ticket.tokens)
+
+    def record_generation(self, worker: str, model: str, iterations: int, success: bool = True):
+        self.store.record_generation(worker, model, iterations, success)
@@ -0,0 +1,212 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_stats (
+    worker TEXT NOT NULL,
+    model TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    total_latency REAL NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    generations INTEGER NOT NULL DEFAULT 0,
+    generation_iterations INTEGER NOT NULL DEFAULT 0,
+    generation_successes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (worker, model)
+)
+"""
+_ROUTE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS route_stats (
+    route TEXT PRIMARY KEY,
+    generations INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    total_latency REAL NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    total_iterations INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+@dataclass
+class ModelStats:
+    """Aggregated history of one model on one worker."""
+    calls: int = 0
+    successes: int = 0
+    total_latency: float = 0.0
+    total_tokens: int = 0
+    generations: int = 0
+    generation_iterations: int = 0
+    generation_successes: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        """Laplace-smoothed, so a model with few calls is neither 0 nor 1."""
+        return (self.successes + 1) / (self.calls + 2)
+
+    @property
+    def generation_success_rate(self) -> float:
+        """Share of the generations this model took part in that produced a valid part; smoothed."""
+        return (self.generation_successes + 1) / (self.generations + 2)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+    @property
+    def mean_tokens(self) -> float:
+        return self.total_tokens / self.calls if self.calls else 0.0
+
+    @property
+    def mean_iterations(self) -> float:
+        """Code attempts per successful generation this model took part in."""
+        return self.generation_iterations / self.generation_successes if self.generation_successes else 1.0
+
+
+@dataclass
+class RouteStats:
+    """Aggregated outcome of the generations that took one prompt route ("direct" or "spec")."""
+    generations: int = 0
+    successes: int = 0
+    total_latency: float = 0.0
+    total_tokens: int = 0
+    total_iterations: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.generations if self.generations else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.generations if self.generations else 0.0
+
+    @property
+    def mean_tokens(self) -> float:
+        return self.total_tokens / self.generations if self.generations else 0.0
+
+    @property
+    def mean_iterations(self) -> float:
+        return self.total_iterations / self.generations if self.generations else 0.0
+
+
+class ModelStatsStore:
+    """
+    Persistent per-(worker, model) statistics in a local SQLite file.
+
+    Rows hold running totals only, so the file stays small however many
+    generations are recorded. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_ROUTE_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(model_stats)")}
+            if "generation_successes" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE model_stats ADD COLUMN generation_successes INTEGER NOT NULL DEFAULT 0"
+                )
+                # Files from before the column only recorded successful generations.
+                self._conn.execute("UPDATE model_stats SET generation_successes = generations")
+
+    def record_call(self, worker: str, model: str, success: bool, latency: float, tokens: int = 0):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO model_stats (worker, model, calls, successes, total_latency, total_tokens)
+                VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT (worker, model) DO UPDATE SET
+                    calls = calls + 1,
+                    successes = successes + excluded.successes,
+                    total_latency = total_latency + excluded.total_latency,
+                    total_tokens = total_tokens + excluded.total_tokens
+                """,
+                (worker, model, int(success), latency, tokens),
+            )
+
+    def record_generation(self, worker: str, model: str, iterations: int, success: bool = True):
+        """
+        Record a finished generation that used ``model`` for ``worker``: whether
+        it produced a valid part and, if so, after how many code attempts.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO model_stats (worker, model, generations, generation_successes, generation_iterations)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT (worker, model) DO UPDATE SET
+                    generations = generations + 1,
+                    generation_successes = generation_successes + excluded.generation_successes,
+                    generation_iterations = generation_iterations + excluded.generation_iterations
+                """,
+                (worker, model, int(success), iterations if success else 0),
+            )
+
+    def stats(self, worker: str) -> Dict[str, ModelStats]:
+        """All recorded models for ``worker``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT model, calls, successes, total_latency, total_tokens, generations, generation_iterations, "
+                "generation_successes FROM model_stats WHERE worker = ?",
+                (worker,),
+            ).fetchall()
+        return {row[0]: ModelStats(*row[1:]) for row in rows}
+
+    def record_route(self, route: str, success: bool, latency: float, tokens: int = 0, iterations: int = 0):
+        """Record one whole generation that took prompt ``route``."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO route_stats (route, generations, successes, total_latency, total_tokens, total_iterations)
+                VALUES (?, 1, ?, ?, ?, ?)
+                ON CONFLICT (route) DO UPDATE SET
+                    generations = generations + 1,
+                    successes = successes + excluded.successes,
+                    total_latency = total_latency + excluded.total_latency,
+                    total_tokens = total_tokens + excluded.total_tokens,
+                    total_iterations = total_iterations + excluded.total_iterations
+                """,
+                (route, int(success), latency, tokens, iterations),
+            )
+
+    def route_stats(self) -> Dict[str, RouteStats]:
+        """All recorded prompt routes."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT route, generations, successes, total_latency, total_tokens, total_iterations FROM route_stats"
+            ).fetchall()
+        return {row[0]: RouteStats(*row[1:]) for row in rows}
+
+    def close(self):
+        self._conn.close()
+
+
+_stores: Dict[str, ModelStatsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(path: str) -> ModelStatsStore:
+    """
+    The process-wide store for the database at ``path``. Routers and
+    directors share it, so each run or daemon opens the file once;
+    ``close_stores`` closes it at shutdown.
+    """
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ModelStatsStore(path)
+        return _stores[path]
+
+
+def close_stores():
+    """Close every store opened by ``shared_store``."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
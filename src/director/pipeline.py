@@ -0,0 +1,394 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from loguru import logger
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.iteration_policy import IterationState
+from src.director.model_router import RouteTicket
+from src.director.prompt_classifier import DIRECT, direct_specification
+from src.utilities.usage import UsageTracker, BudgetExceededError, track_usage
+from src.utilities.deadline import Deadline, DeadlineExceededError, deadline_scope, time_left
+from src.utilities.memory import MemoryGovernor
+from src.output_handler.exporter import export_model_with_name
+from src.output_handler.model_handle import ModelHandle
+from src.config.settings import settings
+
+STAGES = ("spec", "code", "validate", "feedback", "export")
+
+DEFAULT_CONCURRENCY = {
+    "spec": 4,       # network bound
+    "code": 4,       # network bound
+    "validate": 1,   # CPU bound, runs in the executor; OCC holds the GIL, so more threads do not add throughput
+    "feedback": 4,   # network bound
+    "export": 1,     # CPU / disk bound, runs in the executor
+}
+
+
+@dataclass
+class PipelineJob:
+    """State of one prompt as it moves through the pipeline."""
+    index: int
+    prompt: str
+    specification: Optional[Dict[str, Any]] = None
+    code: Optional[str] = None
+    code_fixes: List[str] = field(default_factory=list)
+    feedback: Optional[str] = None
+    validation: Optional[Dict[str, Any]] = None
+    model: Optional[ModelHandle] = None
+    iterations: int = 0
+    status: str = "pending"
+    message: Optional[str] = None
+    timed_out: bool = False
+    outputs: Dict[str, str] = field(default_factory=dict)
+    state: IterationState = field(default_factory=IterationState)
+    attempt_started_at: float = 0.0
+    usage: UsageTracker = field(default_factory=UsageTracker.from_settings)
+    # Models picked by the director's router and their open tickets, per worker.
+    models: Dict[str, Optional[str]] = field(default_factory=dict)
+    tickets: Dict[str, RouteTicket] = field(default_factory=dict)
+    # Process RSS (MB) when admitted, highest seen at a stage boundary, and when finished.
+    # Jobs overlap, so these are process-wide samples rather than per-job allocations.
+    memory: Dict[str, float] = field(default_factory=dict)
+
+    def to_result(self) -> Dict[str, Any]:
+        """Same shape as the dict returned by CadDirector.generate_from_prompt."""
+        if self.status == "success":
+            result = {
+                "status": "success",
+                "model": self.model,
+                "specification": self.specification,
+                "code": self.code,
+                "iterations": self.iterations,
+                "code_fixes": self.code_fixes,
+                "outputs": self.outputs,
+                "usage": self.usage.to_dict(),
+            }
+        else:
+            result = {
+                "status": "error",
+                "message": self.message,
+                "timed_out": self.timed_out,
+                "specification": self.specification,
+                "usage": self.usage.to_dict(),
+            }
+        if self.state.route is not None:
+            result["route"] = self.state.route
+        return result
+
+    @property
+    def code_worker(self) -> str:
+        """Worker that writes this job's code: DirectCodeWorker for direct-route prompts."""
+        if self.specification is not None and self.specification.get("route") == DIRECT:
+            return "DirectCodeWorker"
+        return "CodeWorker"
+
+
+class CadPipeline:
+    """
+    Runs many prompts through spec -> code -> validate (-> feedback -> code) -> export
+    with an independent worker pool per stage, so LLM stages overlap with the
+    CPU-bound validation and export stages.
+
+    Validation and export run in threads: that keeps the LLM calls going while
+    geometry is built, but it is not CPU parallelism. OCC calls hold the GIL,
+    so validate and export threads take turns with each other. This keeps
+    the director's shared validation worker, with its incremental checkpoints
+    and cache, in one process. For CPU-bound work across cores, use the
+    process pool in ParameterSweep.
+
+    Each stage has its own concurrency limit. Backpressure comes from a bound on
+    jobs in flight: a new prompt is only admitted once a finished job has been
+    taken from the result iterator, so a slow stage (or a slow consumer) stalls
+    admission instead of growing the queues. Because the retry edge
+    (feedback -> code) stays inside that bound, the stage cycle cannot deadlock.
+    With the director's single-call repair mode the feedback stage runs the
+    RepairWorker and sends the fixed code straight back to validation.
+
+    Admission also waits while process RSS is above the MemoryGovernor's
+    ceiling. Validated models are held in ModelHandles: ``spill_models`` moves
+    them to disk until they are needed, and ``release_after_export`` frees them
+    once written, so a long batch does not accumulate OCC shapes.
+
+    With a ``deadline`` every job must reach a validated model within that many
+    seconds of admission; the stage it is in when time runs out is cancelled
+    and the job finishes as timed out.
+    """
+
+    def __init__(
+        self,
+        director: Optional[CadDirector] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        max_in_flight: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        export_format: str = "step",
+        executor: Optional[Executor] = None,
+        memory: Optional[MemoryGovernor] = None,
+        spill_models: bool = False,
+        release_after_export: bool = False,
+        deadline: Optional[float] = None,
+    ):
+        self.director = director or CadDirector()
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        unknown = set(self.concurrency) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}. Valid stages: {STAGES}")
+        self.max_in_flight = max_in_flight or 2 * sum(self.concurrency.values())
+        self.output_dir = output_dir
+        self.export_format = export_format
+        self._executor = executor
+        self.spill_models = spill_models
+        self.release_after_export = release_after_export
+        # Seconds per job from admission to a validated model (default: GENERATION_DEADLINE).
+        self.deadline = deadline if deadline is not None else settings.generation_deadline
+        self.memory = memory or MemoryGovernor.from_settings()
+        # Cached incremental-execution namespaces hold live shapes; drop them under pressure.
+        validation_executor = getattr(self.director.validation_worker, "executor", None)
+        if validation_executor is not None:
+            self.memory.on_pressure.append(validation_executor.clear)
+
+    async def run(self, prompts: Iterable[str]) -> AsyncIterator[PipelineJob]:
+        """
+        Process ``prompts`` and yield each PipelineJob as soon as it finishes.
+
+        Jobs are yielded in completion order; use ``job.index`` to map back to input order.
+        """
+        prompts = list(prompts)
+        queues = {stage: asyncio.Queue() for stage in STAGES}
+        finished: asyncio.Queue = asyncio.Queue()
+        admission = asyncio.Semaphore(self.max_in_flight)
+        progress = {"admitted": 0, "yielded": 0}
+
+        owns_executor = self._executor is None
+        executor = self._executor or ThreadPoolExecutor(
+            max_workers=self.concurrency["validate"] + self.concurrency["export"],
+            thread_name_prefix="cad-pipeline",
+        )
+
+        tasks = [
+            asyncio.create_task(self._stage_worker(stage, queues, finished, executor))
+            for stage in STAGES
+            for _ in range(self.concurrency[stage])
+        ]
+        tasks.append(asyncio.create_task(self._admit(prompts, queues["spec"], admission, progress)))
+
+        try:
+            for _ in range(len(prompts)):
+                job = await finished.get()
+                job.memory["rss_end_mb"] = self._sample(job)
+                if job.state.route is not None:
+                    self.director.record_route(job.state, {"status": job.status, "iterations": job.iterations}, job.usage)
+                admission.release()
+                progress["yielded"] += 1
+                yield job
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+    async def _admit(self, prompts: list, spec_queue: asyncio.Queue, admission: asyncio.Semaphore, progress: Dict[str, int]):
+        for index, prompt in enumerate(prompts):
+            await admission.acquire()
+            await self.memory.wait_for_headroom(idle=lambda: progress["admitted"] == progress["yielded"])
+            job = PipelineJob(index=index, prompt=prompt)
+            if self.deadline is not None:
+                job.state.deadline = Deadline.after(self.deadline)
+            job.memory["rss_start_mb"] = self._sample(job)
+            progress["admitted"] += 1
+            await spec_queue.put(job)
+
+    def _sample(self, job: PipelineJob) -> float:
+        current = round(self.memory.sample(), 1)
+        job.memory["rss_peak_mb"] = max(job.memory.get("rss_peak_mb", 0.0), current)
+        return current
+
+    async def _stage_worker(self, stage: str, queues: Dict[str, asyncio.Queue], finished: asyncio.Queue, executor: Executor):
+        handler = getattr(self, f"_{stage}_stage")
+        queue = queues[stage]
+        while True:
+            job = await queue.get()
+            # Export comes after generation and is not cut off by its deadline.
+            deadline = job.state.deadline if stage != "export" else None
+            try:
+                with track_usage(job.usage), deadline_scope(deadline):
+                    async with asyncio.timeout(deadline.remaining() if deadline else None):
+                        next_stage = await handler(job, executor)
+            except TimeoutError:
+                logger.error(f"Pipeline job {job.index} hit its deadline in the {stage} stage")
+                job.status = "error"
+                job.timed_out = True
+                job.message = (
+                    f"Deadline of {deadline.seconds:.0f}s exceeded in {stage} stage "
+                    f"after {job.iterations} attempts"
+                )
+                next_stage = None
+            except Exception as e:
+                logger.error(f"Pipeline job {job.index} failed in {stage} stage: {e}")
+                job.status = "error"
+                job.message = f"{stage} stage failed: {e}"
+                next_stage = None
+            self._sample(job)
+
+            if next_stage is None:
+                await finished.put(job)
+            else:
+                await queues[next_stage].put(job)
+
+    async def _spec_stage(self, job: PipelineJob, executor: Executor) -> Optional[str]:
+        classification = self.director.classify(job.prompt)
+        if classification is not None:
+            job.state.route = classification.route
+            if classification.direct:
+                job.specification = direct_specification(job.prompt, classification)
+                return "code"
+        model = self._start_route(job, "SpecWorker")
+        try:
+            job.specification = await self.director.spec_worker.execute(job.prompt, model=model)
+        except Exception:
+            self._finish_route(job, "SpecWorker", False)
+            raise
+        self._finish_route(job, "SpecWorker", True)
+        return "code"
+
+    async def _code_stage(self, job: PipelineJob, executor: Executor) -> Optional[str]:
+        job.iterations += 1
+        job.attempt_started_at = time.monotonic()
+        worker = job.code_worker
+        model = self._start_route(job, worker)
+        code_generator = self.director.direct_code_worker if worker == "DirectCodeWorker" else self.director.code_worker
+        try:
+            code = await code_generator.execute(job.specification, job.feedback, model=model)
+            self._stop_route(job, worker)
+        except (BudgetExceededError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            self._finish_route(job, worker, False)
+            self._finish_route(job, "FeedbackWorker", False)
+            logger.warning(f"Pipeline job {job.index} attempt {job.iterations} failed: {e}")
+            job.feedback = f"Previous attempt failed with error: {e}"
+            return self._retry_or_fail(job, str(e), next_stage="code")
+        self._set_code(job, code)
+        return "validate"
+
+    def _set_code(self, job: PipelineJob, code: str):
+        normalized = self.director.normalize(code)
+        job.code = normalized.code
+        job.code_fixes.extend(normalized.fixes)
+
+    async def _validate_stage(self, job: PipelineJob, executor: Executor) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        worker = self.director.validation_worker
+        # Timeout from the job's deadline, taken here: executor threads do not see the context.
+        validate = functools.partial(worker.validate, job.code, time_left(worker.timeout))
+        job.validation = await loop.run_in_executor(executor, validate)
+        self._finish_route(job, job.code_worker, job.validation["success"])
+        self._finish_route(job, "FeedbackWorker", job.validation["success"])
+        self._finish_route(job, "RepairWorker", job.validation["success"])
+
+        if job.validation["success"]:
+            # The handle is the only owner of the shapes from here on.
+            job.model = ModelHandle(job.validation.pop("object"))
+            job.status = "success"
+            if self.spill_models:
+                await loop.run_in_executor(executor, job.model.spill)
+            if self.director.router is not None:
+                for worker in ("SpecWorker", job.code_worker):
+                    if job.models.get(worker):
+                        self.director.router.record_generation(worker, job.models[worker], job.iterations)
+            return "export" if self.output_dir else None
+
+        return self._retry_or_fail(job, job.validation.get("error", "Unknown error"), next_stage="feedback")
+
+    async def _feedback_stage(self, job: PipelineJob, executor: Executor) -> Optional[str]:
+        if self.director.repair_mode == "single":
+            return await self._repair(job)
+
+        model = self._start_route(job, "FeedbackWorker")
+        try:
+            job.feedback = await self.director.feedback_worker.execute(
+                job.code, job.validation, job.specification, model=model
+            )
+            # Judged by the next validation, but timed without the code call and geometry build.
+            self._stop_route(job, "FeedbackWorker")
+        except (BudgetExceededError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            self._finish_route(job, "FeedbackWorker", False)
+            logger.warning(f"Pipeline job {job.index} feedback failed: {e}")
+            job.feedback = f"Previous attempt failed with error: {job.validation.get('error', e)}"
+        return "code"
+
+    async def _repair(self, job: PipelineJob) -> Optional[str]:
+        """Single-call repair: a new attempt whose code comes from RepairWorker, validated next."""
+        job.iterations += 1
+        job.attempt_started_at = time.monotonic()
+        model = self._start_route(job, "RepairWorker")
+        try:
+            repair = await self.director.repair_worker.execute(job.code, job.validation, job.specification, model=model)
+            self._stop_route(job, "RepairWorker")
+        except (BudgetExceededError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            self._finish_route(job, "RepairWorker", False)
+            logger.warning(f"Pipeline job {job.index} repair failed: {e}")
+            job.feedback = f"Previous attempt failed with error: {job.validation.get('error', e)}"
+            return self._retry_or_fail(job, str(e), next_stage="code")
+        self._set_code(job, repair["code"])
+        return "validate"
+
+    async def _export_stage(self, job: PipelineJob, executor: Executor) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            # Named per job: timestamped names collide when several jobs finish in the same second.
+            path = await loop.run_in_executor(executor, self._export, job)
+            job.outputs[self.export_format] = path
+        except Exception as e:
+            # The model itself is valid; report the export failure without failing the job.
+            job.message = f"Export failed: {e}"
+        if self.release_after_export:
+            job.model.release()
+        elif self.spill_models:
+            job.model.spill()
+        return None
+
+    def _export(self, job: PipelineJob) -> str:
+        return export_model_with_name(job.model.get(), self.output_dir, f"job_{job.index:04d}", self.export_format)
+
+    def _start_route(self, job: PipelineJob, worker: str) -> Optional[str]:
+        """Pick the model for ``worker`` through the director and open its ticket."""
+        model = self.director.route(worker, job.state)
+        job.models[worker] = model
+        ticket = self.director.start_route(worker, model)
+        if ticket is not None:
+            job.tickets[worker] = ticket
+        return model
+
+    def _stop_route(self, job: PipelineJob, worker: str):
+        self.director.stop_route(job.tickets.get(worker))
+
+    def _finish_route(self, job: PipelineJob, worker: str, success: bool):
+        self.director.finish_route(job.tickets.pop(worker, None), success)
+
+    def _retry_or_fail(self, job: PipelineJob, error: str, next_stage: str) -> Optional[str]:
+        """Record the failed attempt and route the job on, or finish it when the policy says stop."""
+        job.state.record_failure(error, time.monotonic() - job.attempt_started_at)
+        if self.director.should_retry(job.state):
+            return next_stage
+        job.status = "error"
+        if self.director.router is not None and job.models.get("SpecWorker"):
+            self.director.router.record_generation("SpecWorker", job.models["SpecWorker"], job.iterations, success=False)
+        job.message = (
+            f"Failed to generate valid code after {job.iterations} attempts: {job.state.stop_reason}. "
+            f"Last error: {error}"
+        )
+        return None
@@ -0,0 +1,104 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+DIRECT = "direct"
+SPEC = "spec"
+
+# Base bodies CodeWorker gets right without a specification.
+SIMPLE_SHAPES = {
+    "cube", "box", "block", "cuboid", "brick", "slab", "bar", "beam", "plate", "sheet", "tile",
+    "cylinder", "rod", "shaft", "pin", "peg", "dowel", "disc", "disk", "puck", "coin",
+    "sphere", "ball", "hemisphere", "dome", "cone", "pyramid", "prism", "wedge", "torus", "donut",
+    "washer", "ring", "tube", "pipe", "sleeve", "bushing", "spacer", "standoff", "cup",
+}
+# Features that add one operation each; a couple of them keep a part simple.
+FEATURES = {
+    "hole", "holes", "bore", "fillet", "fillets", "filleted", "rounded", "round", "chamfer", "chamfers",
+    "chamfered", "bevel", "bevelled", "beveled", "slot", "slots", "pocket", "pockets", "cutout", "counterbore",
+    "counterbored", "countersink", "countersunk", "groove", "notch", "recess", "boss", "shell", "shelled",
+    "hollow", "lip", "flange", "tab",
+}
+# Geometry that needs the planning the spec-first path does.
+COMPLEX_TERMS = {
+    "gear", "gears", "sprocket", "thread", "threads", "threaded", "helix", "helical", "spiral", "spring",
+    "involute", "cam", "airfoil", "aerofoil", "propeller", "impeller", "turbine", "blade", "fan",
+    "loft", "lofted", "sweep", "swept", "spline", "curve", "curved", "organic", "text", "engraved",
+    "embossed", "logo", "knurl", "knurled", "bearing", "hinge", "mechanism", "assembly", "joint",
+    "enclosure", "housing", "snap", "clip", "latch", "rib", "ribs", "gusset", "lattice",
+    "honeycomb", "mesh", "grid", "pattern", "array", "polar", "bracket", "mount", "adapter",
+    "manifold", "nozzle", "funnel", "vase", "bottle", "handle", "phone", "hook",
+}
+MAX_WORDS = 30
+MAX_NUMBERS = 6
+MAX_FEATURES = 2
+MAX_SENTENCES = 2
+
+_WORD_RE = re.compile(r"[a-z]+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_SENTENCE_RE = re.compile(r"[.!?;]+(?:\s|$)")
+
+
+@dataclass
+class PromptClass:
+    """Route chosen for a prompt, and why."""
+    route: str
+    reasons: List[str] = field(default_factory=list)
+    part_name: str = "part"
+
+    @property
+    def direct(self) -> bool:
+        return self.route == DIRECT
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"route": self.route, "reasons": self.reasons, "part_name": self.part_name}
+
+
+def classify_prompt(prompt: str) -> PromptClass:
+    """
+    Decide from the prompt text alone whether a part is simple enough to go
+    straight to code generation (``direct``) or needs a specification first
+    (``spec``).
+
+    A prompt is simple when it names one basic body (cube, cylinder, plate,
+    washer, ...), adds at most MAX_FEATURES features such as holes, fillets or
+    chamfers, uses at most MAX_NUMBERS dimensions, and mentions nothing from
+    COMPLEX_TERMS; short, single-sentence prompts only. Anything else, or
+    anything unrecognised, keeps the spec-first path, so a doubtful prompt
+    costs a spec call rather than a failed attempt.
+    """
+    text = prompt.lower()
+    words = _WORD_RE.findall(text)
+    shapes = [word for word in words if word in SIMPLE_SHAPES]
+    reasons = []
+
+    complex_terms = sorted({word for word in words if word in COMPLEX_TERMS})
+    if complex_terms:
+        reasons.append(f"complex geometry: {', '.join(complex_terms)}")
+    if not shapes:
+        reasons.append("no basic body named")
+    elif len(set(shapes)) > 1:
+        reasons.append(f"several bodies: {', '.join(sorted(set(shapes)))}")
+    features = [word for word in words if word in FEATURES]
+    if len(features) > MAX_FEATURES:
+        reasons.append(f"{len(features)} features")
+    numbers = _NUMBER_RE.findall(text)
+    if len(numbers) > MAX_NUMBERS:
+        reasons.append(f"{len(numbers)} dimensions")
+    if len(words) > MAX_WORDS:
+        reasons.append(f"{len(words)} words")
+    sentences = len(_SENTENCE_RE.findall(text.strip() + " "))
+    if sentences > MAX_SENTENCES:
+        reasons.append(f"{sentences} sentences")
+
+    return PromptClass(DIRECT if not reasons else SPEC, reasons, shapes[0] if shapes else "part")
+
+
+def direct_specification(prompt: str, classification: Optional[PromptClass] = None) -> Dict[str, Any]:
+    """
+    Stand-in for a SpecWorker specification on the direct route: the prompt is
+    the description, which DirectCodeWorker, FeedbackWorker and RepairWorker
+    read like any other spec.
+    """
+    classification = classification or classify_prompt(prompt)
+    return {"part_name": classification.part_name, "description": prompt, "route": DIRECT}
@@ -0,0 +1,284 @@
+import ast
+import asyncio
+import csv
+import itertools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from loguru import logger
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+
+SWEEP_TABLE = "sweep.csv"
+
+Number = (int, float)
+
+
+@dataclass
+class VariantResult:
+    """Outcome of one parameter combination."""
+    index: int
+    parameters: Dict[str, Any]
+    valid: bool
+    volume: Optional[float] = None
+    exec_time: float = 0.0
+    total_time: float = 0.0
+    error: Optional[str] = None
+    outputs: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _literal(node: ast.expr) -> Any:
+    value = ast.literal_eval(node)
+    if isinstance(value, bool) or not isinstance(value, Number):
+        raise ValueError("not a numeric literal")
+    return value
+
+
+def _parameter_nodes(code: str) -> Dict[str, ast.Assign]:
+    """First top-level ``name = <number>`` assignment per name, in script order."""
+    nodes: Dict[str, ast.Assign] = {}
+    for node in ast.parse(code).body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+            continue
+        name = node.targets[0].id
+        if name in nodes:
+            continue
+        try:
+            _literal(node.value)
+        except (ValueError, SyntaxError):
+            continue
+        nodes[name] = node
+    return nodes
+
+
+def extract_parameters(code: str) -> Dict[str, Any]:
+    """
+    The numeric parameters of a generated script: its top-level ``name = <number>``
+    assignments, i.e. the ``# parameters`` block CodeWorker writes.
+    """
+    return {name: _literal(node.value) for name, node in _parameter_nodes(code).items()}
+
+
+def apply_parameters(code: str, values: Dict[str, Any]) -> str:
+    """
+    Return ``code`` with the given parameters set to new values.
+
+    Only the literal is replaced, so comments and formatting are kept.
+
+    Raises:
+        ValueError: If a name is not a parameter of the script.
+    """
+    nodes = _parameter_nodes(code)
+    unknown = sorted(set(values) - set(nodes))
+    if unknown:
+        raise ValueError(f"Unknown parameters {unknown}. Script parameters: {sorted(nodes)}")
+
+    lines = code.splitlines(keepends=True)
+    # Bottom-up, so earlier offsets stay valid.
+    for name in sorted(values, key=lambda name: nodes[name].value.lineno, reverse=True):
+        value = nodes[name].value
+        start, end = value.lineno - 1, value.end_lineno - 1
+        # col offsets are in UTF-8 bytes
+        head = lines[start].encode()[:value.col_offset].decode()
+        tail = lines[end].encode()[value.end_col_offset:].decode()
+        lines[start:end + 1] = [f"{head}{values[name]!r}{tail}"]
+    return "".join(lines)
+
+
+def parse_range(text: str) -> List[Any]:
+    """
+    Values of one parameter range: ``start:stop:step`` (inclusive) or a
+    comma-separated list. Integers stay integers.
+    """
+    def number(token: str):
+        token = token.strip()
+        return int(token) if token.lstrip("+-").isdigit() else float(token)
+
+    if ":" in text:
+        parts = [number(part) for part in text.split(":")]
+        if len(parts) != 3 or parts[2] <= 0 or parts[1] < parts[0]:
+            raise ValueError(f"Range '{text}' must be start:stop:step with step > 0 and stop >= start")
+        start, stop, step = parts
+        count = int(round((stop - start) / step, 9)) + 1
+        values = [start + step * i for i in range(count)]
+        if not all(isinstance(part, int) for part in parts):
+            values = [round(value, 10) for value in values]
+        return values
+    return [number(part) for part in text.split(",") if part.strip()]
+
+
+def parse_ranges(specs: Sequence[str]) -> Dict[str, List[Any]]:
+    """Parse ``name=range`` arguments, e.g. ``["thickness=2:10:2", "holes=4,6,8"]``."""
+    ranges = {}
+    for spec in specs:
+        name, sep, text = spec.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Parameter range '{spec}' must look like name=start:stop:step or name=a,b,c")
+        ranges[name.strip()] = parse_range(text)
+    return ranges
+
+
+def expand_grid(ranges: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the parameter ranges."""
+    names = list(ranges)
+    return [dict(zip(names, combination)) for combination in itertools.product(*(ranges[name] for name in names))]
+
+
+# Per-process state of the pool workers.
+_validation_worker = None
+
+
+def _init_worker():
+    """Pool initializer: load CadQuery/OCC and run a small model once, so the first variant is not paying for it."""
+    global _validation_worker
+    logger.disable("src")
+    import cadquery as cq
+    from src.workers.validation_worker import ValidationWorker
+
+    cq.Workplane("XY").box(1, 1, 1).edges().fillet(0.1).val().Volume()
+    # Variants differ in their code anyway, and the disk cache is not safe across processes.
+    _validation_worker = ValidationWorker(incremental=False, cache=False, profile=False)
+
+
+def _run_variant(
+    index: int,
+    code: str,
+    parameters: Dict[str, Any],
+    output_dir: Optional[str],
+    formats: Sequence[str],
+    thumbnails: bool,
+) -> VariantResult:
+    from src.output_handler.exporter import export_model_with_name
+    from src.output_handler.visualizer import visualizer
+
+    start = time.perf_counter()
+    validation = _validation_worker.validate(apply_parameters(code, parameters))
+    exec_time = time.perf_counter() - start
+    if not validation["success"]:
+        return VariantResult(index, parameters, False, exec_time=exec_time,
+                             total_time=time.perf_counter() - start, error=validation["error"])
+
+    model = validation["object"]
+    result = VariantResult(index, parameters, True, exec_time=exec_time)
+    try:
+        result.volume = sum(shape.Volume() for shape in model.vals())
+        if output_dir is not None:
+            name = f"variant_{index:04d}"
+            for fmt in formats:
+                result.outputs[fmt] = export_model_with_name(model, output_dir, name, format=fmt)
+            if thumbnails:
+                thumbnail = visualizer.generate_thumbnail(model, str(Path(output_dir) / f"{name}.png"))
+                if thumbnail:
+                    result.outputs["thumbnail"] = thumbnail
+    except Exception as e:
+        result.error = f"Post-processing failed: {e}"
+    result.total_time = time.perf_counter() - start
+    return result
+
+
+class ParameterSweep:
+    """
+    Runs every combination of parameter ranges of a validated script, without
+    any LLM calls, in a pool of pre-warmed CadQuery worker processes.
+
+    Workers are started with ``spawn``: the parent may already hold VTK windows,
+    HTTP connections and threads that must not be forked. The pool is kept
+    between ``run`` calls; ``close`` it when done.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or settings.sweep_workers or multiprocessing.cpu_count()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    async def run(
+        self,
+        code: str,
+        ranges: Dict[str, List[Any]],
+        output_dir: Optional[str] = None,
+        formats: Sequence[str] = ("step",),
+        thumbnails: bool = False,
+    ) -> AsyncIterator[VariantResult]:
+        """
+        Yield a VariantResult per combination as it finishes (completion order;
+        ``index`` follows the order of ``expand_grid``). With ``output_dir``,
+        every valid variant is exported in ``formats`` (and thumbnailed) and the
+        results table is written there as sweep.csv.
+
+        Raises:
+            ValueError: If a range names something that is not a script parameter.
+        """
+        combinations = expand_grid(ranges)
+        # Fail before starting any work.
+        apply_parameters(code, {name: values[0] for name, values in ranges.items() if values})
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Sweeping {len(combinations)} variants over {list(ranges)} with {self.workers} workers")
+        futures = [
+            asyncio.wrap_future(self.pool.submit(_run_variant, index, code, parameters, output_dir, formats, thumbnails))
+            for index, parameters in enumerate(combinations)
+        ]
+
+        results = []
+        try:
+            for future in asyncio.as_completed(futures):
+                result = await future
+                results.append(result)
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            if output_dir is not None and results:
+                write_table(sorted(results, key=lambda result: result.index), Path(output_dir) / SWEEP_TABLE)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "ParameterSweep":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def write_table(results: List[VariantResult], path: Path):
+    """Write the sweep results as CSV, one row per variant and one column per parameter."""
+    names = list(results[0].parameters) if results else []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["index", *names, "valid", "volume", "exec_time", "total_time", "error", "outputs"])
+        for result in results:
+            writer.writerow([
+                result.index,
+                *(result.parameters[name] for name in names),
+                result.valid,
+                "" if result.volume is None else f"{result.volume:.6g}",
+                f"{result.exec_time:.4f}",
+                f"{result.total_time:.4f}",
+                result.error or "",
+                ";".join(result.outputs.values()),
+            ])
+    logger.success(f"Sweep table written to {path}")
@@ -8,89 +8,71 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.director.cad_director import CadDirector
 from src.utilities.logging_config import configure_logging
 from src.config.settings import settings
-from src.output_handler.exporter import export_model, export_model_with_name
-from src.output_handler.visualizer import visualizer
+from src.utilities.llm_backends import warm_up_backends, close_backends
+from src import daemon
 
 async def main():
     configure_logging()
     
     parser = argparse.ArgumentParser(description="Generate CAD models from text prompts")
-    parser.add_argument("prompt", help="Text description of the CAD model to generate")
+    parser.add_argument("prompt", nargs="?", help="Text description of the CAD model to generate")
     parser.add_argument("-o", "--output", default="outputs/models/", help="Output directory for generated files")
-    parser.add_argument("-f", "--format", choices=["step", "stl"], default="step", help="Output file format")
+    parser.add_argument("-f", "--format", choices=["step", "stl"], nargs="+", default=["step"], help="Output file format(s)")
     parser.add_argument("-n", "--name", help="Custom filename (without extension)")
     parser.add_argument("--no-export", action="store_true", help="Skip file export")
+    parser.add_argument("--split-bodies", action="store_true",
+                        help="Export one file per body, written in parallel, with a manifest of the bodies")
     parser.add_argument("--visualize", action="store_true", help="Visualize the generated model")
     parser.add_argument("--screenshot", help="Path to save a screenshot of the model visualization")
     parser.add_argument("--thumbnail", help="Path to save a thumbnail image of the model")
+    parser.add_argument("--batch", metavar="FILE", help="Generate every prompt in FILE (one per line) and write a manifest")
+    parser.add_argument("--assembly", action="store_true", help="Generate a multi-part assembly, one model per part")
+    parser.add_argument("--repair", choices=["feedback", "single"],
+                        help="Repair loop: feedback advice then new code (two calls), or fixed code in one call (default: REPAIR_MODE)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Hard time limit per generation (default: GENERATION_DEADLINE)")
+    parser.add_argument("--progress", action="store_true", help="Print each step of the generation as it happens")
+    parser.add_argument("--profile", action="store_true", help="Profile the CadQuery operations of the validated script")
+    parser.add_argument("--sweep", metavar="SCRIPT", help="Run parameter variants of a validated CadQuery script (no LLM calls)")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=RANGE",
+                        help="Sweep range, start:stop:step or a,b,c (repeatable)")
+    parser.add_argument("--thumbnails", action="store_true", help="Render a thumbnail for every sweep variant")
+    parser.add_argument("--route-stats", action="store_true",
+                        help="Show latency and success rate of the direct and spec-first prompt routes")
+    parser.add_argument("--no-daemon", action="store_true", help="Run in this process even if the daemon is running")
     
     args = parser.parse_args()
+    if not args.prompt and not args.batch and not args.sweep and not args.route_stats:
+        parser.error("a prompt, --batch FILE or --sweep SCRIPT is required")
+    if args.sweep and not args.param:
+        parser.error("--sweep needs at least one --param NAME=RANGE")
+    if args.batch and len(args.format) > 1:
+        parser.error("--batch exports a single format")
     
     # Ensure output directory exists
     Path(args.output).mkdir(parents=True, exist_ok=True)
-    
-    director = CadDirector()
-    result = await director.generate_from_prompt(args.prompt)
-    
-    if result["status"] == "success":
-        print("✅ CAD model generated successfully!")
-        print(f"   Part: {result['specification']['part_name']}")
-        print(f"   Iterations: {result['iterations']}")
-        print(f"   Model ready for export to {args.output}")
 
-        # Visualize the model if requested
-        if args.visualize or args.screenshot:
-            try:
-                screenshot_path = visualizer.visualize_model(
-                    result["model"], 
-                    args.screenshot
-                )
-                if screenshot_path:
-                    print(f"   Screenshot saved to: {screenshot_path}")
-            except Exception as e:
-                print(f"Visualization failed: {e}")
-        
-        # Generate thumbnail if requested
-        if args.thumbnail:
-            try:
-                thumbnail_path = visualizer.generate_thumbnail(
-                    result["model"], 
-                    args.thumbnail
-                )
-                if thumbnail_path:
-                    print(f"   Thumbnail saved to: {thumbnail_path}")
-            except Exception as e:
-                print(f"Thumbnail generation failed: {e}")
-        
-        # Export the model unless disabled
-        if not args.no_export:
-            try:
-                if args.name:
-                    export_path = export_model_with_name(
-                        result["model"],
-                        args.output,
-                        args.name,
-                        format=args.format
-                    )
-                else:
-                    export_path = export_model(
-                        result["model"],
-                        args.output,
-                        format=args.format
-                    )
-                print(f"   Exported to: {export_path}")
-            except Exception as e:
-                print(f"Failed to export model: {e}")
+    # The interactive viewer has to open in this process, not the daemon's.
+    if not args.no_daemon and not args.visualize:
+        code = daemon.forward(args)
+        if code is not None:
+            return code
+
+    # Loaded only now: importing CadQuery and VTK is most of a cold start.
+    from src.commands import run
+    from src.director.model_stats import close_stores
+
+    # Open the backend connections while the rest of the startup runs
+    warm_up = asyncio.create_task(warm_up_backends()) if settings.http_warmup else None
+    try:
+        await run(args, warm_up)
+    finally:
+        await close_backends()
+        close_stores()
+    return 0
 
-        else:
-            print("   Export skipped as per user request.")
-    else:
-        print("CAD generation failed.")
-        print(f" Error: {result['message']}")
-                    
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
@@ -1,3 +1,4 @@
-from .exporter import export_model, export_model_with_name
+from .exporter import export_model, export_model_with_name, export_assembly, export_bodies
+from .model_handle import ModelHandle, ModelReleasedError
 
-__all__ = ["export_model", "export_model_with_name"]
\ No newline at end of file
+__all__ = ["export_model", "export_model_with_name", "export_assembly", "export_bodies", "ModelHandle", "ModelReleasedError"]
\ No newline at end of file
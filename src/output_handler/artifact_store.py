@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from loguru import logger
+import sys
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+
+INDEX_FILE = "index.jsonl"
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of exported model files.
+
+    An artifact is named by the shape digest (see ``shape_io.digest``) and its
+    format, ``objects/<ab>/<digest>.<format>``, and is written once: exporting
+    an identical model again, in any run or job, costs a hash and an exists
+    check. Output files are hard links to the artifact (a symlink, or a copy,
+    where the output directory is on another file system), so edit exported
+    files by writing a new file, not in place.
+
+    ``index.jsonl`` maps jobs to the digests of their artifacts, one line per
+    change, so re-exporting a job whose model did not change writes nothing at
+    all. Safe to share between threads; processes may share a store, the index
+    is append-only.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / INDEX_FILE
+        self.writes = 0
+        self.reuses = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, str]] = {}
+        self._index_lines = 0
+        self._load_index()
+
+    def artifact_path(self, digest: str, format: str) -> Path:
+        return self.directory / "objects" / digest[:2] / f"{digest}.{format.lower()}"
+
+    def put(self, digest: str, format: str, write: Callable[[Path], None]) -> Path:
+        """
+        The artifact for ``digest`` in ``format``; ``write(path)`` produces it
+        only when the store does not have it yet.
+        """
+        path = self.artifact_path(digest, format)
+        if path.exists():
+            self.reuses += 1
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed into place, so a reader never sees half a file.
+        temp = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.{format.lower()}")
+        try:
+            write(temp)
+            os.replace(temp, path)
+        finally:
+            temp.unlink(missing_ok=True)
+        self.writes += 1
+        return path
+
+    def export(self, digest: str, format: str, destination: Path, write: Callable[[Path], None], job: Optional[str] = None) -> str:
+        """
+        Put the artifact in the store (see ``put``), link it to ``destination``
+        and record it for ``job`` (default: the destination without extension).
+        """
+        artifact = self.put(digest, format, write)
+        self.link(artifact, destination)
+        self.record(job or str(destination.resolve().with_suffix("")), format, digest)
+        return str(destination)
+
+    def link(self, artifact: Path, destination: Path):
+        """Make ``destination`` refer to ``artifact``; nothing is written if it already does."""
+        try:
+            if destination.exists() and os.path.samefile(artifact, destination):
+                return
+        except OSError:
+            pass
+        destination.unlink(missing_ok=True)
+        try:
+            os.link(artifact, destination)
+        except OSError:
+            try:
+                destination.symlink_to(artifact.resolve())
+            except OSError:
+                shutil.copyfile(artifact, destination)
+
+    def lookup(self, job: str) -> Dict[str, Path]:
+        """Artifacts recorded for ``job`` by format (only those still in the store)."""
+        with self._lock:
+            digests = dict(self._index.get(job, {}))
+        paths = {format: self.artifact_path(digest, format) for format, digest in digests.items()}
+        return {format: path for format, path in paths.items() if path.exists()}
+
+    def record(self, job: str, format: str, digest: str):
+        with self._lock:
+            formats = self._index.setdefault(job, {})
+            if formats.get(format) == digest:
+                return
+            formats[format] = digest
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"job": job, "format": format, "digest": digest}) + "\n")
+            self._index_lines += 1
+
+    def compact(self):
+        """Rewrite the index with one line per job and format."""
+        with self._lock:
+            temp = self.index_path.with_suffix(".tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                for job, formats in self._index.items():
+                    for format, digest in formats.items():
+                        f.write(json.dumps({"job": job, "format": format, "digest": digest}) + "\n")
+            os.replace(temp, self.index_path)
+            self._index_lines = sum(len(formats) for formats in self._index.values())
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        for line in self.index_path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+                self._index.setdefault(entry["job"], {})[entry["format"]] = entry["digest"]
+            except (ValueError, KeyError, TypeError):
+                continue  # a line cut short by a crash
+            self._index_lines += 1
+        entries = sum(len(formats) for formats in self._index.values())
+        if self._index_lines > 2 * entries + 100:
+            self.compact()
+        logger.debug(f"Artifact store index: {entries} artifacts for {len(self._index)} jobs")
+
+
+_stores: Dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def default_store() -> Optional[ArtifactStore]:
+    """The store in ARTIFACT_STORE_DIR, or None when ARTIFACT_STORE is off."""
+    if not settings.artifact_store:
+        return None
+    with _stores_lock:
+        if settings.artifact_store_dir not in _stores:
+            _stores[settings.artifact_store_dir] = ArtifactStore(settings.artifact_store_dir)
+        return _stores[settings.artifact_store_dir]
@@ -2,11 +2,22 @@ import cadquery as cq
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+from src.output_handler import shape_io
+from src.output_handler.artifact_store import default_store
 
 def export_model(cadquery_obj, output_dir: str, format: str = "step") -> str:
     """
-    Export a CadQuery object to a file.
+    Export a CadQuery object to a file named after its content, ``model_<digest>.<format>``.
     
     Args: 
     cadquery_obj: The CadQuery object to export.
@@ -14,28 +25,15 @@ def export_model(cadquery_obj, output_dir: str, format: str = "step") -> str:
     format (str): File format, either "step" or "stl
     """
     try:
-        # Ensure the output directory exists
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"model_{timestamp}.{format}"
-        filepath = output_path / filename
-
-        # Export based on format
-        if format.lower() == "step":
-            cadquery_obj.val().exportStep(str(filepath))
-        elif format.lower() == "stl":
-            cadquery_obj.val().exportStl(str(filepath))
-        else:
-            raise ValueError(f"Unsupported format: {format}. Use 'step' or 'stl'.")
+        _check_format(format)
+        digest = shape_io.digest(cadquery_obj)
+        return _export(cadquery_obj, output_dir, f"model_{digest[:16]}", format, digest)
         
     except Exception as e:
         logger.error(f"Failed to export model: {e}")
         raise
 
-def export_model_with_name(cadquery_obj, output_dir: str, filename: str, formart: str = "step") -> str:
+def export_model_with_name(cadquery_obj, output_dir: str, filename: str, format: str = "step", job: Optional[str] = None) -> str:
     """
     Export a CadQuery object to a file with a specific filename.
     
@@ -44,29 +42,162 @@ def export_model_with_name(cadquery_obj, output_dir: str, filename: str, formart
     output_dir (str): Directory to save the exported file.
     filename (str): Desired filename without extension.
     format (str): File format, either "step" or "stl
+    job (str): Name the artifact store records the export under; defaults to the file path.
+    """
+    try:
+        _check_format(format)
+        # Ensure filename has correct extension
+        if filename.endswith(f".{format}"):
+            filename = filename[:-len(format) - 1]
+        return _export(cadquery_obj, output_dir, filename, format, job=job)
+    
+    except Exception as e:
+        logger.error(f"Failed to export model: {e}")
+        raise
+
+
+def _check_format(format: str):
+    if format.lower() not in ("step", "stl"):
+        raise ValueError(f"Unsupported format: {format}. Use 'step' or 'stl'.")
+
+
+def write_model(cadquery_obj, filepath, format: str):
+    """
+    Write every shape on the Workplane stack to ``filepath`` (one compound when
+    there are several), with no store involved.
+    """
+    shape = shape_io.to_shape(cadquery_obj)
+    if format.lower() == "step":
+        shape.exportStep(str(filepath))
+    elif format.lower() == "stl":
+        shape.exportStl(str(filepath))
+    else:
+        raise ValueError(f"Unsupported format: {format}. Use 'step' or 'stl'.")
+
+
+def _export(
+    cadquery_obj, output_dir: str, filename: str, format: str, digest: Optional[str] = None, job: Optional[str] = None,
+    quiet: bool = False,
+) -> str:
+    """Export to ``output_dir/filename.format``, through the artifact store when it is enabled."""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    filepath = output_path / f"{filename}.{format}"
+
+    store = default_store()
+    if store is None:
+        write_model(cadquery_obj, filepath, format)
+    else:
+        digest = digest or shape_io.digest(cadquery_obj)
+        store.export(digest, format, filepath, lambda path: write_model(cadquery_obj, path, format), job=job)
+
+    if quiet:
+        logger.debug(f"Exported {format.upper()} model to {filepath}")
+    else:
+        logger.success(f"Exported {format.upper()} model to {filepath}")
+    return str(filepath)
+
+
+def model_bodies(cadquery_obj) -> List[cq.Shape]:
+    """
+    Every body of a model: the solids of each shape on the Workplane stack,
+    compounds included. Shapes without solids (faces, shells) count as one body.
+    """
+    bodies = []
+    for obj in cadquery_obj.vals():
+        if isinstance(obj, cq.Shape):
+            bodies.extend(obj.Solids() or [obj])
+    return bodies
+
+
+def export_bodies(
+    cadquery_obj, output_dir: str, filename: Optional[str] = None, format: str = "step", max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Export every body of a model to its own file, ``<filename>_body_<nnn>.<format>``,
+    writing the files in parallel, and describe them in a manifest,
+    ``<filename>_bodies.<format>.json``.
+
+    Args:
+    cadquery_obj: The CadQuery object to export.
+    output_dir (str): Directory to save the exported files.
+    filename (str): Base filename without extension; defaults to a content-based name.
+    format (str): File format, either "step" or "stl"
+    max_workers (int): Parallel writes (default: EXPORT_WORKERS, else one per CPU).
+
+    Returns:
+        Dict[str, Any]: The manifest: per body its file, shape type, bounding box
+        and volume, plus the manifest's own path under "manifest".
+    """
+    try:
+        _check_format(format)
+        bodies = model_bodies(cadquery_obj)
+        if not bodies:
+            raise ValueError("Model holds no shapes to export")
+        filename = filename or f"model_{shape_io.digest(cadquery_obj)[:16]}"
+        workers = min(len(bodies), max_workers or settings.export_workers or os.cpu_count() or 1)
+
+        def write(index: int, body: cq.Shape) -> Dict[str, Any]:
+            # Meshing writes into the shape, and bodies of one model may share sub-shapes.
+            body = body.copy() if format.lower() == "stl" else body
+            path = _export(cq.Workplane("XY").newObject([body]), output_dir, f"{filename}_body_{index:03d}", format, quiet=True)
+            bbox = body.BoundingBox()
+            return {
+                "index": index,
+                "file": Path(path).name,
+                "shape_type": body.ShapeType(),
+                "bbox": [bbox.xmin, bbox.ymin, bbox.zmin, bbox.xmax, bbox.ymax, bbox.zmax],
+                "volume": body.Volume(),
+            }
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cad-export") as executor:
+            entries = list(executor.map(write, range(len(bodies)), bodies))
+
+        manifest = {
+            "name": filename,
+            "format": format,
+            "body_count": len(entries),
+            "volume": sum(entry["volume"] for entry in entries),
+            "bodies": entries,
+        }
+        manifest_path = Path(output_dir) / f"{filename}_bodies.{format}.json"
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        manifest["manifest"] = str(manifest_path)
+
+        logger.success(f"Exported {len(entries)} {format.upper()} bodies to {output_dir} ({manifest_path.name})")
+        return manifest
+
+    except Exception as e:
+        logger.error(f"Failed to export bodies: {e}")
+        raise
+
+
+def export_assembly(assembly: cq.Assembly, output_dir: str, filename: Optional[str] = None, format: str = "step") -> str:
+    """
+    Export a cq.Assembly, keeping part names, placements and colors (STEP) or as one mesh (STL).
+    
+    Args: 
+    assembly: The cq.Assembly to export.
+    output_dir (str): Directory to save the exported file.
+    filename (str): Filename without extension; defaults to a timestamped name.
+    format (str): File format, either "step" or "stl"
     """
     try:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Ensure filename has correct extension
-        if not filename.endswith(f".{format}"):
-            filename = f"{filename}.{format}"
+        if format.lower() not in ("step", "stl"):
+            raise ValueError(f"Unsupported format: {format}. Use 'step' or 'stl'.")
 
-        filepath = output_path / filename
+        if filename is None:
+            filename = f"assembly_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        filepath = output_path / f"{filename}.{format.lower()}"
 
-        if format.lower() == "step":
-            cadquery_obj.val().exportStep(str(filepath))
-        elif format.lower() == "stl":
-            cadquery_obj.val().exportStl(str(filepath))
-        else:
-            raise ValueError(f"Unsupported format: {format}. Use 'step' or 'stl'.")
+        assembly.export(str(filepath), exportType=format.upper())
         
-        logger.success(f"Exported {format.upper()} model to {filepath}")
+        logger.success(f"Exported {format.upper()} assembly to {filepath}")
         return str(filepath)
     
     except Exception as e:
-        logger.error(f"Failed to export model: {e}")
+        logger.error(f"Failed to export assembly: {e}")
         raise
-
-    
\ No newline at end of file
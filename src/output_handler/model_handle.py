@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+import cadquery as cq
+from loguru import logger
+import sys
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+from src.output_handler import shape_io
+
+LIVE = "live"
+SPILLED = "spilled"
+RELEASED = "released"
+
+
+class ModelReleasedError(RuntimeError):
+    """Raised when the model of a released ModelHandle is accessed."""
+
+
+class ModelHandle:
+    """
+    Owner of a generated model's OCC shapes.
+
+    A handle starts ``live``. ``spill()`` writes the shape to disk (binary BREP)
+    and drops the in-memory reference; ``get()`` reloads it on demand. Once the
+    model has been exported, ``release()`` drops the shape and deletes any
+    spill file, so a long-running process only holds what it still needs.
+
+        handle = result["model"]
+        export_model(handle.get(), output_dir)
+        handle.release()
+
+    Only the handle should hold on to the Workplane: a reference kept elsewhere
+    keeps the OCC shapes alive after release.
+    """
+
+    def __init__(self, model: cq.Workplane, spill_dir: Optional[str] = None):
+        self._model: Optional[cq.Workplane] = model
+        self._compound = len(model.vals()) > 1
+        self.spill_dir = spill_dir or settings.model_spill_dir
+        self.path: Optional[str] = None
+        self.state = LIVE
+        self._lock = threading.Lock()
+
+    def get(self) -> cq.Workplane:
+        """The model, reloaded from disk if it was spilled."""
+        with self._lock:
+            if self.state == RELEASED:
+                raise ModelReleasedError("Model has been released")
+            if self._model is None:
+                self._model = self._load()
+                self.state = LIVE
+            return self._model
+
+    def spill(self) -> str:
+        """Write the model to disk (once) and drop the in-memory shapes."""
+        with self._lock:
+            if self.state == RELEASED:
+                raise ModelReleasedError("Model has been released")
+            if self.path is None:
+                Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+                fd, path = tempfile.mkstemp(suffix=".cqsb", dir=self.spill_dir)
+                os.close(fd)
+                shape_io.dump(self._model, path, metadata=False)
+                self.path = path
+            self._model = None
+            self.state = SPILLED
+            return self.path
+
+    def release(self):
+        """Drop the model and its spill file. Safe to call more than once."""
+        with self._lock:
+            self._model = None
+            self.state = RELEASED
+            if self.path is not None:
+                try:
+                    os.unlink(self.path)
+                except OSError as e:
+                    logger.warning(f"Could not remove spilled model {self.path}: {e}")
+                self.path = None
+
+    def _load(self) -> cq.Workplane:
+        if self.path is None:
+            raise ModelReleasedError("Model was neither live nor spilled")
+        data = Path(self.path).read_bytes()
+        if self._compound:
+            return shape_io.load_workplane(data)
+        return cq.Workplane("XY").newObject([shape_io.loads(data)])
+
+    def __enter__(self) -> "ModelHandle":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+    def __repr__(self) -> str:
+        return f"ModelHandle(state={self.state!r}, path={self.path!r})"
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import cadquery as cq
+from loguru import logger
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler.exporter import export_bodies, export_model, export_model_with_name
+from src.output_handler.visualizer import visualizer
+
+SCREENSHOT_SIZE = (1024, 768)
+THUMBNAIL_SIZE = (400, 300)
+
+
+@dataclass
+class PostProcessResult:
+    """Outcome of one post-processing task."""
+    task: str
+    success: bool
+    output: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def copy_model(model: cq.Workplane) -> cq.Workplane:
+    """
+    Deep copy of the model's shapes. Meshing writes the triangulation into the
+    shape, so tasks that run at the same time each get their own copy.
+    """
+    return cq.Workplane("XY").newObject([
+        obj.copy() if isinstance(obj, cq.Shape) else obj for obj in model.vals()
+    ])
+
+
+class PostProcessor:
+    """
+    Runs the post-processing of one generated model as independent tasks.
+
+    Every export format runs in its own executor thread. The thumbnail and the
+    screenshot come from a single offscreen render, in one more thread. The
+    interactive viewer has to stay on the main thread; it is opened after the
+    exports are started, so exports never wait for the window to be closed.
+    With the viewer the offscreen render also runs on the main thread, just
+    before the viewer opens: VTK render windows on different threads at once
+    are not safe (under X11 they can crash). Total time approaches that of the
+    slowest task rather than their sum.
+    """
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self._executor = executor
+
+    async def run(
+        self,
+        model: cq.Workplane,
+        output_dir: Optional[str] = None,
+        formats: Sequence[str] = ("step",),
+        name: Optional[str] = None,
+        thumbnail: Optional[str] = None,
+        screenshot: Optional[str] = None,
+        view: bool = False,
+        on_done: Optional[Callable[[PostProcessResult], None]] = None,
+        split_bodies: bool = False,
+    ) -> Dict[str, PostProcessResult]:
+        """
+        Export to ``output_dir`` in each of ``formats`` (skipped when no
+        output_dir), render ``thumbnail`` / ``screenshot`` offscreen and, with
+        ``view``, open the interactive viewer.
+
+        Exports hold every body of the model in one file; with ``split_bodies``
+        each body gets its own file instead (see ``export_bodies``) and the
+        export task's output is the bodies manifest.
+
+        ``on_done`` is called from the worker thread as soon as each task
+        finishes, also while the viewer is still open.
+
+        Returns:
+            Dict[str, PostProcessResult]: Keyed by task name ("export_step", "render", "view", ...).
+        """
+        tasks: Dict[str, Callable[[], Any]] = {}
+        if output_dir is not None:
+            for fmt in formats:
+                tasks[f"export_{fmt}"] = self._export_task(copy_model(model), output_dir, name, fmt, split_bodies)
+        images = {}
+        if thumbnail:
+            images[thumbnail] = THUMBNAIL_SIZE
+        if screenshot:
+            images[screenshot] = SCREENSHOT_SIZE
+        render = self._render_task(copy_model(model), images) if images else None
+        if render is not None and not view:
+            tasks["render"] = render
+
+        owns_executor = self._executor is None
+        executor = self._executor or ThreadPoolExecutor(
+            max_workers=max(1, len(tasks)), thread_name_prefix="cad-postprocess"
+        )
+        try:
+            futures: List[Future] = []
+            for task, func in tasks.items():
+                future = executor.submit(_timed, task, func)
+                if on_done is not None:
+                    future.add_done_callback(lambda done: on_done(done.result()))
+                futures.append(future)
+
+            results = {}
+            if view:
+                # One thread renders with VTK: the offscreen images first, then the
+                # viewer, which blocks until the window is closed. Exports keep running.
+                steps = [("render", render)] if render is not None else []
+                steps.append(("view", lambda: visualizer.visualize_model(model)))
+                for task, func in steps:
+                    results[task] = _timed(task, func)
+                    if on_done is not None:
+                        on_done(results[task])
+
+            for result in await asyncio.gather(*(asyncio.wrap_future(future) for future in futures)):
+                results[result.task] = result
+            return results
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+    def _export_task(
+        self, model: cq.Workplane, output_dir: str, name: Optional[str], fmt: str, split_bodies: bool = False
+    ) -> Callable[[], Any]:
+        if split_bodies:
+            return lambda: export_bodies(model, output_dir, name, format=fmt)
+        if name:
+            return lambda: export_model_with_name(model, output_dir, name, format=fmt)
+        return lambda: export_model(model, output_dir, format=fmt)
+
+    def _render_task(self, model: cq.Workplane, images: Dict[str, tuple]) -> Callable[[], Dict[str, str]]:
+        def render():
+            saved = visualizer.render_offscreen(model, images)
+            missing = [path for path in images if path not in saved]
+            if missing:
+                raise RuntimeError(f"Failed to render {', '.join(missing)}")
+            return saved
+        return render
+
+
+def _timed(task: str, func: Callable[[], Any]) -> PostProcessResult:
+    start = time.perf_counter()
+    try:
+        output = func()
+        return PostProcessResult(task, True, output, seconds=time.perf_counter() - start)
+    except Exception as e:
+        logger.error(f"Post-processing task {task} failed: {e}")
+        return PostProcessResult(task, False, error=str(e), seconds=time.perf_counter() - start)
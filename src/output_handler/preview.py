@@ -0,0 +1,45 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Union
+
+import cadquery as cq
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler.shape_io import to_shape
+
+
+@dataclass
+class PreviewMesh:
+    """Coarse triangle mesh of a model, flat arrays ready for a WebGL/three.js buffer."""
+    vertices: List[float]       # x0, y0, z0, x1, ...
+    triangles: List[int]        # vertex indices, three per triangle
+    bbox: List[float]           # xmin, ymin, zmin, xmax, ymax, zmax
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.triangles) // 3
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def preview_mesh(model: Union[cq.Workplane, cq.Shape], tolerance: float = 0.02, angular_tolerance: float = 0.5) -> PreviewMesh:
+    """
+    Low-fidelity mesh of every shape of ``model`` for progressive display.
+
+    ``tolerance`` is the chordal deviation as a fraction of the bounding-box
+    diagonal, so small and large parts get a similar triangle budget. The mesh
+    is made from a copy: meshing stores the triangulation in the shape, and a
+    coarse one must not end up in later STL exports.
+    """
+    shape = to_shape(model).copy()
+    bbox = shape.BoundingBox()
+    vertices, triangles = shape.tessellate(max(tolerance * bbox.DiagonalLength, 1e-6), angular_tolerance)
+    return PreviewMesh(
+        vertices=[round(coordinate, 6) for vertex in vertices for coordinate in vertex.toTuple()],
+        triangles=[index for triangle in triangles for index in triangle],
+        bbox=[bbox.xmin, bbox.ymin, bbox.zmin, bbox.xmax, bbox.ymax, bbox.zmax],
+    )
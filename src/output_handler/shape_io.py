@@ -0,0 +1,155 @@
+import hashlib
+import io
+import json
+import struct
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import cadquery as cq
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+
+MAGIC = b"CQSB"
+VERSION = 1
+_FLAG_COMPRESSED = 0x01
+# magic, version, flags, header length
+_PREAMBLE = struct.Struct("<4sBBI")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class ShapeIOError(ValueError):
+    """Raised for data that is not a valid serialised shape."""
+
+
+@dataclass
+class ShapeHeader:
+    """Metadata stored in front of the BREP payload, readable without decoding the shape."""
+    shape_type: str
+    solid_count: int
+    payload_size: int
+    bbox: Optional[List[float]] = None   # xmin, ymin, zmin, xmax, ymax, zmax
+    volume: Optional[float] = None
+    compressed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def to_shape(model: Union[cq.Workplane, cq.Shape]) -> cq.Shape:
+    """The shape of a Workplane result: its single object, or a compound of all of them."""
+    if isinstance(model, cq.Shape):
+        return model
+    shapes = [obj for obj in model.vals() if isinstance(obj, cq.Shape)]
+    if not shapes:
+        raise ShapeIOError("Workplane holds no shapes to serialise")
+    return shapes[0] if len(shapes) == 1 else cq.Compound.makeCompound(shapes)
+
+
+def dumps_view(
+    model: Union[cq.Workplane, cq.Shape], compress: bool = False, level: int = 1, metadata: bool = True
+) -> memoryview:
+    """
+    Serialise a shape to OCC binary BREP behind a metadata header.
+
+    Returns a memoryview over the internal buffer, avoiding a copy of the payload;
+    use ``dumps`` for bytes. ``compress`` applies zlib at ``level`` (binary BREP
+    is mostly float arrays, so level 1 gets most of the gain). Computing the
+    bounding box and volume usually costs more than the export itself on curved
+    parts; ``metadata=False`` leaves them out of the header.
+    """
+    shape = to_shape(model)
+    raw = io.BytesIO()
+    shape.exportBin(raw)
+    payload = raw.getbuffer()
+    if compress:
+        payload = zlib.compress(payload, level)
+
+    header = ShapeHeader(
+        shape_type=shape.ShapeType(),
+        solid_count=len(shape.Solids()),
+        payload_size=len(payload),
+        compressed=compress,
+    )
+    if metadata:
+        bbox = shape.BoundingBox()
+        header.bbox = [bbox.xmin, bbox.ymin, bbox.zmin, bbox.xmax, bbox.ymax, bbox.zmax]
+        header.volume = shape.Volume()
+    header_bytes = json.dumps(header.to_dict()).encode()
+
+    out = io.BytesIO()
+    out.write(_PREAMBLE.pack(MAGIC, VERSION, _FLAG_COMPRESSED if compress else 0, len(header_bytes)))
+    out.write(header_bytes)
+    out.write(payload)
+    return out.getbuffer()
+
+
+def dumps(model: Union[cq.Workplane, cq.Shape], compress: bool = False, level: int = 1, metadata: bool = True) -> bytes:
+    """Serialise a shape to bytes; see ``dumps_view``."""
+    return bytes(dumps_view(model, compress, level, metadata))
+
+
+def digest(model: Union[cq.Workplane, cq.Shape]) -> str:
+    """
+    SHA-256 of a shape's geometry, topology and placement: binary BREP without
+    triangulations, so it is the same across runs and before or after the shape
+    has been meshed (by an STL export or a render).
+    """
+    raw = io.BytesIO()
+    BinTools.Write_s(to_shape(model).wrapped, raw, False, False, BinTools_FormatVersion.BinTools_FormatVersion_CURRENT)
+    return hashlib.sha256(raw.getbuffer()).hexdigest()
+
+
+def read_header(data: Buffer) -> ShapeHeader:
+    """Read only the metadata header of serialised shape data."""
+    header, _ = _split(memoryview(data))
+    return header
+
+
+def loads(data: Buffer) -> cq.Shape:
+    """Rebuild the shape from bytes or a memoryview produced by ``dumps``/``dumps_view``."""
+    header, payload = _split(memoryview(data))
+    if header.compressed:
+        payload = zlib.decompress(payload)
+    try:
+        return cq.Shape.importBin(io.BytesIO(payload))
+    except Exception as e:
+        raise ShapeIOError(f"Corrupt shape payload: {e}") from e
+
+
+def load_workplane(data: Buffer) -> cq.Workplane:
+    """Like ``loads``, wrapped back into a Workplane with one object per solid of a compound."""
+    shape = loads(data)
+    shapes = list(shape) if isinstance(shape, cq.Compound) else [shape]
+    return cq.Workplane("XY").newObject(shapes)
+
+
+def dump(
+    model: Union[cq.Workplane, cq.Shape], path: Union[str, Path], compress: bool = False, metadata: bool = True
+) -> str:
+    """Write a serialised shape to ``path``; returns the path."""
+    Path(path).write_bytes(dumps_view(model, compress, metadata=metadata))
+    return str(path)
+
+
+def load(path: Union[str, Path]) -> cq.Shape:
+    return loads(Path(path).read_bytes())
+
+
+def _split(view: memoryview):
+    if len(view) < _PREAMBLE.size:
+        raise ShapeIOError("Data too short for a serialised shape")
+    magic, version, flags, header_size = _PREAMBLE.unpack_from(view)
+    if magic != MAGIC:
+        raise ShapeIOError("Not a serialised shape (bad magic)")
+    if version != VERSION:
+        raise ShapeIOError(f"Unsupported shape format version {version}")
+
+    start = _PREAMBLE.size
+    header = ShapeHeader(**json.loads(bytes(view[start:start + header_size])))
+    header.compressed = bool(flags & _FLAG_COMPRESSED)
+    payload = view[start + header_size:]
+    if len(payload) != header.payload_size:
+        raise ShapeIOError(f"Truncated shape payload: {len(payload)} of {header.payload_size} bytes")
+    return header, payload
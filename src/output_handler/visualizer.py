@@ -1,10 +1,12 @@
 import pyvista as pv
 from pathlib import Path
 from loguru import logger
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import tempfile
 import os
 
+from src.output_handler.shape_io import to_shape
+
 class ModelVisualizer:
     """Visualizes CAD models using PyVista."""
 
@@ -19,12 +21,13 @@ class ModelVisualizer:
         Returns: Path to screenshot if saved, else None
         """
         #import pyvista as pv
+        temp_stl = None
         try:
             #Export to a temporary STEP file 
             with tempfile.NamedTemporaryFile(suffix=".stl", delete=False) as f:
                 temp_stl = f.name 
 
-            cadquery_obj.val().exportStl(temp_stl)
+            to_shape(cadquery_obj).exportStl(temp_stl)
 
             #Load STEP file into PyVista
             mesh = pv.read(temp_stl)
@@ -48,9 +51,6 @@ class ModelVisualizer:
             logger.info("Opening 3D viewer...")
             self.plotter.show()
 
-            #Clean up the temporary file
-            os.unlink(temp_stl)
-
             return screenshot_saved
         
         except ImportError as e:
@@ -60,6 +60,21 @@ class ModelVisualizer:
         except Exception as e:
             logger.error(f"Failed to visualize model: {e}")
             return None
+        finally:
+            #Release the VTK objects once the window is closed, and the temporary file
+            self.close()
+            if temp_stl and os.path.exists(temp_stl):
+                os.unlink(temp_stl)
+
+    def close(self):
+        """Close the plotter and free its render window and meshes."""
+        if self.plotter is not None:
+            try:
+                self.plotter.close()
+                self.plotter.deep_clean()
+            except Exception as e:
+                logger.warning(f"Failed to close plotter: {e}")
+            self.plotter = None
         
     def generate_thumbnail(self, cadquery_obj, output_path: str, size: tuple = (400, 300)) -> Optional[str]:
         """
@@ -73,32 +88,57 @@ class ModelVisualizer:
         Returns:
             Optional[str]: Path to the saved thumbnail image, or None if failed.
         """
+        return self.render_offscreen(cadquery_obj, {output_path: size}).get(output_path)
+
+    def render_offscreen(self, cadquery_obj, images: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        """
+        Render the model offscreen once and save one image per requested size.
+
+        Unlike visualize_model this never opens a window, so it can run in a
+        worker thread while an interactive viewer is open.
+
+        Args:
+            cadquery_obj: The CadQuery object to render.
+            images (dict): Output path -> (width, height).
+
+        Returns:
+            Dict[str, str]: Requested path -> saved path, for the images that were saved.
+        """
+        temp_stl = None
+        plotter = None
+        saved = {}
         try:
-            with tempfile.NamedTemporaryFile(suffix=".step", delete=False) as f:
-                temp_step = f.name
+            #PyVista cannot read STEP; go through STL like visualize_model
+            with tempfile.NamedTemporaryFile(suffix=".stl", delete=False) as f:
+                temp_stl = f.name
 
-            cadquery_obj.val().exportStep(temp_step)
-            mesh = pv.read(temp_step)
+            to_shape(cadquery_obj).exportStl(temp_stl)
+            mesh = pv.read(temp_stl)
 
-            #Offscreen rendering for thumbnails
-            plotter = pv.Plotter(off_screen=True, window_size=size)
+            #Offscreen rendering, the mesh is loaded once for all images
+            plotter = pv.Plotter(off_screen=True)
             plotter.add_mesh(mesh, color="lightblue", show_edges=True, opacity=0.9)
             plotter.show_axes()
             plotter.add_title("CADpilotV2 Thumbnail", font_size=10)
-            plotter.camera_position = 'isometric'
+            plotter.camera_position = 'iso'
 
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            plotter.screenshot(str(output_path))
-            plotter.close()
+            for output_path, size in images.items():
+                path = Path(output_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                plotter.window_size = list(size)
+                plotter.screenshot(str(path))
+                saved[output_path] = str(path)
+                logger.success(f"Image saved to {path}")
 
-            os.unlink(temp_step)
-            logger.success(f"Thumbnail saved to {output_path}")
-            return str(output_path)
-        
         except Exception as e:
-            logger.error(f"Failed to generate thumbnail: {e}")
-            return None
+            logger.error(f"Failed to render model offscreen: {e}")
+        finally:
+            if plotter is not None:
+                plotter.close()
+                plotter.deep_clean()
+            if temp_stl and os.path.exists(temp_stl):
+                os.unlink(temp_stl)
+        return saved
         
 visualizer = ModelVisualizer() 
 
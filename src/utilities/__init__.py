@@ -1,5 +1,7 @@
 # Make utilities available at package level
-from .llm_client import llm_client, OpenRouterClient
+from .llm_client import llm_client, OpenRouterClient, LocalLLMClient
+from .llm_backends import LLMBackend, DeterministicBackend, get_backend, register_backend
 from .logging_config import configure_logging
+from .json_extractor import extract_json_object, JSONExtractionError
 
-__all__ = ['llm_client', 'OpenRouterClient', 'configure_logging']
\ No newline at end of file
+__all__ = ['llm_client', 'OpenRouterClient', 'LocalLLMClient', 'LLMBackend', 'DeterministicBackend', 'get_backend', 'register_backend', 'configure_logging', 'extract_json_object', 'JSONExtractionError']
\ No newline at end of file
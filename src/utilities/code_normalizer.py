@@ -0,0 +1,189 @@
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+# ```python ... ``` blocks; an unterminated last fence runs to the end of the text.
+_FENCE_RE = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)(?:```|\Z)", re.DOTALL)
+# Three words in a row: normal in prose, rare in code outside strings and comments.
+_WORDS_RE = re.compile(r"[A-Za-z][\w'’,-]*\s+[A-Za-z][\w'’,-]*\s+[A-Za-z][\w'’,.:-]*")
+
+# Modules generated scripts use without importing them, by the name they are used under.
+_IMPORTS = {
+    "cq": "import cadquery as cq",
+    "cadquery": "import cadquery",
+    "math": "import math",
+}
+_WORKPLANE_ROOTS = {("cq", "Workplane"), ("cadquery", "Workplane")}
+_MAX_PROSE_LINES = 50
+
+
+@dataclass
+class NormalizedCode:
+    """Normalised script and the fixes that were applied to it, in order."""
+    code: str
+    fixes: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.fixes)
+
+
+def normalize_code(text: str) -> NormalizedCode:
+    """
+    Deterministic clean-up of generated CadQuery code before it is executed.
+
+    Fixes formatting defects that would otherwise cost a failed validation and
+    a repair round trip:
+
+    - the code inside markdown fences is extracted;
+    - lines of prose the script does not parse with are removed;
+    - missing ``import cadquery as cq`` (and ``math``) imports are added;
+    - when nothing is assigned to ``result``, the last top-level Workplane
+      assignment is bound to it.
+
+    Code that still has a genuine syntax error is returned as it is after the
+    fixes above, so validation reports the real error.
+    """
+    fixes: List[str] = []
+    code = _extract_fenced(text, fixes)
+    tree = _parse(code)
+    if tree is None:
+        code = _strip_prose(code, fixes)
+        tree = _parse(code)
+    if tree is None:
+        return NormalizedCode(_finish(code), fixes)
+
+    code = _add_imports(code, tree, fixes)
+    code = _bind_result(code, tree, fixes)
+    return NormalizedCode(_finish(code), fixes)
+
+
+def _parse(code: str) -> Optional[ast.Module]:
+    try:
+        return ast.parse(code)
+    except SyntaxError:
+        return None
+
+
+def _finish(code: str) -> str:
+    return code.strip("\n") + "\n"
+
+
+def _extract_fenced(text: str, fixes: List[str]) -> str:
+    blocks = [(language.lower(), body) for language, body in _FENCE_RE.findall(text) if body.strip()]
+    if not blocks:
+        return text
+    # Prefer Python blocks that use CadQuery; several such blocks are parts of one script.
+    python = [body for language, body in blocks if language in ("", "python", "py", "python3")] or [body for _, body in blocks]
+    cadquery = [body for body in python if "cq." in body or "cadquery" in body] or python
+    if len(cadquery) == 1:
+        fixes.append("extracted the code from a markdown fence")
+    else:
+        fixes.append(f"joined the code of {len(cadquery)} markdown fences")
+    return "\n".join(body.rstrip() for body in cadquery)
+
+
+def _is_prose(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or stripped.startswith(("#", ".", ")")) or "=" in stripped or '"' in stripped:
+        return False
+    if _parse(stripped) is not None:
+        return False
+    return bool(_WORDS_RE.search(stripped)) or stripped.startswith("```")
+
+
+def _strip_prose(code: str, fixes: List[str]) -> str:
+    """Drop the lines syntax errors point at, for as long as they are prose."""
+    lines = code.splitlines()
+    removed = 0
+    while removed < _MAX_PROSE_LINES:
+        try:
+            ast.parse("\n".join(lines))
+            break
+        except SyntaxError as e:
+            index = (e.lineno or 0) - 1
+            if not 0 <= index < len(lines) or not _is_prose(lines[index]):
+                break
+            del lines[index]
+            removed += 1
+    if removed:
+        fixes.append(f"removed {removed} line{'s' if removed > 1 else ''} of text around the code")
+    return "\n".join(lines)
+
+
+def _bound_names(tree: ast.Module) -> Set[str]:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+    return names
+
+
+def _add_imports(code: str, tree: ast.Module, fixes: List[str]) -> str:
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)}
+    missing = [statement for name, statement in _IMPORTS.items() if name in used - _bound_names(tree)]
+    if not missing:
+        return code
+    fixes.extend(f"added '{statement}'" for statement in missing)
+
+    # After a module docstring and __future__ imports, which must come first.
+    insert_at = 0
+    for node in tree.body:
+        is_docstring = isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+        if is_docstring and node is tree.body[0] or isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            insert_at = node.end_lineno
+        else:
+            break
+    lines = code.splitlines()
+    return "\n".join(lines[:insert_at] + missing + lines[insert_at:])
+
+
+def _chain_root(node: ast.expr) -> ast.expr:
+    """Start of a call chain: ``cq.Workplane`` for ``cq.Workplane("XY").box(...)``, ``base`` for ``base.cut(...)``."""
+    while True:
+        if isinstance(node, ast.Call):
+            node = node.func
+        elif isinstance(node, ast.Attribute) and not isinstance(node.value, ast.Name):
+            node = node.value
+        else:
+            return node
+
+
+def _is_workplane(node: ast.expr, workplanes: Set[str]) -> bool:
+    if isinstance(node, ast.BinOp):
+        # base - holes, a + b
+        return _is_workplane(node.left, workplanes)
+    root = _chain_root(node)
+    if isinstance(root, ast.Name):
+        return root.id in workplanes
+    if isinstance(root, ast.Attribute) and isinstance(root.value, ast.Name):
+        return (root.value.id, root.attr) in _WORKPLANE_ROOTS or root.value.id in workplanes
+    return False
+
+
+def _bind_result(code: str, tree: ast.Module, fixes: List[str]) -> str:
+    if "result" in _bound_names(tree):
+        return code
+    workplanes: Set[str] = set()
+    last = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        elif isinstance(node, ast.AnnAssign) and node.value is not None and isinstance(node.target, ast.Name):
+            targets = [node.target.id]
+        else:
+            continue
+        if targets and _is_workplane(node.value, workplanes):
+            workplanes.update(targets)
+            last = targets[-1]
+    if last is None:
+        return code
+    fixes.append(f"bound 'result' to the last Workplane assignment '{last}'")
+    return f"{code.rstrip()}\n\nresult = {last}\n"
@@ -0,0 +1,58 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when work is started (or would finish) after the deadline of its generation."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point in time (``time.monotonic``) by which a generation must be finished."""
+    expires_at: float
+    seconds: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds, seconds)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: Optional[float]) -> float:
+        """``timeout`` cut to the time that is left (never negative)."""
+        remaining = max(0.0, self.remaining())
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def check(self, what: str):
+        """Raise DeadlineExceededError if the deadline has passed before ``what`` starts."""
+        if self.expired:
+            raise DeadlineExceededError(f"Deadline of {self.seconds:.0f}s exceeded before {what}")
+
+
+# The deadline of the generation running in the current task; carried through
+# worker calls, retries and validation like the usage tracker.
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` the deadline of every call made inside the block (None: no deadline)."""
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
+
+
+def time_left(timeout: Optional[float] = None) -> Optional[float]:
+    """``timeout`` clamped to the current deadline; ``timeout`` itself when there is none."""
+    deadline = current_deadline.get()
+    return timeout if deadline is None else deadline.clamp(timeout)
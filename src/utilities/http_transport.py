@@ -0,0 +1,99 @@
+import importlib.util
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from src.config.settings import settings
+
+# HTTP/2 needs the optional 'h2' package (pip install "httpx[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolStats:
+    """
+    Connection pool metrics gathered through the httpcore 'trace' extension.
+
+    ``pool_wait`` is the time from handing a request to the client until it is
+    written to a connection, minus the TCP/TLS setup of a new connection. High
+    values mean requests are queueing for a pool slot (raise HTTP_MAX_CONNECTIONS).
+    """
+    requests: int = 0
+    connections_opened: int = 0
+    pool_wait_total: float = 0.0
+    pool_wait_max: float = 0.0
+    connect_time_total: float = 0.0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.connections_reused / self.requests if self.requests else 0.0
+
+    @property
+    def pool_wait_mean(self) -> float:
+        return self.pool_wait_total / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.reuse_ratio, 3),
+            "pool_wait_mean": round(self.pool_wait_mean, 4),
+            "pool_wait_max": round(self.pool_wait_max, 4),
+            "connect_time_total": round(self.connect_time_total, 4),
+        }
+
+
+class _RequestTrace:
+    """Per-request trace callback: splits time-to-first-byte-sent into pool wait and connect."""
+
+    def __init__(self, stats: PoolStats):
+        self.stats = stats
+        self.started = time.perf_counter()
+        self.connect_started: Optional[float] = None
+        self.connect_time = 0.0
+
+    async def __call__(self, event: str, info: Dict[str, Any]):
+        now = time.perf_counter()
+        if event == "connection.connect_tcp.started":
+            self.connect_started = now
+            self.stats.connections_opened += 1
+        elif event in ("connection.start_tls.complete", "connection.connect_tcp.complete") and self.connect_started:
+            self.connect_time = now - self.connect_started
+        elif event.endswith(".send_request_headers.started"):
+            wait = now - self.started - self.connect_time
+            self.stats.requests += 1
+            self.stats.pool_wait_total += wait
+            self.stats.pool_wait_max = max(self.stats.pool_wait_max, wait)
+            self.stats.connect_time_total += self.connect_time
+
+
+def create_http_client(stats: PoolStats, timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    Build the shared AsyncClient from settings: pool limits, keep-alive expiry and
+    HTTP/2 when enabled and available. Every request reports into ``stats``.
+    """
+    http2 = settings.http2 and HTTP2_AVAILABLE
+    if settings.http2 and not HTTP2_AVAILABLE:
+        logger.warning("HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1")
+
+    async def attach_trace(request: httpx.Request):
+        request.extensions["trace"] = _RequestTrace(stats)
+
+    return httpx.AsyncClient(
+        timeout=timeout if timeout is not None else settings.request_timeout,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        event_hooks={"request": [attach_trace]},
+    )
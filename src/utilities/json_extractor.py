@@ -0,0 +1,157 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+class JSONExtractionError(ValueError):
+    """Raised when no usable JSON object can be recovered from an LLM response."""
+
+
+# One alternation per token kind, so the repair is a single left-to-right pass
+# over the response instead of a character loop.
+_TOKEN_RE = re.compile(
+    r'''
+      (?P<dstring>"(?:[^"\\]|\\.)*")
+    | (?P<sstring>'(?:[^'\\]|\\.)*')
+    | (?P<line_comment>(?://|\#)[^\n]*)
+    | (?P<block_comment>/\*.*?\*/)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<open>[{\[])
+    | (?P<close>[}\]])
+    | (?P<comma>,)
+    | (?P<space>\s+)
+    | (?P<other>[^"'/\#{}\[\],A-Za-z_\s]+|/)
+    | (?P<unterminated>["'])
+    ''',
+    re.VERBOSE | re.DOTALL,
+)
+
+# Python literals that LLMs emit in place of their JSON equivalents.
+_WORD_REPLACEMENTS = {"True": "true", "False": "false", "None": "null"}
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """
+    Extract the outermost JSON object from an LLM response.
+
+    The response may wrap the object in prose or markdown fences and may contain
+    trailing commas, single-quoted strings, unquoted keys, Python literals
+    (True/False/None) or // # /* */ comments. These are repaired while the
+    object is scanned, and the repaired text is parsed exactly once.
+
+    Args:
+        text (str): Raw LLM response.
+
+    Returns:
+        Dict[str, Any]: The parsed object.
+
+    Raises:
+        JSONExtractionError: If no object can be recovered.
+    """
+    if not text or not text.strip():
+        raise JSONExtractionError("Received an empty or purely whitespace response.")
+
+    # Fast path: the object is well-formed, possibly wrapped in fences or brace-free prose.
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+
+    last_error = "no '{' found in response"
+
+    while start != -1:
+        repaired, end = _repair_object(text, start)
+        if repaired is None:
+            # Unbalanced braces: the object was truncated, nothing later can be the outermost one.
+            last_error = f"object starting at offset {start} is never closed"
+            break
+        try:
+            data = json.loads(repaired)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError as e:
+            last_error = str(e)
+        start = text.find("{", end)
+
+    raise JSONExtractionError(f"Could not extract a JSON object from the response: {last_error}")
+
+
+def _repair_object(text: str, start: int) -> Tuple[Any, int]:
+    """
+    Scan one balanced object from ``start`` and return its repaired JSON text and end offset.
+
+    Returns (None, len(text)) if the braces never balance.
+    """
+    out: List[str] = []
+    depth = 0
+    last_comma = -1  # index in ``out`` of a comma not yet followed by a value
+
+    for match in _TOKEN_RE.finditer(text, start):
+        kind = match.lastgroup
+        token = match.group()
+
+        if kind == "space" or kind == "line_comment" or kind == "block_comment":
+            continue
+
+        if kind == "unterminated":
+            return None, len(text)
+
+        if kind == "open":
+            depth += 1
+            out.append(token)
+        elif kind == "close":
+            if last_comma != -1:
+                out[last_comma] = ""
+            depth -= 1
+            out.append(token)
+            if depth == 0:
+                return "".join(out), match.end()
+        elif kind == "comma":
+            if last_comma != -1:
+                # Doubled comma, keep only one.
+                continue
+            out.append(token)
+            last_comma = len(out) - 1
+            continue
+        elif kind == "dstring":
+            out.append(token.replace("\n", "\\n") if "\n" in token else token)
+        elif kind == "sstring":
+            out.append(_single_to_double_quoted(token))
+        elif kind == "word":
+            replacement = _WORD_REPLACEMENTS.get(token)
+            if replacement is not None:
+                out.append(replacement)
+            elif token in ("true", "false", "null") or not _is_key(text, match.end()):
+                out.append(token)
+            else:
+                out.append(f'"{token}"')
+        else:
+            out.append(token)
+
+        last_comma = -1
+
+    return None, len(text)
+
+
+def _single_to_double_quoted(token: str) -> str:
+    """Convert a single-quoted string token to a JSON double-quoted string."""
+    body = (
+        token[1:-1]
+        .replace("\\'", "'")
+        .replace('\\"', '"')
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+    return f'"{body}"'
+
+
+def _is_key(text: str, pos: int) -> bool:
+    """Return True if the next non-whitespace character after ``pos`` is a colon."""
+    length = len(text)
+    while pos < length and text[pos] in " \t\r\n":
+        pos += 1
+    return pos < length and text[pos] == ":"
@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.utilities.usage import TokenUsage
+
+class LLMBackend(ABC):
+    """
+    A chat-completion provider the workers can run on.
+
+    Implementations: OpenRouterClient (remote), LocalLLMClient (any local
+    OpenAI-compatible server) and DeterministicBackend (in-process, for tests).
+    """
+    name: str = "backend"
+    default_model: Optional[str] = None
+
+    @abstractmethod
+    async def chat_completion_with_usage(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 2000,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, TokenUsage]:
+        """Return the completion content together with the token usage of the call."""
+        pass
+
+    async def chat_completion(self, messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs) -> str:
+        content, _ = await self.chat_completion_with_usage(messages, model=model, **kwargs)
+        return content
+
+    def supports_structured_output(self, model: Optional[str]) -> bool:
+        """Whether ``model`` accepts a json_schema response_format on this backend."""
+        return False
+
+    async def warm_up(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class DeterministicBackend(LLMBackend):
+    """
+    In-process backend with scripted replies, for tests and offline runs.
+
+    Replies come from ``responses`` in order, then from ``responder(messages)``.
+    Every call is kept in ``calls``; token counts are estimated at ~4 characters
+    per token and cost nothing.
+    """
+    name = "deterministic"
+    default_model = "deterministic"
+
+    def __init__(
+        self,
+        responses: Optional[List[str]] = None,
+        responder: Optional[Callable[[List[Dict[str, str]]], str]] = None,
+    ):
+        self.responses = list(responses or [])
+        self.responder = responder
+        self.calls: List[Dict[str, Any]] = []
+
+    async def chat_completion_with_usage(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 2000,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, TokenUsage]:
+        self.calls.append({"messages": messages, "model": model, "response_format": response_format})
+
+        if self.responses:
+            content = self.responses.pop(0)
+        elif self.responder is not None:
+            content = self.responder(messages)
+        else:
+            raise RuntimeError("DeterministicBackend has no scripted response left")
+
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        return content, TokenUsage(prompt_tokens=prompt_chars // 4, completion_tokens=len(content) // 4)
+
+
+_instances: Dict[str, LLMBackend] = {}
+
+
+def register_backend(name: str, backend: LLMBackend):
+    """Make ``backend`` the instance returned for ``name`` (e.g. a DeterministicBackend in tests)."""
+    _instances[name] = backend
+
+
+def _create_backend(name: str) -> LLMBackend:
+    # Imported here: llm_client itself builds on this module.
+    from src.utilities.llm_client import llm_client, LocalLLMClient
+
+    if name == "openrouter":
+        return llm_client
+    if name == "local":
+        return LocalLLMClient()
+    if name == "deterministic":
+        return DeterministicBackend()
+    raise ValueError(f"Unknown LLM backend: {name}. Valid backends: openrouter, local, deterministic")
+
+
+def get_backend(name: Optional[str] = None) -> LLMBackend:
+    """Return the shared backend instance for ``name`` (default: LLM_BACKEND)."""
+    name = name or settings.llm_backend
+    if name not in _instances:
+        _instances[name] = _create_backend(name)
+    return _instances[name]
+
+
+def backend_for_worker(worker_name: str) -> LLMBackend:
+    """
+    Backend for a worker class: SPEC_WORKER_BACKEND (also used for assembly
+    decomposition), CODE_WORKER_BACKEND (also used for direct code and single-call repair) or
+    FEEDBACK_WORKER_BACKEND when set, otherwise LLM_BACKEND.
+    """
+    overrides = {
+        "SpecWorker": settings.spec_worker_backend,
+        "AssemblyWorker": settings.spec_worker_backend,
+        "CodeWorker": settings.code_worker_backend,
+        "DirectCodeWorker": settings.code_worker_backend,
+        "RepairWorker": settings.code_worker_backend,
+        "FeedbackWorker": settings.feedback_worker_backend,
+    }
+    return get_backend(overrides.get(worker_name))
+
+
+async def warm_up_backends():
+    """Open connections for the backends the workers are configured to use."""
+    backends = {id(backend): backend for backend in map(backend_for_worker, ("SpecWorker", "CodeWorker", "FeedbackWorker"))}
+    for backend in backends.values():
+        await backend.warm_up()
+
+
+async def close_backends():
+    """Close every backend created so far."""
+    for name, backend in list(_instances.items()):
+        try:
+            await backend.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM backend '{name}': {e}")
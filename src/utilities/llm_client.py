@@ -1,15 +1,33 @@
 import httpx
 import json
+import time
 import tenacity
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from httpx import ConnectError, ReadTimeout, HTTPStatusError
 from loguru import logger
 
 from src.config.settings import settings
 from src.config.openrouter_models import OpenRouterModel
+from src.utilities.usage import TokenUsage
+from src.utilities.http_transport import PoolStats, create_http_client
+from src.utilities.llm_backends import LLMBackend
+from src.utilities.deadline import current_deadline, time_left
 
-class OpenRouterClient:
+
+_BACKOFF = tenacity.wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _past_deadline(retry_state: tenacity.RetryCallState) -> bool:
+    """Give up retrying when the backoff alone would run past the generation's deadline."""
+    deadline = current_deadline.get()
+    # The next wait, computed from the attempt number: RetryCallState.upcoming_sleep
+    # is only set before stop runs from tenacity 8.3 on.
+    return deadline is not None and _BACKOFF(retry_state) >= deadline.remaining()
+
+
+class OpenRouterClient(LLMBackend):
     """A robust HTTPX-based client for OpenRouter API with retry logic."""
+    name = "openrouter"
     
     def __init__(self):
         self.api_key = settings.openrouter_api_key
@@ -23,16 +41,41 @@ class OpenRouterClient:
             "HTTP-Referer": "https://github.com/gilfoyle19/cadpilotv2",
             "X-Title": "CAD Pilot v2 - Text to CAD Generator",
         }
-        
-        # Create async client with connection pooling
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
-        )
+        self._init_pool()
+    
+    def _init_pool(self):
+        """Pooled client, created on first use and recreated after close()."""
+        self.pool_stats = PoolStats()
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(self.pool_stats, timeout=self.timeout)
+        return self._client
+    
+    @client.setter
+    def client(self, client: httpx.AsyncClient):
+        self._client = client
+    
+    def supports_structured_output(self, model: Optional[str]) -> bool:
+        return OpenRouterModel.supports_structured_output(model or self.default_model)
+    
+    async def warm_up(self):
+        """
+        Open a pooled connection ahead of the first request so that it does not pay
+        the TCP/TLS (and HTTP/2) setup. Failures are logged, never raised.
+        """
+        start = time.perf_counter()
+        try:
+            await self.client.head(f"{self.base_url}/models", headers=self.headers)
+            logger.debug(f"{self.name} connection warmed up in {time.perf_counter() - start:.3f}s")
+        except httpx.HTTPError as e:
+            logger.warning(f"{self.name} connection warm-up failed: {e}")
     
     @tenacity.retry(
-        stop=tenacity.stop_after_attempt(3),
-        wait=tenacity.wait_exponential(multiplier=1, min=2, max=10),
+        stop=tenacity.stop_after_attempt(3) | _past_deadline,
+        wait=_BACKOFF,
         retry=(
             tenacity.retry_if_exception_type(ConnectError) |
             tenacity.retry_if_exception_type(ReadTimeout) |
@@ -47,15 +90,17 @@ class OpenRouterClient:
         ),
         reraise=True
     )
-    async def chat_completion(
+    async def chat_completion_with_usage(
         self,
         messages: List[Dict[str, str]],
         model: Optional[OpenRouterModel] = None,
         temperature: float = 0.1,
         max_tokens: int = 2000,
-    ) -> str:
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, TokenUsage]:
         """
         Send a chat completion request to OpenRouter API with robust error handling.
+        Returns the content together with the token usage and cost of the call.
         """
         model_to_use = model or self.default_model
         
@@ -65,6 +110,8 @@ class OpenRouterClient:
             "temperature": max(0.0, min(1.0, temperature)),  # Clamp to valid range
             "max_tokens": max_tokens,
         }
+        if response_format is not None:
+            payload["response_format"] = response_format
         
         try:
             logger.debug(f"Sending request to OpenRouter model: {model_to_use}")
@@ -73,6 +120,8 @@ class OpenRouterClient:
                 f"{self.base_url}/chat/completions",
                 json=payload,
                 headers=self.headers,
+                # Never wait past the deadline of the generation
+                timeout=time_left(self.timeout),
             )
             
             response.raise_for_status()
@@ -81,15 +130,15 @@ class OpenRouterClient:
             # Extract content from response
             content = response_data["choices"][0]["message"]["content"].strip()
             
-            # Log token usage for monitoring
-            usage = response_data.get("usage", {})
+            # Token usage for accounting and monitoring
+            usage = TokenUsage.from_response(response_data.get("usage", {}), model_to_use)
             logger.debug(
                 f"OpenRouter request successful. "
-                f"Tokens: {usage.get('prompt_tokens', 'N/A')} prompt, "
-                f"{usage.get('completion_tokens', 'N/A')} completion"
+                f"Tokens: {usage.prompt_tokens} prompt ({usage.cached_tokens} cached), "
+                f"{usage.completion_tokens} completion, ${usage.cost:.5f}"
             )
             
-            return content
+            return content, usage
             
         except httpx.HTTPStatusError as e:
             logger.error(f"OpenRouter API HTTP error {e.response.status_code}: {e.response.text}")
@@ -101,9 +150,27 @@ class OpenRouterClient:
             logger.error(f"Malformed response from OpenRouter: {response_data}")
             raise ValueError("Invalid response format from OpenRouter API") from e
     
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[OpenRouterModel] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 2000,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Send a chat completion request and return only the content.
+        """
+        content, _ = await self.chat_completion_with_usage(
+            messages, model=model, temperature=temperature, max_tokens=max_tokens, response_format=response_format
+        )
+        return content
+    
     async def close(self):
-        """Clean up the HTTP client gracefully."""
-        await self.client.aclose()
+        """Clean up the HTTP client gracefully and log the pool statistics."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.debug(f"{self.name} connection pool: {self.pool_stats.to_dict()}")
     
     async def __aenter__(self):
         return self
@@ -111,5 +178,28 @@ class OpenRouterClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
+class LocalLLMClient(OpenRouterClient):
+    """
+    Client for a local OpenAI-compatible server (llama.cpp server, vLLM, Ollama, ...).
+
+    Same wire protocol and retry logic as OpenRouter, without the network round
+    trip to a remote provider. Models unknown to the price table cost nothing.
+    """
+    name = "local"
+    
+    def __init__(self):
+        self.api_key = settings.local_llm_api_key
+        self.base_url = settings.local_llm_base_url
+        self.default_model = settings.local_llm_model
+        self.timeout = settings.request_timeout
+        
+        self.headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
+        self._init_pool()
+    
+    def supports_structured_output(self, model: Optional[str]) -> bool:
+        return settings.local_llm_structured_output
+
 # Global instance for easy access
 llm_client = OpenRouterClient()
\ No newline at end of file
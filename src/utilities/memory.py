@@ -0,0 +1,109 @@
+import asyncio
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_libc = None
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size of this process.
+
+    Read from /proc where available; elsewhere falls back to the peak RSS,
+    which is the best the standard library offers.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_mb() -> float:
+    return rss_bytes() / (1024 * 1024)
+
+
+def release_memory():
+    """
+    Collect garbage and hand freed heap pages back to the OS.
+
+    OCC frees shapes into the C heap; without ``malloc_trim`` glibc keeps
+    those pages and RSS stays high after the models are gone.
+    """
+    global _libc
+    gc.collect()
+    if _libc is None:
+        path = ctypes.util.find_library("c")
+        _libc = ctypes.CDLL(path) if path else False
+    if _libc and hasattr(_libc, "malloc_trim"):
+        _libc.malloc_trim(0)
+
+
+class MemoryGovernor:
+    """
+    Throttles new work while process RSS is above a ceiling.
+
+    ``wait_for_headroom`` is awaited before a job is admitted. Above the
+    ceiling it frees what it can (the registered ``on_pressure`` callbacks,
+    garbage collection and ``malloc_trim``) and then waits for running jobs to
+    finish. When nothing is running it admits anyway, since waiting could not
+    free any memory.
+    """
+
+    def __init__(self, ceiling_mb: Optional[float] = None, poll_interval: float = 0.5):
+        self.ceiling_mb = ceiling_mb
+        self.poll_interval = poll_interval
+        self.on_pressure: List[Callable[[], None]] = []
+        self.throttled = 0
+        self.peak_mb = rss_mb()
+
+    @classmethod
+    def from_settings(cls) -> "MemoryGovernor":
+        return cls(settings.memory_ceiling_mb)
+
+    def sample(self) -> float:
+        """Current RSS in MB; also updates ``peak_mb``."""
+        current = rss_mb()
+        self.peak_mb = max(self.peak_mb, current)
+        return current
+
+    def over_ceiling(self) -> bool:
+        return self.ceiling_mb is not None and self.sample() > self.ceiling_mb
+
+    def relieve(self):
+        for callback in self.on_pressure:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Memory pressure callback failed: {e}")
+        release_memory()
+
+    async def wait_for_headroom(self, idle: Callable[[], bool] = lambda: False):
+        """Return once RSS is under the ceiling, or when ``idle()`` says no work is running."""
+        if not self.over_ceiling():
+            return
+        self.relieve()
+        if not self.over_ceiling():
+            return
+
+        self.throttled += 1
+        logger.warning(f"RSS {self.sample():.0f} MB is above the {self.ceiling_mb:.0f} MB ceiling; holding new jobs")
+        while self.over_ceiling() and not idle():
+            await asyncio.sleep(self.poll_interval)
+            release_memory()
@@ -0,0 +1,130 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import settings
+from src.config.openrouter_models import OpenRouterModel
+
+class BudgetExceededError(RuntimeError):
+    """Raised when a generation goes over its hard token or cost budget."""
+
+
+@dataclass
+class TokenUsage:
+    """Token counts and cost (USD) of one or more LLM calls."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            cost=self.cost + other.cost,
+        )
+
+    @classmethod
+    def from_response(cls, usage: Dict[str, Any], model: Optional[str]) -> "TokenUsage":
+        """
+        Build from the ``usage`` block of an OpenAI-compatible response.
+
+        Cost comes from the response when the provider reports it, otherwise from
+        the price table in OpenRouterModel.get_model_pricing.
+        """
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+
+        cost = usage.get("cost")
+        if cost is None:
+            pricing = OpenRouterModel.get_model_pricing(model)
+            cost = (
+                (prompt_tokens - cached_tokens) * pricing["prompt"]
+                + cached_tokens * pricing["cached"]
+                + completion_tokens * pricing["completion"]
+            ) / 1_000_000
+
+        return cls(prompt_tokens, completion_tokens, cached_tokens, float(cost))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+@dataclass
+class UsageRecord:
+    worker: str
+    model: Optional[str]
+    usage: TokenUsage
+
+
+@dataclass
+class UsageTracker:
+    """
+    Accumulates the LLM usage of one generation across spec, code and feedback calls.
+
+    ``max_tokens`` and ``max_cost`` are hard budgets: the call that crosses one is
+    still recorded, then BudgetExceededError aborts the generation.
+    """
+    max_tokens: Optional[int] = None
+    max_cost: Optional[float] = None
+    records: List[UsageRecord] = field(default_factory=list)
+
+    @classmethod
+    def from_settings(cls) -> "UsageTracker":
+        return cls(max_tokens=settings.token_budget, max_cost=settings.cost_budget)
+
+    @property
+    def total(self) -> TokenUsage:
+        total = TokenUsage()
+        for record in self.records:
+            total = total + record.usage
+        return total
+
+    def record(self, worker: str, model: Optional[str], usage: TokenUsage):
+        self.records.append(UsageRecord(worker, model, usage))
+        total = self.total
+        if self.max_tokens is not None and total.total_tokens > self.max_tokens:
+            raise BudgetExceededError(f"Token budget exceeded: {total.total_tokens} > {self.max_tokens} tokens")
+        if self.max_cost is not None and total.cost > self.max_cost:
+            raise BudgetExceededError(f"Cost budget exceeded: ${total.cost:.4f} > ${self.max_cost:.4f}")
+
+    def by_worker(self) -> Dict[str, TokenUsage]:
+        totals: Dict[str, TokenUsage] = {}
+        for record in self.records:
+            totals[record.worker] = totals.get(record.worker, TokenUsage()) + record.usage
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": len(self.records),
+            "total": self.total.to_dict(),
+            "by_worker": {worker: usage.to_dict() for worker, usage in self.by_worker().items()},
+        }
+
+
+# The tracker of the generation running in the current task. Workers are shared
+# between concurrent generations, so the tracker travels with the task context.
+current_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("current_usage_tracker", default=None)
+
+
+@contextmanager
+def track_usage(tracker: UsageTracker) -> Iterator[UsageTracker]:
+    """Make ``tracker`` receive the usage of every LLM call made inside the block."""
+    token = current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        current_tracker.reset(token)
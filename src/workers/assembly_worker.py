@@ -0,0 +1,39 @@
+from typing import Dict, Any, Optional
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers.base_worker import BaseWorker
+from src.workers.spec_schema import validate_assembly_spec
+from src.utilities.json_extractor import extract_json_object, JSONExtractionError
+
+from loguru import logger
+
+class AssemblyWorker(BaseWorker):
+    """Decomposes a multi-part product description into parts, placements and constraints."""
+
+    async def execute(self, natural_language_prompt: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Convert a product description into an assembly specification whose parts
+        can each be generated on their own.
+        """
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": natural_language_prompt}
+        ]
+
+        llm_response = await self._call_llm(messages, model=model, temperature=0, max_tokens=4000)
+
+        try:
+            assembly_spec = extract_json_object(llm_response)
+        except JSONExtractionError as e:
+            raise ValueError(f"Invalid JSON structure/syntax from LLM: {e}")
+        validate_assembly_spec(assembly_spec)
+
+        logger.success(
+            f"Decomposed assembly: {assembly_spec.get('assembly_name', 'unknown')} "
+            f"into {len(assembly_spec['parts'])} parts"
+        )
+        return assembly_spec
@@ -1,44 +1,58 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 from loguru import logger
 import sys
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.utilities.llm_client import llm_client
+from src.utilities.llm_backends import LLMBackend, get_backend, backend_for_worker
 from src.config.openrouter_models import OpenRouterModel
+from src.utilities.usage import current_tracker
+from src.utilities.deadline import current_deadline
+
+PROMPTS_DIR = Path(__file__).parent.parent / "utilities" / "prompts"
+
+# Map class names to prompt files
+PROMPT_FILES = {
+    "SpecWorker": "spec_worker_prompt.txt",
+    "CodeWorker": "code_worker_prompt.txt",
+    "DirectCodeWorker": "direct_code_worker_prompt.txt",
+    "ValidationWorker": "validation_worker_prompt.txt",
+    "FeedbackWorker": "feedback_worker_prompt.txt",
+    "AssemblyWorker": "assembly_worker_prompt.txt",
+    "RepairWorker": "repair_worker_prompt.txt",
+}
+
+
+@lru_cache(maxsize=None)
+def load_prompt(prompt_file: str) -> str:
+    """Read a system prompt once per process; every later worker of the class shares the text."""
+    prompt_path = PROMPTS_DIR / prompt_file
+    if not prompt_path.exists():
+        raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
+    return prompt_path.read_text(encoding='utf-8')
+
 
 class BaseWorker(ABC):
     """Abstract base class for workers."""
 
-    def __init__(self, model: Optional[OpenRouterModel] = None):
+    def __init__(self, model: Optional[OpenRouterModel] = None, backend: Optional[Union[LLMBackend, str]] = None):
+        """``backend`` is an LLMBackend or a backend name; the default comes from settings per worker class."""
         self.model = model
+        if isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend = backend or backend_for_worker(self.__class__.__name__)
         self.system_prompt = self._load_system_prompt()
 
     def _load_system_prompt(self) -> str:
         """Load the appropriate system prompt based on class name."""
         class_name = self.__class__.__name__
-        
-        # Map class names to prompt files
-        prompt_mapping = {
-            "SpecWorker": "spec_worker_prompt.txt",
-            "CodeWorker": "code_worker_prompt.txt",
-            "ValidationWorker": "validation_worker_prompt.txt",
-            "FeedbackWorker": "feedback_worker_prompt.txt"
-        }
-        
-        if class_name not in prompt_mapping:
+        if class_name not in PROMPT_FILES:
             raise ValueError(f"No prompt mapping for class: {class_name}")
-        
-        prompt_file = prompt_mapping[class_name]
-        prompt_path = Path(__file__).parent.parent / "utilities" / "prompts" / prompt_file
-        
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
-            
-        return prompt_path.read_text(encoding='utf-8')
+        return load_prompt(PROMPT_FILES[class_name])
 
     
     @abstractmethod
@@ -46,15 +60,25 @@ class BaseWorker(ABC):
         """Main Execution method. Shall be implemented by subclasses."""
         pass
 
-    async def _call_llm(self, messages:list, **kwargs) -> str:
+    async def _call_llm(self, messages:list, model: Optional[OpenRouterModel] = None, **kwargs) -> str:
         "Helper method to call the llm client with error handling."
+        model = model or self.model
+        deadline = current_deadline.get()
+        if deadline is not None:
+            deadline.check(f"{self.__class__.__name__} call")
         try:
-            return await llm_client.chat_completion(
+            content, usage = await self.backend.chat_completion_with_usage(
                 messages,
-                model = self.model,
+                model = model,
                 **kwargs
             )
         except Exception as e:
             logger.error(f"{self.__class__.__name__} LLM call failed: {e}")
             raise
-        
\ No newline at end of file
+
+        # Charge the call to the generation running in this task, if any.
+        tracker = current_tracker.get()
+        if tracker is not None:
+            tracker.record(self.__class__.__name__, model or self.backend.default_model, usage)
+
+        return content
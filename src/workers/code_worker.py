@@ -12,9 +12,10 @@ from loguru import logger
 class CodeWorker(BaseWorker):
     """Generates CadQuery code from evaluated specifications."""
     
-    async def execute(self, specification: Dict[str, Any], feedback: Optional[str] = None) -> str:
+    async def execute(self, specification: Dict[str, Any], feedback: Optional[str] = None, model: Optional[str] = None) -> str:
         """
         Generate CadQuery code from specification with pre-calculated values.
+        ``model`` overrides the worker's model for this call (used for escalation).
         """
         # Build the user-specific part of the prompt
         user_prompt = self._build_user_prompt(specification, feedback)
@@ -25,7 +26,7 @@ class CodeWorker(BaseWorker):
             {"role": "user", "content": user_prompt}            #SPECIFIC REQUEST
         ]
         
-        generated_code = await self._call_llm(messages, temperature=0.3, max_tokens=5000)
+        generated_code = await self._call_llm(messages, model=model, temperature=0.3, max_tokens=5000)
         self._validate_code_structure(generated_code)
         
         logger.success(f"Generated code ({len(generated_code)} characters)")
@@ -0,0 +1,24 @@
+from typing import Dict, Any, Optional
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers.code_worker import CodeWorker
+
+
+class DirectCodeWorker(CodeWorker):
+    """
+    Writes CadQuery code straight from the prompt text of a simple part, with a
+    compact system prompt, for the direct route that skips SpecWorker.
+    """
+
+    def _build_user_prompt(self, spec: Dict[str, Any], feedback: Optional[str]) -> str:
+        """The prompt itself is the request; ``spec`` is the direct-route stand-in."""
+        base_prompt = f"Write CadQuery code for this part:\n\n{spec['description']}"
+
+        if feedback:
+            base_prompt += f"\n\nINCORPORATE THIS FEEDBACK:\n{feedback}"
+
+        return base_prompt
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from loguru import logger
 
 import sys
@@ -12,9 +12,10 @@ from src.workers.base_worker import BaseWorker
 class FeedbackWorker(BaseWorker):
     """Analyzes validation errors and provides feedback for code improvement."""
 
-    async def execute(self, generated_code: str, validation_result: Dict[str, Any], specification: Dict[str, Any]) -> str:
+    async def execute(self, generated_code: str, validation_result: Dict[str, Any], specification: Dict[str, Any], model: Optional[str] = None) -> str:
         """
-        Generate feedback for improving the failed code generation."""
+        Generate feedback for improving the failed code generation.
+        ``model`` overrides the worker's model for this call."""
         
         logger.info("Generating feedback for failed validation...")
 
@@ -22,23 +23,28 @@ class FeedbackWorker(BaseWorker):
 
         messages = [
             {"role": "system", "content": self.system_prompt},  # FROM feedback_worker_prompt.txt
-            {"role": "user", "content": self._build_prompt(generated_code, error_message, specification)}
+            {"role": "user", "content": self._build_prompt(generated_code, error_message, specification, validation_result.get("slow_operations"))}
         ]
 
-        feedback = await self._call_llm(messages, temperature=0.5, max_tokens=500)
+        feedback = await self._call_llm(messages, model=model, temperature=0.5, max_tokens=500)
         logger.success(f"Generated feedback: {feedback[:100]}...")
 
         return feedback
     
-    def _build_prompt(self, code: str, error: str, spec: Dict[str, Any]) -> str:
+    def _build_prompt(self, code: str, error: str, spec: Dict[str, Any], slow_operations: Optional[str] = None) -> str:
         """Build the feedback request prompt."""
         import json
 
+        profile = f"""
+SLOWEST OPERATIONS (line: operation, time, resulting topology):
+{slow_operations}
+""" if slow_operations else ""
+
         return f"""
 Generated code failed validation. Please provide specific feedback to improve it.
 
 ERROR: {error}
-
+{profile}
 ORIGINAL SPECIFICATION:
 {json.dumps(spec, indent=2)}
 
@@ -0,0 +1,234 @@
+import ast
+import copy
+import hashlib
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cadquery as cq
+from loguru import logger
+
+class _NotCacheable(Exception):
+    """Raised while snapshotting a namespace that holds state we cannot safely copy."""
+
+
+class ExecutionTimeout(BaseException):
+    """
+    Raised inside a script that ran past the timeout given to IncrementalExecutor.run.
+    Not an Exception, so a script's own ``except Exception`` cannot swallow it.
+    """
+
+
+# Values that are never mutated in place by generated scripts. Shapes, planes
+# and locations are not among them (Shape.move/locate, Plane.setOrigin2d...)
+# and are copied by _clone.
+_IMMUTABLE_TYPES = (
+    int, float, complex, str, bytes, bool, type(None), range,
+    types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, type,
+    cq.Vector, cq.Color,
+)
+
+
+class IncrementalExecutor:
+    """
+    Executes CadQuery scripts statement by statement, caching the namespace after
+    each top-level statement keyed by the hash of the code prefix that produced it.
+
+    When a repaired script shares a prefix with an earlier one, execution resumes
+    from the deepest cached checkpoint and only the changed suffix is recomputed.
+    Workplanes and Sketches are cloned on store and on restore, since CadQuery
+    shares mutable pending-wire state along a chain; a checkpoint is skipped when
+    the namespace holds any other mutable object that cannot be copied safely.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.last_resumed_at = 0
+        self.last_statement_count = 0
+
+    def run(
+        self, code: str, namespace: Dict[str, Any], filename: str = "<generated>", timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute ``code`` and return the resulting namespace.
+
+        Args:
+            code (str): The script to execute.
+            namespace (Dict[str, Any]): Initial globals (cq, show_object, ...).
+            filename (str): Filename reported in tracebacks.
+            timeout (float, optional): Seconds the script may run. Checked on
+                every line the script executes, loops and its own functions
+                included, so only a single long CadQuery/OCC call can overrun it.
+
+        Returns:
+            Dict[str, Any]: Namespace after the last statement.
+
+        Raises:
+            ExecutionTimeout: The script was still running after ``timeout``.
+        """
+        tree = ast.parse(code, filename=filename)
+        statements = tree.body
+        prefix_hashes = self._prefix_hashes(statements, namespace)
+
+        resume_at, restored = self._lookup(prefix_hashes)
+        if restored is not None:
+            namespace = restored
+            logger.debug(f"Resuming validation at statement {resume_at + 1}/{len(statements)} from cache")
+
+        self.last_resumed_at = resume_at
+        self.last_statement_count = len(statements)
+
+        with _time_limit(filename, timeout):
+            for index in range(resume_at, len(statements)):
+                module = ast.Module(body=[statements[index]], type_ignores=[])
+                exec(compile(module, filename, "exec"), namespace)
+                self._store(prefix_hashes[index], namespace)
+
+        return namespace
+
+    def clear(self):
+        """Drop every cached checkpoint."""
+        with self._lock:
+            self._cache.clear()
+
+    def _prefix_hashes(self, statements: List[ast.stmt], namespace: Dict[str, Any]) -> List[str]:
+        """Chained hash per statement: h_i = sha256(h_{i-1} + source of statement i)."""
+        digest = hashlib.sha256(",".join(sorted(namespace)).encode())
+        hashes = []
+        for statement in statements:
+            # ast.unparse drops comments and normalises whitespace, so cosmetic edits still hit.
+            digest.update(ast.unparse(statement).encode())
+            digest.update(b"\0")
+            hashes.append(digest.copy().hexdigest())
+        return hashes
+
+    def _lookup(self, prefix_hashes: List[str]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Find the deepest cached prefix; returns (statements to skip, restored namespace)."""
+        with self._lock:
+            for index in range(len(prefix_hashes) - 1, -1, -1):
+                snapshot = self._cache.get(prefix_hashes[index])
+                if snapshot is not None:
+                    self._cache.move_to_end(prefix_hashes[index])
+                    break
+            else:
+                return 0, None
+        return index + 1, _snapshot(snapshot)
+
+    def _store(self, key: str, namespace: Dict[str, Any]):
+        """Snapshot the namespace under ``key``, evicting the least recently used entry."""
+        try:
+            snapshot = _snapshot(namespace)
+        except _NotCacheable:
+            return
+        with self._lock:
+            self._cache[key] = snapshot
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+@contextmanager
+def _time_limit(filename: str, timeout: Optional[float]) -> Iterator[None]:
+    """Raise ExecutionTimeout on the first line of ``filename`` executed after ``timeout`` seconds."""
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + timeout
+
+    def check(frame, event, arg):
+        if time.monotonic() > deadline:
+            raise ExecutionTimeout(f"Validation timed out after {timeout:.1f}s")
+        return check
+
+    def trace(frame, event, arg):
+        # Only the script's own frames are traced; CadQuery internals run at full speed.
+        return check(frame, event, arg) if frame.f_code.co_filename == filename else None
+
+    previous = sys.gettrace()
+    sys.settrace(trace)
+    try:
+        yield
+    finally:
+        sys.settrace(previous)
+
+
+def _snapshot(namespace: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a namespace so later statements cannot mutate the copy."""
+    snapshot: Dict[str, Any] = {}
+    # Functions defined by the script are rebound to the copy as their globals.
+    memo: Dict[int, Any] = {id(namespace): snapshot}
+    snapshot.update(
+        (name, _clone(value, memo)) for name, value in namespace.items() if name != "__builtins__"
+    )
+    return snapshot
+
+
+def _clone(value: Any, memo: Dict[int, Any]) -> Any:
+    if isinstance(value, types.FunctionType) and id(value.__globals__) in memo:
+        return types.FunctionType(
+            value.__code__, memo[id(value.__globals__)], value.__name__, value.__defaults__, value.__closure__
+        )
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    key = id(value)
+    if key in memo:
+        return memo[key]
+
+    if isinstance(value, cq.Shape):
+        clone = memo[key] = value.copy()
+        return clone
+    if isinstance(value, cq.Plane):
+        clone = memo[key] = cq.Plane(value.origin, value.xDir, value.zDir)
+        return clone
+    if isinstance(value, cq.Location):
+        clone = memo[key] = cq.Location(value.wrapped)
+        return clone
+    if isinstance(value, cq.Workplane):
+        clone = copy.copy(value)
+        memo[key] = clone
+        clone.objects = [_clone(obj, memo) for obj in value.objects]
+        clone.parent = _clone(value.parent, memo)
+        clone.ctx = _clone_context(value.ctx, memo)
+        return clone
+    if isinstance(value, cq.Sketch):
+        clone = copy.copy(value)
+        memo[key] = clone
+        for attr, attr_value in vars(value).items():
+            if isinstance(attr_value, (list, dict)):
+                setattr(clone, attr, copy.copy(attr_value))
+        return clone
+    if isinstance(value, list):
+        clone = []
+        memo[key] = clone
+        clone.extend(_clone(item, memo) for item in value)
+        return clone
+    if isinstance(value, tuple):
+        return tuple(_clone(item, memo) for item in value)
+    if isinstance(value, dict):
+        clone = {}
+        memo[key] = clone
+        clone.update((k, _clone(v, memo)) for k, v in value.items())
+        return clone
+    if isinstance(value, (set, frozenset)):
+        return type(value)(value)
+
+    raise _NotCacheable(type(value).__name__)
+
+
+def _clone_context(ctx: Any, memo: Dict[int, Any]) -> Any:
+    """Copy the pending-wire state shared by a Workplane chain."""
+    key = id(ctx)
+    if key in memo:
+        return memo[key]
+    clone = copy.copy(ctx)
+    memo[key] = clone
+    clone.pendingWires = list(ctx.pendingWires)
+    clone.pendingEdges = list(ctx.pendingEdges)
+    clone.tags = {name: _clone(tagged, memo) for name, tagged in ctx.tags.items()}
+    return clone
@@ -0,0 +1,211 @@
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cadquery as cq
+
+PROFILED_CLASSES = (cq.Workplane, cq.Sketch)
+
+_state = threading.local()
+_install_lock = threading.Lock()
+_install_count = 0
+_originals: Dict[Tuple[type, str], Any] = {}
+
+
+@dataclass
+class OperationStats:
+    """Aggregated calls of one operation on one line of the profiled script."""
+    line: int
+    operation: str
+    calls: int = 0
+    total_time: float = 0.0
+    faces: int = 0
+    edges: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "line": self.line,
+            "operation": self.operation,
+            "calls": self.calls,
+            "total_time": round(self.total_time, 6),
+            "faces": self.faces,
+            "edges": self.edges,
+        }
+
+
+@dataclass
+class OperationProfile:
+    """Result of profiling one script execution."""
+    operations: List[OperationStats]
+    stacks: Dict[Tuple[str, ...], float]
+    total_time: float
+
+    def slowest(self, limit: int = 5) -> List[OperationStats]:
+        return sorted(self.operations, key=lambda stats: stats.total_time, reverse=True)[:limit]
+
+    def summary(self, limit: int = 5) -> str:
+        """Short text listing of the slowest operations, for logs and LLM feedback."""
+        lines = [
+            f"line {stats.line}: {stats.operation} took {stats.total_time:.3f}s over {stats.calls} call(s) "
+            f"-> {stats.faces} faces, {stats.edges} edges"
+            for stats in self.slowest(limit)
+        ]
+        return "\n".join(lines)
+
+    def to_folded(self) -> str:
+        """
+        Folded stacks ("frame;frame;frame value" per line, value in microseconds of
+        self time), the input format of flamegraph.pl, speedscope and inferno.
+        """
+        return "\n".join(
+            f"{';'.join(stack)} {max(1, round(seconds * 1e6))}"
+            for stack, seconds in sorted(self.stacks.items())
+        ) + "\n"
+
+    def write_folded(self, path: str) -> str:
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(self.to_folded())
+        return str(output_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_time": round(self.total_time, 6),
+            "operations": [stats.to_dict() for stats in self.slowest(len(self.operations))],
+        }
+
+
+class OperationProfiler:
+    """
+    Times every public cq.Workplane / cq.Sketch method called while active.
+
+    Calls made from the profiled script (compiled with ``filename``) are
+    aggregated per source line and operation, together with the face and edge
+    count of the object they return. Calls nested inside other operations are
+    kept as stack frames for the flame graph only.
+
+        with OperationProfiler("<generated>") as profiler:
+            exec(compile(code, "<generated>", "exec"), namespace)
+        profiler.profile.write_folded("part.folded")
+
+    The patches are installed on the classes while any profiler is active but
+    only record on the thread that entered the profiler, so concurrent
+    validations elsewhere run unprofiled.
+    """
+
+    def __init__(self, filename: str = "<generated>", root: str = "script"):
+        self.filename = filename
+        self.root = root
+        self.profile: Optional[OperationProfile] = None
+        self._operations: Dict[Tuple[int, str], OperationStats] = {}
+        self._stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        # (frame label, start time, time spent in nested operations)
+        self._active: List[List[Any]] = []
+        self._started = 0.0
+
+    def __enter__(self) -> "OperationProfiler":
+        if getattr(_state, "profiler", None) is not None:
+            raise RuntimeError("An OperationProfiler is already active on this thread")
+        _install()
+        _state.profiler = self
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        total_time = time.perf_counter() - self._started
+        _state.profiler = None
+        _uninstall()
+        self.profile = OperationProfile(list(self._operations.values()), dict(self._stacks), total_time)
+        return False
+
+    def _call(self, method, qualname: str, args, kwargs):
+        line = self._script_line() if not self._active else None
+        label = f"line {line}: {qualname}" if line is not None else qualname
+        frame = [label, time.perf_counter(), 0.0]
+        self._active.append(frame)
+        return_value = None
+        try:
+            return_value = method(*args, **kwargs)
+            return return_value
+        finally:
+            # Also reached when the operation raises: the failing call is often the slow one.
+            elapsed = time.perf_counter() - frame[1]
+            self._active.pop()
+            stack = (self.root,) + tuple(active[0] for active in self._active) + (label,)
+            self._stacks[stack] += elapsed - frame[2]
+            if self._active:
+                self._active[-1][2] += elapsed
+
+            if line is not None:
+                stats = self._operations.get((line, qualname))
+                if stats is None:
+                    stats = self._operations[(line, qualname)] = OperationStats(line, qualname)
+                stats.calls += 1
+                stats.total_time += elapsed
+                stats.faces, stats.edges = _topology(return_value)
+
+    def _script_line(self) -> Optional[int]:
+        frame = sys._getframe(3)
+        while frame is not None:
+            if frame.f_code.co_filename == self.filename:
+                return frame.f_lineno
+            frame = frame.f_back
+        return None
+
+
+def _wrap(cls: type, name: str, method):
+    qualname = f"{cls.__name__}.{name}"
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_state, "profiler", None)
+        if profiler is None:
+            return method(*args, **kwargs)
+        return profiler._call(method, qualname, args, kwargs)
+
+    return wrapper
+
+
+def _install():
+    global _install_count
+    with _install_lock:
+        if _install_count == 0:
+            for cls in PROFILED_CLASSES:
+                for name, attr in list(vars(cls).items()):
+                    if name.startswith("_") or not inspect.isfunction(attr):
+                        continue
+                    _originals[(cls, name)] = attr
+                    setattr(cls, name, _wrap(cls, name, attr))
+        _install_count += 1
+
+
+def _uninstall():
+    global _install_count
+    with _install_lock:
+        _install_count -= 1
+        if _install_count == 0:
+            for (cls, name), attr in _originals.items():
+                setattr(cls, name, attr)
+            _originals.clear()
+
+
+def _topology(value: Any) -> Tuple[int, int]:
+    """Face and edge count of what an operation returned (0, 0 if it is not geometry)."""
+    try:
+        if isinstance(value, cq.Workplane):
+            shapes = [obj for obj in value.objects if isinstance(obj, cq.Shape)]
+        elif isinstance(value, cq.Sketch):
+            shapes = [value._faces] if value._faces is not None else []
+        elif isinstance(value, cq.Shape):
+            shapes = [value]
+        else:
+            return 0, 0
+        return sum(len(shape.Faces()) for shape in shapes), sum(len(shape.Edges()) for shape in shapes)
+    except Exception:
+        return 0, 0
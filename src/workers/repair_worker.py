@@ -0,0 +1,77 @@
+import json
+import re
+from typing import Any, Dict, Optional
+from loguru import logger
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers.base_worker import BaseWorker
+
+_FENCE = re.compile(r"```(?:python)?\s*\n?|\s*```", re.IGNORECASE)
+
+
+class RepairWorker(BaseWorker):
+    """
+    Fixes failed code in a single call: the failing code and its error go in,
+    corrected code (and a one-line rationale) comes out. Replaces the
+    FeedbackWorker -> CodeWorker round trip of the repair loop.
+    """
+
+    async def execute(
+        self,
+        generated_code: str,
+        validation_result: Dict[str, Any],
+        specification: Dict[str, Any],
+        model: Optional[str] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Return ``{"code": ..., "rationale": ...}``; rationale is None when the reply has none.
+        ``model`` overrides the worker's model for this call.
+        """
+        logger.info("Repairing failed code...")
+
+        error_message = validation_result.get("error", "Unknown error")
+        messages = [
+            {"role": "system", "content": self.system_prompt},  # FROM repair_worker_prompt.txt
+            {"role": "user", "content": self._build_prompt(generated_code, error_message, specification, validation_result.get("slow_operations"))}
+        ]
+
+        response = await self._call_llm(messages, model=model, temperature=0.3, max_tokens=5000)
+        repair = self.parse_response(response)
+        logger.success(f"Repaired code ({len(repair['code'])} characters): {repair['rationale'] or 'no rationale given'}")
+        return repair
+
+    @staticmethod
+    def parse_response(response: str) -> Dict[str, Optional[str]]:
+        """Split a reply into the rationale line and the code, dropping any markdown fences."""
+        rationale = None
+        code_lines = []
+        for line in _FENCE.sub("\n", response).strip().splitlines():
+            if rationale is None and not code_lines and line.strip().upper().startswith("RATIONALE:"):
+                rationale = line.split(":", 1)[1].strip()
+            else:
+                code_lines.append(line)
+        return {"code": "\n".join(code_lines).strip() + "\n", "rationale": rationale}
+
+    def _build_prompt(self, code: str, error: str, spec: Dict[str, Any], slow_operations: Optional[str] = None) -> str:
+        """Build the repair request prompt."""
+        profile = f"""
+SLOWEST OPERATIONS (line: operation, time, resulting topology):
+{slow_operations}
+""" if slow_operations else ""
+
+        return f"""
+This code failed validation. Return the corrected code.
+
+ERROR: {error}
+{profile}
+SPECIFICATION:
+{json.dumps(spec, indent=2)}
+
+FAILED CODE:
+{code}
+"""
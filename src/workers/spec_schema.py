@@ -0,0 +1,227 @@
+from typing import Any, Annotated, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, ValidationError
+
+class SpecValidationError(ValueError):
+    """Raised when a specification does not match the spec schema."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Specification schema validation failed: " + "; ".join(errors))
+
+
+class _SpecModel(BaseModel):
+    """Base for spec models. Unknown keys are kept so the LLM can add detail."""
+    model_config = ConfigDict(extra="allow")
+
+
+Vector2 = Annotated[List[Union[float, str]], Field(min_length=2, max_length=2)]
+Vector3 = Annotated[List[float], Field(min_length=3, max_length=3)]
+
+
+class WorkplaneSpec(_SpecModel):
+    origin: Vector3
+    x_direction: Vector3
+    normal: Vector3
+
+
+class SketchStep(_SpecModel):
+    """A single sketch primitive such as move_to, line_to, three_point_arc or circle."""
+    type: str
+    point: Optional[Vector2] = None
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class SketchLoop(_SpecModel):
+    """A closed loop on a workplane, either a path of steps or a parametric primitive."""
+    type: str
+    name: Optional[str] = None
+    operations: Optional[List[SketchStep]] = None
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class ExtrudeParameters(_SpecModel):
+    distance: Union[float, str]
+
+
+class BaseSolidOperation(_SpecModel):
+    type: Literal["base_solid"]
+    shape: str
+    parameters: Dict[str, Any]
+
+
+class ModifierOperation(_SpecModel):
+    type: Literal["modifier"]
+    operation: str
+    parameters: Dict[str, Any] = {}
+
+
+class SketchOperation(_SpecModel):
+    type: Literal["sketch"]
+    plane: Union[str, WorkplaneSpec] = "XY"
+    operations: Annotated[List[SketchStep], Field(min_length=1)]
+
+
+class ExtrudeOperation(_SpecModel):
+    type: Literal["extrude"]
+    parameters: ExtrudeParameters
+
+
+class WorkplaneExtrudeOperation(_SpecModel):
+    type: Literal["base_solid_extrude", "union_extrude", "cut_extrude"]
+    name: Optional[str] = None
+    workplane: WorkplaneSpec
+    sketch: Annotated[List[SketchLoop], Field(min_length=1)]
+    extrude: ExtrudeParameters
+    combine_operation: Optional[Literal["union", "cut"]] = None
+
+
+class ParametersOperation(_SpecModel):
+    type: Literal["parameters"]
+    values: Dict[str, Any]
+
+
+class GenericOperation(_SpecModel):
+    """Any operation type not covered above (revolve, loft, shell, ...)."""
+    type: str
+
+
+_OPERATION_TAGS = {
+    "base_solid": "base_solid",
+    "modifier": "modifier",
+    "sketch": "sketch",
+    "extrude": "extrude",
+    "base_solid_extrude": "workplane_extrude",
+    "union_extrude": "workplane_extrude",
+    "cut_extrude": "workplane_extrude",
+    "parameters": "parameters",
+}
+
+
+def _operation_tag(value: Any) -> str:
+    """Pick the operation variant from its 'type', falling back to the generic one."""
+    op_type = value.get("type") if isinstance(value, dict) else getattr(value, "type", None)
+    return _OPERATION_TAGS.get(op_type, "generic")
+
+
+CadOperation = Annotated[
+    Union[
+        Annotated[BaseSolidOperation, Tag("base_solid")],
+        Annotated[ModifierOperation, Tag("modifier")],
+        Annotated[SketchOperation, Tag("sketch")],
+        Annotated[ExtrudeOperation, Tag("extrude")],
+        Annotated[WorkplaneExtrudeOperation, Tag("workplane_extrude")],
+        Annotated[ParametersOperation, Tag("parameters")],
+        Annotated[GenericOperation, Tag("generic")],
+    ],
+    Discriminator(_operation_tag),
+]
+
+
+class CadSpecification(_SpecModel):
+    """Top-level specification produced by SpecWorker and consumed by CodeWorker."""
+    part_name: str
+    description: str
+    parameters: Optional[Dict[str, Any]] = None
+    cad_operations: Annotated[List[CadOperation], Field(min_length=1)]
+
+
+# Built once at import and reused for every request.
+SPEC_JSON_SCHEMA: Dict[str, Any] = CadSpecification.model_json_schema()
+
+SPEC_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "cad_specification",
+        # Strict mode would forbid the extra keys the spec format relies on.
+        "strict": False,
+        "schema": SPEC_JSON_SCHEMA,
+    },
+}
+
+_TAG_NAMES = set(_OPERATION_TAGS.values()) | {"generic"}
+
+
+def validate_spec(spec_data: Any) -> CadSpecification:
+    """
+    Validate a parsed specification against the schema.
+
+    Raises:
+        SpecValidationError: With one "path: message" entry per problem.
+    """
+    try:
+        return CadSpecification.model_validate(spec_data)
+    except ValidationError as e:
+        raise SpecValidationError([f"{_format_loc(err['loc'])}: {err['msg']}" for err in e.errors()]) from None
+
+
+def _format_loc(loc: tuple) -> str:
+    """Render a pydantic error location as e.g. cad_operations[2].workplane.normal."""
+    if len(loc) > 2 and loc[0] == "cad_operations" and isinstance(loc[1], int) and loc[2] in _TAG_NAMES:
+        # Drop the union variant tag pydantic inserts after the operation index.
+        loc = loc[:2] + loc[3:]
+
+    path = ""
+    for part in loc:
+        if isinstance(part, int):
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else str(part)
+    return path or "<root>"
+
+
+class PartLocation(_SpecModel):
+    position: Vector3 = [0.0, 0.0, 0.0]
+    rotation: Vector3 = [0.0, 0.0, 0.0]
+
+
+class AssemblyPart(_SpecModel):
+    name: Annotated[str, Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]*$")]
+    description: str
+    quantity: Annotated[int, Field(ge=1)] = 1
+    location: PartLocation = PartLocation()
+    locations: Optional[List[PartLocation]] = None
+    color: Optional[str] = None
+
+    def instance_locations(self) -> List[PartLocation]:
+        """One location per copy; missing ones repeat the part's location."""
+        locations = list(self.locations or [])
+        return (locations + [self.location] * self.quantity)[:self.quantity]
+
+    def instance_names(self) -> List[str]:
+        if self.quantity == 1:
+            return [self.name]
+        return [f"{self.name}_{index}" for index in range(1, self.quantity + 1)]
+
+
+class AssemblyConstraint(_SpecModel):
+    type: Literal["Plane", "Point", "Axis", "PointInPlane"]
+    a: str
+    b: str
+
+
+class AssemblySpecification(_SpecModel):
+    """Decomposition of a multi-part product produced by AssemblyWorker."""
+    assembly_name: str
+    description: str
+    parts: Annotated[List[AssemblyPart], Field(min_length=1)]
+    constraints: List[AssemblyConstraint] = []
+
+
+def validate_assembly_spec(spec_data: Any) -> AssemblySpecification:
+    """
+    Validate a parsed assembly decomposition.
+
+    Raises:
+        SpecValidationError: With one "path: message" entry per problem.
+    """
+    try:
+        spec = AssemblySpecification.model_validate(spec_data)
+    except ValidationError as e:
+        raise SpecValidationError([f"{_format_loc(err['loc'])}: {err['msg']}" for err in e.errors()]) from None
+
+    names = [part.name for part in spec.parts]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise SpecValidationError([f"parts: duplicate part names {duplicates}"])
+    return spec
@@ -0,0 +1,166 @@
+import ast
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import cadquery as cq
+import OCP
+from loguru import logger
+
+from src.output_handler import shape_io
+
+# Bump when ValidationWorker's checks or the stored result format change:
+# verdicts recorded by an older validator must not be served.
+VALIDATOR_VERSION = 1
+# A verdict holds for one script under one CadQuery/OCCT build and validator.
+_ENVIRONMENT = f"cadquery={cq.__version__} ocp={getattr(OCP, '__version__', 'unknown')} validator={VALIDATOR_VERSION}"
+
+
+def cache_key_source(code: str) -> str:
+    """
+    Canonical form of a script: ast.unparse drops comments, blank lines and
+    formatting differences. Code that does not parse is only stripped per line.
+    """
+    try:
+        return ast.unparse(ast.parse(code))
+    except SyntaxError:
+        return "\n".join(line.rstrip() for line in code.strip().splitlines())
+
+
+def code_key(code: str) -> str:
+    return hashlib.sha256(f"{_ENVIRONMENT}\n{cache_key_source(code)}".encode()).hexdigest()
+
+
+class ValidationCache:
+    """
+    On-disk cache of validation results keyed on the normalised code hash,
+    together with the CadQuery, OCP and validator versions.
+
+    A failure is stored as its error message; a success as the result shapes in
+    binary BREP (see shape_io), so a hit costs a BREP read instead of
+    re-executing the script.
+    Entries are evicted least-recently-used once the directory exceeds ``max_bytes``.
+    Safe to share between threads.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """Cached validation result for ``code``, or None."""
+        key = code_key(code)
+        with self._lock:
+            known = key in self._sizes
+            if known:
+                self._sizes.move_to_end(key)
+        if not known:
+            self.misses += 1
+            return None
+
+        try:
+            entry = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+            if entry["success"]:
+                shape = shape_io.load(self._shape_path(key))
+                shapes = list(shape) if entry["compound"] else [shape]
+                result = {"success": True, "object": cq.Workplane("XY").newObject(shapes)}
+            else:
+                result = {"success": False, "error": entry["error"]}
+        except Exception as e:
+            # Removed or corrupted behind our back; drop it and validate normally.
+            logger.warning(f"Discarding unreadable validation cache entry {key[:12]}: {e}")
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        os.utime(self._meta_path(key))
+        self.hits += 1
+        return result
+
+    def put(self, code: str, result: Dict[str, Any]):
+        """Store the outcome of _execute_code_safely for ``code``."""
+        key = code_key(code)
+        if result["success"]:
+            shapes = result["object"].vals()
+            if not shapes or not all(isinstance(shape, cq.Shape) for shape in shapes):
+                return  # nothing we can persist as BREP
+            shape = shapes[0] if len(shapes) == 1 else cq.Compound.makeCompound(shapes)
+            self._write(self._shape_path(key), lambda path: shape_io.dump(shape, path, metadata=False))
+            entry = {"success": True, "compound": len(shapes) > 1}
+        else:
+            entry = {"success": False, "error": result["error"]}
+
+        self._write(self._meta_path(key), lambda path: Path(path).write_text(json.dumps(entry), encoding="utf-8"))
+
+        size = self._entry_size(key)
+        with self._lock:
+            self._total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._sizes.move_to_end(key)
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(self._sizes) > 1:
+                old_key, old_size = self._sizes.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._unlink(old_key)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._sizes)
+            self._sizes.clear()
+            self._total_bytes = 0
+        for key in keys:
+            self._unlink(key)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times left by earlier runs."""
+        entries = []
+        for meta in self.directory.glob("*.json"):
+            key = meta.stem
+            entries.append((meta.stat().st_mtime, key, self._entry_size(key)))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total_bytes += size
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _shape_path(self, key: str) -> Path:
+        return self.directory / f"{key}.shape"
+
+    def _entry_size(self, key: str) -> int:
+        return sum(path.stat().st_size for path in (self._meta_path(key), self._shape_path(key)) if path.exists())
+
+    def _write(self, path: Path, writer):
+        """Write through a temporary file so concurrent readers never see a partial entry."""
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        writer(str(tmp))
+        os.replace(tmp, path)
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._total_bytes -= self._sizes.pop(key, 0)
+        self._unlink(key)
+
+    def _unlink(self, key: str):
+        for path in (self._meta_path(key), self._shape_path(key)):
+            path.unlink(missing_ok=True)
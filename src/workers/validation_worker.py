@@ -1,6 +1,9 @@
+import asyncio
+import multiprocessing
 import tempfile
 import os
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
 from loguru import logger
 
 import sys
@@ -10,17 +13,82 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.workers.base_worker import BaseWorker
+from src.workers.incremental_executor import ExecutionTimeout, IncrementalExecutor
+from src.workers.validation_cache import ValidationCache
+from src.workers.operation_profiler import OperationProfiler
+from src.output_handler import shape_io
+from src.utilities.deadline import time_left
+from src.config.settings import settings
+
+# Isolated validations fork from a single-threaded server that has CadQuery
+# loaded: forking this process, with its HTTP and executor threads, could copy
+# an OCC or glibc lock held by another thread into the child.
+_isolation = multiprocessing.get_context("forkserver")
+# The server does not see our sys.path before Python 3.12; when this module
+# cannot be preloaded, CadQuery (the slow part) still is.
+_isolation.set_forkserver_preload(["cadquery", "src.workers.validation_worker"])
 
 
 class ValidationWorker(BaseWorker):
     """Executes and validates generated CadQuery code."""
+
+    def __init__(
+        self,
+        model=None,
+        incremental: Optional[bool] = None,
+        cache: Union[ValidationCache, bool] = True,
+        profile: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ):
+        super().__init__(model)
+        if incremental is None:
+            incremental = settings.incremental_validation
+        # Repair iterations usually change only the tail of a script, so resume
+        # from the deepest cached statement instead of rebuilding from scratch.
+        self.executor = IncrementalExecutor(settings.incremental_cache_size) if incremental else None
+        # Identical scripts (after normalisation) are answered from disk.
+        # True: the VALIDATION_CACHE default; False: no cache; or a cache to use.
+        if cache is True:
+            cache = (
+                ValidationCache(settings.validation_cache_dir, int(settings.validation_cache_max_mb * 1024 * 1024))
+                if settings.validation_cache else None
+            )
+        self.cache: Optional[ValidationCache] = None if cache is False else cache
+        # Per-operation timings; executes the whole script so every operation is measured.
+        self.profile = settings.validation_profile if profile is None else profile
+        # Upper bound per validation (VALIDATION_TIMEOUT), further cut by the generation's deadline.
+        self.timeout = settings.validation_timeout if timeout is None else timeout
     
     async def execute(self, generated_code: str) -> Dict[str, Any]:
         """
         Execute the generated code and validate it produces a valid CadQuery object.
+
+        With a timeout or a deadline in effect validation runs off the event
+        loop and stops when the time is up; see ``validate``.
+        """
+        timeout = time_left(self.timeout)
+        if timeout is None:
+            return self.validate(generated_code)
+        return await asyncio.to_thread(self.validate, generated_code, timeout)
+
+    def validate(self, generated_code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Synchronous validation, for callers that run it in an executor.
+
+        ``timeout`` (seconds) stops the script when it expires. With the
+        incremental executor the script stays in this process, so checkpoints
+        are used and filled, and the limit is checked on every line of the
+        script: only a single long OCC call can overrun it. Otherwise (and when
+        profiling) the script runs in a child process that is killed.
         """
         logger.info("Validating generated code...")
         
+        if self.cache is not None and not self.profile:
+            cached = self.cache.get(generated_code)
+            if cached is not None:
+                logger.info("Validation result served from cache")
+                return self._to_validation_result(cached)
+        
         try:
             # Create a temporary file with the generated code
             with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
@@ -28,25 +96,23 @@ class ValidationWorker(BaseWorker):
                 temp_file = f.name
             
             # Execute the code in a controlled environment
-            result = self._execute_code_safely(temp_file)
+            if timeout is None or (self.executor is not None and not self.profile):
+                result = self._execute_code_safely(temp_file, timeout)
+            else:
+                logger.debug("Validating in a separate process to enforce the timeout (incremental validation is off)")
+                result = self._execute_isolated(temp_file, timeout)
             
             # Clean up
             os.unlink(temp_file)
             
-            if result["success"]:
-                logger.success("Code validation successful!")
-                return {
-                    "success": True,
-                    "object": result["object"],
-                    "message": "Valid CadQuery object generated"
-                }
-            else:
-                logger.warning(f"Code validation failed: {result['error']}")
-                return {
-                    "success": False,
-                    "error": result["error"],
-                    "message": "Generated code failed to execute"
-                }
+            # Timeouts and crashes of the validation process say nothing lasting about the code.
+            if self.cache is not None and not (result.get("timed_out") or result.get("transient")):
+                try:
+                    self.cache.put(generated_code, result)
+                except Exception as e:
+                    logger.warning(f"Could not cache validation result: {e}")
+            
+            return self._to_validation_result(result)
                 
         except Exception as e:
             logger.error(f"Validation process failed: {e}")
@@ -56,10 +122,54 @@ class ValidationWorker(BaseWorker):
                 "message": "Validation process error"
             }
     
-    def _execute_code_safely(self, file_path: str) -> Dict[str, Any]:
+    def _to_validation_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result["success"]:
+            logger.success("Code validation successful!")
+            validation_result = {
+                "success": True,
+                "object": result["object"],
+                "message": "Valid CadQuery object generated"
+            }
+        else:
+            logger.warning(f"Code validation failed: {result['error']}")
+            validation_result = {
+                "success": False,
+                "error": result["error"],
+                "message": "Generated code failed to execute"
+            }
+            if result.get("timed_out"):
+                validation_result["timed_out"] = True
+        if "profile" in result:
+            validation_result["profile"] = result["profile"]
+            validation_result["profile_path"] = result["profile_path"]
+            validation_result["slow_operations"] = result["slow_operations"]
+        return validation_result
+
+    def _profiled_exec(self, code_content: str, local_vars: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the script under the operation profiler; its report is stored in ``report`` even if the script fails."""
+        profiler = OperationProfiler("<generated>")
+        try:
+            with profiler:
+                exec(compile(code_content, "<generated>", "exec"), local_vars)
+        finally:
+            profile = profiler.profile
+            filename = f"validation_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.folded"
+            slow = profile.summary() if profile.total_time >= settings.slow_operation_seconds else None
+            if slow:
+                logger.warning(f"Slow CadQuery operations:\n{slow}")
+            report.update({
+                "profile": profile.to_dict(),
+                "profile_path": profile.write_folded(str(Path(settings.validation_profile_dir) / filename)),
+                "slow_operations": slow,
+            })
+        return local_vars
+    
+    def _execute_code_safely(self, file_path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Simpler execution - just import what we need and run the code.
+        ``timeout`` applies to the incremental executor only.
         """
+        report: Dict[str, Any] = {}
         try:
             # Import cadquery here so it's available
             import cadquery as cq
@@ -72,13 +182,73 @@ class ValidationWorker(BaseWorker):
                 code_content = f.read()
             
             # Execute the code with cadquery available
-            exec(code_content, {}, local_vars)
+            if self.profile:
+                local_vars = self._profiled_exec(code_content, local_vars, report)
+            elif self.executor is not None:
+                local_vars = self.executor.run(code_content, local_vars, timeout=timeout)
+            else:
+                # One namespace, as for a module: functions defined by the script must see its globals.
+                exec(code_content, local_vars)
             
             # Check if 'result' variable exists
             if 'result' in local_vars and hasattr(local_vars['result'], 'val'):
-                return {"success": True, "object": local_vars['result']}
+                return {"success": True, "object": local_vars['result'], **report}
             else:
-                return {"success": False, "error": "No valid 'result' object found"}
-                
+                return {"success": False, "error": "No valid 'result' object found", **report}
+
+        except ExecutionTimeout as e:
+            logger.warning(str(e))
+            return {"success": False, "error": str(e), "timed_out": True}
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            # OCC exceptions often carry no message; the type is still informative.
+            return {"success": False, "error": str(e) or type(e).__name__, **report}
+
+    def _execute_isolated(self, file_path: str, timeout: float) -> Dict[str, Any]:
+        """
+        ``_execute_code_safely`` in a child process, killed after ``timeout``
+        seconds. Children fork from the forkserver rather than being spawned,
+        so they start in milliseconds with CadQuery already loaded. The
+        resulting shapes come back as BREP.
+        """
+        receiver, sender = _isolation.Pipe(duplex=False)
+        process = _isolation.Process(target=_isolated_child, args=(file_path, self.profile, sender), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(timeout):
+                logger.warning(f"Validation timed out after {timeout:.1f}s; killing the validation process")
+                return {"success": False, "error": f"Validation timed out after {timeout:.1f}s", "timed_out": True}
+            result = receiver.recv()
+        except EOFError:
+            process.join()
+            return {"success": False, "error": f"Validation process died (exit code {process.exitcode})", "transient": True}
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            receiver.close()
+
+        if result["success"]:
+            import cadquery as cq
+            data = result.pop("shape")
+            if result.pop("compound"):
+                result["object"] = shape_io.load_workplane(data)
+            else:
+                result["object"] = cq.Workplane("XY").newObject([shape_io.loads(data)])
+        return result
+
+
+
+def _isolated_child(file_path: str, profile: bool, sender):
+    """Forkserver child of ``_execute_isolated``: validate once, send the result back."""
+    worker = ValidationWorker(incremental=False, cache=False, profile=profile, timeout=None)
+    try:
+        result = worker._execute_code_safely(file_path)
+        if result["success"]:
+            model = result.pop("object")
+            result["shape"] = shape_io.dumps(model, metadata=False)
+            result["compound"] = len(model.vals()) > 1
+    except Exception as e:
+        result = {"success": False, "error": f"Could not return the validated model: {e}", "transient": True}
+    sender.send(result)
+    sender.close()
@@ -0,0 +1,79 @@
+import asyncio
+import os
+
+import pytest
+
+# Settings require an API key at import time; hermetic tests never reach the network.
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+# Keep test runs independent of results cached on disk by earlier runs.
+os.environ.setdefault("VALIDATION_CACHE", "false")
+# Exports go straight to the test's directory unless a test sets up an artifact store.
+os.environ.setdefault("ARTIFACT_STORE", "false")
+# Tests drive the spec-first path unless they opt in to prompt routing.
+os.environ.setdefault("PROMPT_ROUTING", "false")
+
+SPEC = {
+    "part_name": "Cube",
+    "description": "A 10 mm cube.",
+    "cad_operations": [{"type": "base_solid", "shape": "box", "parameters": {"length": 10, "width": 10, "height": 10}}],
+}
+GOOD_CODE = "import cadquery as cq\nresult = cq.Workplane('XY').box(10, 10, 10)\n"
+BAD_CODE = "import cadquery as cq\nresult = cq.Workplane('XY').box(size, 10, 10)\n"
+
+
+class SpecWorkerStub:
+    """Returns SPEC after ``delay`` seconds."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def execute(self, prompt, model=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SPEC
+
+
+class CodeWorkerStub:
+    """Returns the given answers in turn (GOOD_CODE by default); the last one repeats."""
+
+    def __init__(self, *answers, delay=0.0):
+        self.answers = list(answers) or [GOOD_CODE]
+        self.delay = delay
+        self.specs = []
+
+    async def execute(self, spec, feedback=None, model=None):
+        self.specs.append(spec)
+        await asyncio.sleep(self.delay)
+        return self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+
+
+class FeedbackWorkerStub:
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, code, validation_result, spec, model=None):
+        self.calls += 1
+        return "Use a positive height."
+
+
+@pytest.fixture
+def make_director():
+    """
+    Builds CadDirectors on the stub workers, without model routing or a
+    validation cache. Positional arguments are the code worker's answers,
+    other keyword arguments go to CadDirector.
+    """
+    from src.director.cad_director import CadDirector
+    from src.workers.validation_worker import ValidationWorker
+
+    def make(*answers, spec_worker=None, code_worker=None, **options):
+        director = CadDirector(**options)
+        director.spec_worker = spec_worker or SpecWorkerStub()
+        director.code_worker = code_worker or CodeWorkerStub(*answers)
+        director.feedback_worker = FeedbackWorkerStub()
+        director.validation_worker = ValidationWorker(incremental=False, cache=False, profile=False)
+        director.router = None
+        return director
+
+    return make
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import Settings
+from src.daemon import DaemonServer, forward, is_running, request
+from src.workers.base_worker import load_prompt
+
+
+def make_args(**overrides):
+    args = dict(prompt="a cube", output="out", sweep=None, repair=None, profile=False, visualize=False)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """A daemon on a temporary socket whose commands are stubbed, served from a background thread."""
+    calls = []
+
+    async def fake_run(args, warm_up=None, director=None, sweep=None):
+        calls.append((args, director))
+        if args.prompt == "fail":
+            raise RuntimeError("kernel exploded")
+        print(f"generated {args.prompt}")
+        # Post-processing reports from worker threads
+        await asyncio.to_thread(print, "exported")
+
+    async def no_warm_up(self):
+        pass
+
+    monkeypatch.setattr("src.commands.run", fake_run)
+    monkeypatch.setattr("src.commands.make_director", lambda args: object())
+    monkeypatch.setattr(DaemonServer, "warm_up", no_warm_up)
+
+    server = DaemonServer(str(tmp_path / "daemon.sock"))
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if is_running(str(server.path)):
+            break
+        time.sleep(0.05)
+    yield server, calls
+    if thread.is_alive():
+        list(request({"command": "shutdown"}, str(server.path)))
+        thread.join(timeout=5)
+
+
+def run_message(tmp_path, **overrides):
+    return {"command": "run", "args": vars(make_args(**overrides)), "cwd": str(tmp_path)}
+
+
+def test_prompts_are_read_once():
+    assert load_prompt("code_worker_prompt.txt") is load_prompt("code_worker_prompt.txt")
+
+
+def test_forward_without_daemon_falls_back(tmp_path):
+    assert forward(make_args(), str(tmp_path / "missing.sock")) is None
+
+    # A socket file left behind by a daemon that died
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert forward(make_args(), str(stale)) is None
+
+
+def test_daemon_streams_output_and_reuses_directors(daemon, tmp_path):
+    server, calls = daemon
+    path = str(server.path)
+
+    replies = list(request(run_message(tmp_path, prompt="a cube"), path))
+    assert [reply for reply in replies if reply["type"] == "stdout"] == [
+        {"type": "stdout", "text": "generated a cube"},
+        {"type": "stdout", "text": "\n"},
+        {"type": "stdout", "text": "exported"},
+        {"type": "stdout", "text": "\n"},
+    ]
+    assert replies[-1] == {"type": "exit", "code": 0}
+    assert (tmp_path / "out").is_dir()
+
+    list(request(run_message(tmp_path, prompt="a plate"), path))
+    list(request(run_message(tmp_path, prompt="a plate", repair="single"), path))
+    directors = [director for _, director in calls]
+    assert directors[0] is directors[1]
+    assert directors[2] is not directors[0]
+
+    status = next(request({"command": "ping"}, path))
+    assert status["requests"] == 3 and status["warm"]
+
+
+def test_daemon_reports_failures_and_keeps_serving(daemon, tmp_path):
+    server, _ = daemon
+    path = str(server.path)
+
+    replies = list(request(run_message(tmp_path, prompt="fail"), path))
+    assert any("kernel exploded" in reply.get("text", "") for reply in replies)
+    assert replies[-1] == {"type": "exit", "code": 1}
+
+    assert list(request(run_message(tmp_path), path))[-1] == {"type": "exit", "code": 0}
+
+
+def test_shutdown_removes_socket(daemon):
+    server, _ = daemon
+    assert list(request({"command": "shutdown"}, str(server.path))) == [{"type": "exit", "code": 0}]
+    for _ in range(100):
+        if not server.path.exists():
+            break
+        time.sleep(0.05)
+    assert not server.path.exists()
+
+
+def test_shared_state_paths_do_not_follow_the_client_cwd(tmp_path, monkeypatch):
+    # The daemon changes directory per client; caches and stores built once must not.
+    monkeypatch.chdir(tmp_path)
+    paths = Settings(ARTIFACT_STORE_DIR=".cache/artifacts", MODEL_STATS_PATH=":memory:")
+    assert paths.artifact_store_dir == str(project_root / ".cache/artifacts")
+    assert Path(paths.validation_cache_dir).is_absolute() and Path(paths.model_spill_dir).is_absolute()
+    assert paths.model_stats_path == ":memory:"
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utilities.http_transport import PoolStats, create_http_client
+from src.utilities.llm_client import OpenRouterClient
+
+
+class SlowCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(0.05)
+        self._reply({"choices": [{"message": {"content": "ok"}}], "usage": {"prompt_tokens": 1, "completion_tokens": 1}})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _reply(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowCompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_reuse_and_pool_wait(server_url, monkeypatch):
+    monkeypatch.setattr("src.utilities.http_transport.settings.http_max_connections", 1)
+    stats = PoolStats()
+
+    async with create_http_client(stats) as client:
+        await asyncio.gather(*(client.post(server_url, json={}) for _ in range(4)))
+
+    assert stats.requests == 4
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 3
+    # With a single connection the last request waits for the three before it.
+    assert stats.pool_wait_max >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_client_warm_up_opens_the_connection_and_reopens_after_close(server_url):
+    client = OpenRouterClient()
+    client.base_url = server_url
+
+    await client.warm_up()
+    content = await client.chat_completion([{"role": "user", "content": "hi"}])
+    await client.close()
+
+    assert content == "ok"
+    assert client.pool_stats.connections_opened == 1
+    assert client.pool_stats.connections_reused == 1
+
+    # A closed client is recreated on next use, sharing the same statistics.
+    await client.chat_completion([{"role": "user", "content": "again"}])
+    await client.close()
+    assert client.pool_stats.requests == 3
@@ -0,0 +1,141 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.assembly import AssemblyDirector, build_assembly
+from src.director.cad_director import CadDirector
+from src.output_handler.exporter import export_assembly
+from src.utilities.llm_backends import DeterministicBackend
+from src.workers.spec_schema import AssemblySpecification, SpecValidationError, validate_assembly_spec
+
+DECOMPOSITION = {
+    "assembly_name": "Post Stand",
+    "description": "A base plate with two posts.",
+    "parts": [
+        {
+            "name": "base_plate",
+            "description": "A 100 x 60 x 8 mm plate.",
+            "location": {"position": [0, 0, 0], "rotation": [0, 0, 0]},
+            "color": "gray",
+        },
+        {
+            "name": "post",
+            "description": "A 10 x 10 x 50 mm post.",
+            "quantity": 2,
+            "locations": [
+                {"position": [-30, 0, 29], "rotation": [0, 0, 0]},
+                {"position": [30, 0, 29], "rotation": [0, 0, 0]},
+            ],
+            "color": "not-a-color",
+        },
+    ],
+    "constraints": [],
+}
+
+CODE = {
+    "base_plate": "import cadquery as cq\nresult = cq.Workplane('XY').box(100, 60, 8)\n",
+    "post": "import cadquery as cq\nresult = cq.Workplane('XY').box(10, 10, 50)\n",
+}
+BAD_CODE = "import cadquery as cq\nresult = cq.Workplane('XY').box(size, 10, 50)\n"
+
+
+class PartSpecWorker:
+    async def execute(self, prompt, model=None):
+        name = re.search(r"part '(\w+)'", prompt).group(1)
+        return {"part_name": name, "description": prompt, "cad_operations": [{"type": "base_solid"}]}
+
+
+class PartCodeWorker:
+    def __init__(self, fail_first=()):
+        self.fail_first = set(fail_first)
+
+    async def execute(self, spec, feedback=None, model=None):
+        if spec["part_name"] in self.fail_first and feedback is None:
+            return BAD_CODE
+        return CODE[spec["part_name"]]
+
+
+class FakeFeedbackWorker:
+    async def execute(self, code, validation_result, spec, model=None):
+        return f"Fix: {validation_result['error']}"
+
+
+def make_assembly_director(decomposition, fail_first=()):
+    director = CadDirector()
+    director.spec_worker = PartSpecWorker()
+    director.code_worker = PartCodeWorker(fail_first)
+    director.feedback_worker = FakeFeedbackWorker()
+    assembly_director = AssemblyDirector(director)
+    assembly_director.assembly_worker.backend = DeterministicBackend(responses=[json.dumps(decomposition)])
+    return assembly_director
+
+
+@pytest.mark.asyncio
+async def test_parts_are_generated_and_placed():
+    result = await make_assembly_director(DECOMPOSITION).generate_from_prompt("A plate with two posts")
+
+    assert result["status"] == "success"
+    assembly = result["assembly"]
+    assert [child.name for child in assembly.children] == ["base_plate", "post_1", "post_2"]
+    post_1 = assembly.children[1]
+    assert post_1.loc.toTuple()[0] == pytest.approx((-30, 0, 29))
+    # Unknown colors fall back to the default instead of failing the assembly.
+    assert post_1.color is None
+    assert result["usage"]["total"]["total_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_failing_part_retries_alone():
+    result = await make_assembly_director(DECOMPOSITION, fail_first={"post"}).generate_from_prompt("A plate with two posts")
+
+    assert result["status"] == "success"
+    assert result["parts"]["base_plate"]["iterations"] == 1
+    assert result["parts"]["post"]["iterations"] == 2
+    assert result["iterations"] == 3
+
+
+def test_constraints_are_solved():
+    spec = AssemblySpecification.model_validate({
+        "assembly_name": "Stack",
+        "description": "A post on a plate.",
+        "parts": [
+            {"name": "base_plate", "description": "plate"},
+            {"name": "post", "description": "post", "location": {"position": [5, 5, 100]}},
+        ],
+        "constraints": [{"type": "Plane", "a": "base_plate@faces@>Z", "b": "post@faces@<Z"}],
+    })
+    models = {
+        "base_plate": cq.Workplane("XY").box(100, 60, 8),
+        "post": cq.Workplane("XY").box(10, 10, 50),
+    }
+
+    assembly = build_assembly(spec, models)
+
+    post = assembly.objects["post"]
+    # The post's bottom face now lies on the plate's top face (z = 4) at the plate's centre.
+    assert post.loc.toTuple()[0] == pytest.approx((0, 0, 29), abs=1e-4)
+
+
+def test_duplicate_part_names_are_rejected():
+    data = dict(DECOMPOSITION, parts=[DECOMPOSITION["parts"][0], DECOMPOSITION["parts"][0]])
+    with pytest.raises(SpecValidationError, match="duplicate"):
+        validate_assembly_spec(data)
+
+
+def test_export_assembly_writes_step(tmp_path):
+    assembly = cq.Assembly(name="pair")
+    assembly.add(cq.Workplane("XY").box(1, 1, 1), name="a")
+    assembly.add(cq.Workplane("XY").box(1, 1, 1), name="b", loc=cq.Location(2, 0, 0))
+
+    path = export_assembly(assembly, str(tmp_path), "pair")
+
+    assert path.endswith("pair.step")
+    content = Path(path).read_text()
+    assert "'a'" in content and "'b'" in content
@@ -0,0 +1,109 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.pipeline import CadPipeline
+from src.utilities.deadline import Deadline, DeadlineExceededError, deadline_scope, time_left
+from src.utilities.llm_backends import DeterministicBackend
+from src.utilities.llm_client import _past_deadline
+from src.workers.code_worker import CodeWorker
+from src.workers.validation_worker import ValidationWorker
+from tests.conftest import GOOD_CODE, SPEC, CodeWorkerStub, SpecWorkerStub
+
+ENDLESS_CODE = "import cadquery as cq\nwhile True:\n    pass\n"
+
+
+def uncached_validation_worker():
+    return ValidationWorker(incremental=False, cache=False, profile=False)
+
+
+def test_time_left_is_clamped_to_the_deadline():
+    assert time_left(60) == 60
+    with deadline_scope(Deadline.after(1.0)):
+        assert time_left(60) <= 1.0
+        assert time_left(None) <= 1.0
+
+
+def test_retries_stop_when_the_backoff_would_pass_the_deadline():
+    # Backoff: 2 s after the first attempt, 4 s after the third.
+    with deadline_scope(Deadline.after(3.0)):
+        assert not _past_deadline(SimpleNamespace(attempt_number=1))
+        assert _past_deadline(SimpleNamespace(attempt_number=3))
+    assert not _past_deadline(SimpleNamespace(attempt_number=3))
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_refused_after_the_deadline():
+    backend = DeterministicBackend(["never sent"])
+    with deadline_scope(Deadline.after(-1)):
+        with pytest.raises(DeadlineExceededError):
+            await CodeWorker(backend=backend).execute(SPEC)
+    assert backend.calls == []
+
+
+def test_isolated_validation_returns_the_model():
+    result = uncached_validation_worker().validate(GOOD_CODE, timeout=30)
+    assert result["success"]
+    assert result["object"].val().Volume() == pytest.approx(1000)
+
+
+def test_isolated_validation_is_killed_at_the_timeout():
+    start = time.monotonic()
+    result = uncached_validation_worker().validate(ENDLESS_CODE, timeout=0.5)
+    assert time.monotonic() - start < 5
+    assert not result["success"]
+    assert result["timed_out"]
+
+
+@pytest.mark.asyncio
+async def test_generation_is_cancelled_in_flight(make_director):
+    director = make_director(spec_worker=SpecWorkerStub(delay=10))
+
+    start = time.monotonic()
+    result = await director.generate_from_prompt("a cube", deadline=0.3)
+
+    assert time.monotonic() - start < 2
+    assert result["status"] == "error"
+    assert result["timed_out"]
+    assert result["progress"]["stage"] == "spec"
+    assert "usage" in result
+
+
+@pytest.mark.asyncio
+async def test_endless_validation_reports_partial_progress(make_director):
+    director = make_director(ENDLESS_CODE)
+
+    start = time.monotonic()
+    result = await director.generate_from_prompt("a cube", deadline=1.0)
+
+    assert time.monotonic() - start < 5
+    assert result["timed_out"]
+    assert result["specification"] == SPEC
+    assert result["progress"]["stage"] == "validation"
+    assert result["progress"]["code"] == ENDLESS_CODE
+
+
+@pytest.mark.asyncio
+async def test_generation_within_the_deadline_succeeds(make_director):
+    result = await make_director().generate_from_prompt("a cube", deadline=30)
+    assert result["status"] == "success"
+    result["model"].release()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_jobs_time_out_individually(make_director):
+    director = make_director(code_worker=CodeWorkerStub(delay=10))
+    pipeline = CadPipeline(director, deadline=0.3)
+
+    start = time.monotonic()
+    jobs = [job async for job in pipeline.run(["a", "b"])]
+
+    assert time.monotonic() - start < 2
+    assert all(job.timed_out for job in jobs)
+    assert all("code stage" in job.message for job in jobs)
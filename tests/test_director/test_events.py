@@ -0,0 +1,75 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director import events
+from src.director.events import emit, listen
+from src.output_handler.preview import preview_mesh
+from tests.conftest import BAD_CODE, GOOD_CODE, SPEC, CodeWorkerStub
+
+def test_emit_without_listener_is_a_no_op():
+    emit(events.SPEC_READY, specification=SPEC)
+    received = []
+    with listen(received.append):
+        emit(events.FEEDBACK, 2, feedback="x")
+    emit(events.FEEDBACK, 3, feedback="y")
+    assert [(event.type, event.attempt, event.data) for event in received] == [(events.FEEDBACK, 2, {"feedback": "x"})]
+
+
+def test_preview_mesh_is_coarse_and_covers_every_shape():
+    model = cq.Workplane("XY").box(10, 10, 10).add(cq.Workplane("XY").sphere(2).translate((20, 0, 0)).val())
+    mesh = preview_mesh(model)
+    assert mesh.triangle_count > 12
+    assert len(mesh.vertices) % 3 == 0 and max(mesh.triangles) < len(mesh.vertices) // 3
+    assert mesh.bbox[3] == pytest.approx(22, abs=1e-3)
+    assert preview_mesh(model, tolerance=0.001, angular_tolerance=0.1).triangle_count > mesh.triangle_count
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_events_in_order(make_director):
+    director = make_director(BAD_CODE, GOOD_CODE, repair_mode="feedback")
+
+    received = [event async for event in director.stream_from_prompt("a plate")]
+    types = [event.type for event in received]
+    assert types == [
+        events.SPEC_READY,
+        events.CODE_ATTEMPT, events.VALIDATION, events.FEEDBACK,
+        events.CODE_ATTEMPT, events.VALIDATION, events.PREVIEW,
+        events.MODEL_READY, events.RESULT,
+    ]
+    assert received[0].data["specification"] == SPEC
+    assert received[2].attempt == 1 and not received[2].data["success"]
+    assert received[3].data["feedback"] == "Use a positive height."
+    assert received[5].attempt == 2 and received[5].data["success"]
+    assert received[6].data["bbox"] == pytest.approx([-5, -5, -5, 5, 5, 5], abs=1e-3)
+    assert [event.elapsed for event in received] == sorted(event.elapsed for event in received)
+
+    result = received[-1].data["result"]
+    assert result["status"] == "success" and result["iterations"] == 2
+    result["model"].release()
+
+
+@pytest.mark.asyncio
+async def test_events_arrive_before_the_generation_finishes(make_director):
+    director = make_director(code_worker=CodeWorkerStub(delay=0.3))
+    stream = director.stream_from_prompt("a plate")
+
+    first = await asyncio.wait_for(stream.__anext__(), timeout=0.2)
+    assert first.type == events.SPEC_READY
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_the_generation(make_director):
+    director = make_director(code_worker=CodeWorkerStub(delay=10))
+    stream = director.stream_from_prompt("a plate")
+    assert (await stream.__anext__()).type == events.SPEC_READY
+
+    await asyncio.wait_for(stream.aclose(), timeout=1)
+    assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.iteration_policy import (
+    Action, BudgetIterationPolicy, IterationState, error_signature,
+)
+from tests.conftest import BAD_CODE, GOOD_CODE, SPEC
+
+class ScriptedCodeWorker:
+    """Returns bad code unless called with the escalation model."""
+
+    def __init__(self):
+        self.models = []
+
+    async def execute(self, spec, feedback=None, model=None):
+        self.models.append(model)
+        return GOOD_CODE if model == "strong/model" else BAD_CODE
+
+
+def test_signature_ignores_numbers_and_addresses():
+    assert error_signature("BRep_API: command not done at 0x7f3a") == error_signature("BRep_API: command not done at 0x1b2c")
+    assert error_signature("fillet radius 2.5 too large") == error_signature("fillet radius 4 too large")
+    assert error_signature("name 'length' is not defined") != error_signature("name 'width' is not defined")
+
+
+def test_budget_checks():
+    policy = BudgetIterationPolicy(max_iterations=5, deadline_seconds=10, token_budget=1000, escalation_model="")
+
+    state = IterationState(tokens_used=600)
+    state.record_failure("a", duration=1)
+    assert policy.decide(state).action == Action.STOP  # another ~600 tokens would exceed the budget
+
+    state = IterationState()
+    state.started_at -= 8
+    state.record_failure("a", duration=4)
+    assert policy.decide(state).action == Action.STOP  # ~4s attempt, 2s left
+
+    state = IterationState()
+    state.record_failure("a", duration=1)
+    assert policy.decide(state).action == Action.CONTINUE
+
+
+@pytest.mark.asyncio
+async def test_stops_when_the_same_error_repeats(make_director):
+    policy = BudgetIterationPolicy(max_iterations=5, escalation_model="")
+    director = make_director(code_worker=ScriptedCodeWorker(), iteration_policy=policy)
+
+    result = await director._generate_and_validate(SPEC)
+
+    assert result["status"] == "error"
+    assert "same error twice" in result["message"]
+    assert len(director.code_worker.models) == 2
+    assert director.feedback_worker.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_escalates_before_giving_up(make_director):
+    policy = BudgetIterationPolicy(max_iterations=5, escalation_model="strong/model")
+    director = make_director(code_worker=ScriptedCodeWorker(), iteration_policy=policy)
+
+    result = await director._generate_and_validate(SPEC)
+
+    assert result["status"] == "success"
+    assert result["iterations"] == 3
+    assert director.code_worker.models == [None, None, "strong/model"]
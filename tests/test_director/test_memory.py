@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.batch import run_batch
+from src.director.pipeline import CadPipeline
+from src.utilities.memory import MemoryGovernor, rss_mb
+from tests.test_director.test_pipeline import FakeCodeWorker, FakeSpecWorker
+
+
+def test_rss_is_sampled():
+    assert rss_mb() > 1
+
+
+@pytest.mark.asyncio
+async def test_governor_admits_when_idle_even_above_ceiling():
+    governor = MemoryGovernor(ceiling_mb=0)
+    relieved = []
+    governor.on_pressure.append(lambda: relieved.append(True))
+
+    await asyncio.wait_for(governor.wait_for_headroom(idle=lambda: True), timeout=1)
+
+    assert relieved == [True]
+    assert governor.throttled == 1
+
+
+@pytest.mark.asyncio
+async def test_ceiling_serialises_admission(tmp_path, monkeypatch, make_director):
+    monkeypatch.setattr("src.output_handler.model_handle.settings.model_spill_dir", str(tmp_path))
+    director = make_director(spec_worker=FakeSpecWorker(), code_worker=FakeCodeWorker())
+    governor = MemoryGovernor(ceiling_mb=0, poll_interval=0.01)
+    pipeline = CadPipeline(director, memory=governor, spill_models=True)
+
+    jobs = [job async for job in pipeline.run(["1", "2", "3"])]
+
+    # Above the ceiling each job is only admitted once the previous one is done.
+    assert [job.index for job in jobs] == [0, 1, 2]
+    assert sorted(job.index for job in jobs) == [0, 1, 2]
+    assert all(job.status == "success" for job in jobs)
+    assert all(job.model.state == "spilled" for job in jobs)
+    assert all(job.memory["rss_peak_mb"] >= job.memory["rss_start_mb"] for job in jobs)
+    assert governor.throttled >= 2
+    assert jobs[0].to_result()["model"].get().val().Volume() == pytest.approx(1)
+
+    for job in jobs:
+        job.model.release()
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_models_are_released_after_export(tmp_path, make_director):
+    director = make_director(spec_worker=FakeSpecWorker(), code_worker=FakeCodeWorker())
+    pipeline = CadPipeline(director, output_dir=str(tmp_path), release_after_export=True)
+
+    jobs = [job async for job in pipeline.run(["2", "3"])]
+
+    assert all(job.model.state == "released" for job in jobs)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["job_0000.step", "job_0001.step"]
+
+
+@pytest.mark.asyncio
+async def test_batch_releases_models_after_export(tmp_path, make_director):
+    director = make_director(spec_worker=FakeSpecWorker(), code_worker=FakeCodeWorker())
+    manifest = await run_batch(["2", "3"], str(tmp_path), director=director)
+
+    assert manifest["succeeded"] == 2
+    assert manifest["memory"]["peak_rss_mb"] > 0
+    assert all("rss_end_mb" in job["memory"] for job in manifest["jobs"])
+    assert json.loads((tmp_path / "manifest.json").read_text())["memory"]["throttled"] == 0
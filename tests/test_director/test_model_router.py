@@ -0,0 +1,183 @@
+import asyncio
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.iteration_policy import BudgetIterationPolicy
+from src.director.model_router import ModelRouter
+from src.director.model_stats import ModelStatsStore
+from src.utilities.llm_backends import DeterministicBackend
+from tests.conftest import BAD_CODE, GOOD_CODE, SPEC
+
+def seed(store, worker, model, successes, failures, latency):
+    for index in range(successes + failures):
+        store.record_call(worker, model, index < successes, latency)
+
+
+def test_store_persists_running_totals(tmp_path):
+    path = str(tmp_path / "stats.sqlite3")
+    store = ModelStatsStore(path)
+    store.record_call("CodeWorker", "a", True, 2.0, tokens=100)
+    store.record_call("CodeWorker", "a", False, 4.0, tokens=300)
+    store.record_generation("CodeWorker", "a", iterations=3)
+    store.close()
+
+    stats = ModelStatsStore(path).stats("CodeWorker")["a"]
+    assert (stats.calls, stats.successes) == (2, 1)
+    assert stats.mean_latency == 3.0
+    assert stats.mean_tokens == 200
+    assert stats.mean_iterations == 3
+
+
+def test_router_minimises_expected_time_to_success():
+    store = ModelStatsStore(":memory:")
+    # "fast" answers in 1s but almost never validates; "steady" takes 3s and usually does.
+    seed(store, "CodeWorker", "fast", successes=1, failures=19, latency=1.0)
+    seed(store, "CodeWorker", "steady", successes=18, failures=2, latency=3.0)
+    router = ModelRouter(store, ["fast", "steady", "untried"], exploration_interval=0, default_model="fast")
+
+    assert router.choose("CodeWorker") == "steady"
+    # Nothing recorded for the worker yet: the configured default.
+    assert router.choose("FeedbackWorker") == "fast"
+
+
+def test_spec_choice_accounts_for_downstream_iterations():
+    store = ModelStatsStore(":memory:")
+    seed(store, "SpecWorker", "terse", successes=10, failures=0, latency=1.0)
+    seed(store, "SpecWorker", "thorough", successes=10, failures=0, latency=2.0)
+    for _ in range(5):
+        store.record_generation("SpecWorker", "terse", iterations=4)
+        store.record_generation("SpecWorker", "thorough", iterations=1)
+    router = ModelRouter(store, ["terse", "thorough"], exploration_interval=0)
+
+    assert router.choose("SpecWorker") == "thorough"
+
+
+def test_spec_model_whose_generations_fail_loses_the_route():
+    store = ModelStatsStore(":memory:")
+    # Both parse every time; "broken" specs never lead to a valid part, "sound" ones need two attempts.
+    seed(store, "SpecWorker", "broken", successes=10, failures=0, latency=1.0)
+    seed(store, "SpecWorker", "sound", successes=10, failures=0, latency=1.0)
+    for _ in range(5):
+        store.record_generation("SpecWorker", "broken", iterations=3, success=False)
+        store.record_generation("SpecWorker", "sound", iterations=2)
+    router = ModelRouter(store, ["broken", "sound"], exploration_interval=0, default_model="broken")
+
+    assert store.stats("SpecWorker")["broken"].mean_iterations == 1.0
+    assert router.choose("SpecWorker") == "sound"
+
+
+def test_stats_files_from_before_generation_outcomes_are_migrated(tmp_path):
+    path = str(tmp_path / "stats.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE model_stats (worker TEXT NOT NULL, model TEXT NOT NULL, calls INTEGER NOT NULL DEFAULT 0, "
+            "successes INTEGER NOT NULL DEFAULT 0, total_latency REAL NOT NULL DEFAULT 0, "
+            "total_tokens INTEGER NOT NULL DEFAULT 0, generations INTEGER NOT NULL DEFAULT 0, "
+            "generation_iterations INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (worker, model))"
+        )
+        conn.execute("INSERT INTO model_stats VALUES ('SpecWorker', 'a', 4, 4, 4.0, 0, 2, 6)")
+    conn.close()
+
+    stats = ModelStatsStore(path).stats("SpecWorker")["a"]
+    assert (stats.generations, stats.generation_successes, stats.mean_iterations) == (2, 2, 3)
+
+
+def test_every_nth_choice_explores_the_least_tried_model():
+    store = ModelStatsStore(":memory:")
+    seed(store, "CodeWorker", "best", successes=10, failures=0, latency=1.0)
+    seed(store, "CodeWorker", "worse", successes=5, failures=5, latency=1.0)
+    router = ModelRouter(store, ["best", "worse", "new"], exploration_interval=3)
+
+    assert [router.choose("CodeWorker") for _ in range(6)] == ["best", "best", "new", "best", "best", "new"]
+
+
+class ModelAwareCodeWorker:
+    """Only 'good/model' writes valid code."""
+
+    async def execute(self, spec, feedback=None, model=None):
+        return GOOD_CODE if model == "good/model" else BAD_CODE
+
+
+@pytest.mark.asyncio
+async def test_director_records_routed_outcomes(tmp_path):
+    store = ModelStatsStore(str(tmp_path / "stats.sqlite3"))
+    seed(store, "CodeWorker", "good/model", successes=3, failures=0, latency=0.5)
+    seed(store, "CodeWorker", "bad/model", successes=0, failures=3, latency=0.5)
+    router = ModelRouter(store, ["good/model", "bad/model"], exploration_interval=2, default_model="good/model")
+
+    director = CadDirector(router=router)
+    director.spec_worker.backend = DeterministicBackend(responder=lambda messages: json.dumps(SPEC))
+    director.feedback_worker.backend = DeterministicBackend(responder=lambda messages: "Define size.")
+    director.code_worker = ModelAwareCodeWorker()
+
+    result = await director.generate_from_prompt("A 10 mm cube")
+
+    # First generation: the greedy pick validates at once.
+    assert result["status"] == "success"
+    assert result["iterations"] == 1
+    code_stats = store.stats("CodeWorker")
+    assert code_stats["good/model"].calls == 4
+    assert code_stats["good/model"].generations == 1
+    assert store.stats("SpecWorker")["good/model"].successes == 1
+
+    # Second generation: the 2nd code choice explores bad/model, then feedback and good/model recover.
+    result = await director.generate_from_prompt("A 10 mm cube")
+    assert result["iterations"] == 2
+    code_stats = store.stats("CodeWorker")
+    assert code_stats["bad/model"].calls == 4 and code_stats["bad/model"].successes == 0
+    assert store.stats("FeedbackWorker")["good/model"].successes == 1
+
+
+class SlowFixingCodeWorker:
+    """Bad code first, then good code after a slow call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, spec, feedback=None, model=None):
+        self.calls += 1
+        if self.calls > 1:
+            await asyncio.sleep(0.3)
+        return BAD_CODE if self.calls == 1 else GOOD_CODE
+
+
+@pytest.mark.asyncio
+async def test_feedback_latency_excludes_the_next_code_call(tmp_path):
+    store = ModelStatsStore(str(tmp_path / "stats.sqlite3"))
+    router = ModelRouter(store, ["good/model"], default_model="good/model")
+    director = CadDirector(router=router, repair_mode="feedback")
+    director.feedback_worker.backend = DeterministicBackend(responder=lambda messages: "Define size.")
+    director.code_worker = SlowFixingCodeWorker()
+
+    result = await director._generate_and_validate(SPEC)
+
+    assert result["status"] == "success"
+    feedback = store.stats("FeedbackWorker")["good/model"]
+    assert feedback.calls == 1 and feedback.successes == 1
+    assert feedback.mean_latency < 0.2
+    assert store.stats("CodeWorker")["good/model"].total_latency >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_director_records_failed_generations_against_the_spec_model(tmp_path):
+    store = ModelStatsStore(str(tmp_path / "stats.sqlite3"))
+    router = ModelRouter(store, ["bad/model"], exploration_interval=0, default_model="bad/model")
+    director = CadDirector(router=router, iteration_policy=BudgetIterationPolicy(max_iterations=2, escalation_model=""))
+    director.spec_worker.backend = DeterministicBackend(responder=lambda messages: json.dumps(SPEC))
+    director.feedback_worker.backend = DeterministicBackend(responder=lambda messages: "Define size.")
+    director.code_worker = ModelAwareCodeWorker()
+
+    result = await director.generate_from_prompt("A 10 mm cube")
+
+    assert result["status"] == "error"
+    spec_stats = store.stats("SpecWorker")["bad/model"]
+    assert spec_stats.successes == 1
+    assert (spec_stats.generations, spec_stats.generation_successes) == (1, 0)
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.pipeline import CadPipeline
+
+GOOD_CODE = "import cadquery as cq\nresult = cq.Workplane('XY').box({size}, {size}, {size})\n"
+BAD_CODE = "import cadquery as cq\nresult = cq.Workplane('XY').box(size, size, size)\n"
+
+
+class FakeSpecWorker:
+    async def execute(self, prompt, model=None):
+        await asyncio.sleep(0.05)
+        return {"part_name": prompt, "description": prompt, "cad_operations": [{"type": "base_solid"}]}
+
+
+class FakeCodeWorker:
+    def __init__(self, fail_first=()):
+        self.fail_first = set(fail_first)
+
+    async def execute(self, spec, feedback=None, model=None):
+        await asyncio.sleep(0.05)
+        if spec["part_name"] in self.fail_first and feedback is None:
+            return BAD_CODE
+        return GOOD_CODE.format(size=spec["part_name"])
+
+
+@pytest.fixture
+def make_director(make_director):
+    return lambda fail_first=(): make_director(spec_worker=FakeSpecWorker(), code_worker=FakeCodeWorker(fail_first))
+
+
+async def collect(pipeline, prompts):
+    return [job async for job in pipeline.run(prompts)]
+
+
+@pytest.mark.asyncio
+async def test_network_stages_overlap(make_director):
+    prompts = [str(size) for size in range(1, 9)]
+    pipeline = CadPipeline(make_director(), concurrency={"spec": 8, "code": 8})
+
+    start = time.perf_counter()
+    jobs = await collect(pipeline, prompts)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(job.index for job in jobs) == list(range(8))
+    assert all(job.status == "success" for job in jobs)
+    # Sequential would be 8 x (0.05 spec + 0.05 code).
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_failed_validation_goes_through_feedback(make_director):
+    director = make_director(fail_first={"3"})
+    jobs = await collect(CadPipeline(director), ["2", "3"])
+
+    by_prompt = {job.prompt: job for job in jobs}
+    assert by_prompt["2"].iterations == 1
+    assert by_prompt["3"].iterations == 2
+    assert by_prompt["3"].to_result()["status"] == "success"
+    assert director.feedback_worker.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_is_bounded(make_director):
+    pipeline = CadPipeline(make_director(), max_in_flight=2)
+    admitted = []
+    original = pipeline.director.spec_worker.execute
+
+    async def tracking(prompt):
+        admitted.append(prompt)
+        return await original(prompt)
+
+    pipeline.director.spec_worker.execute = tracking
+    iterator = pipeline.run([str(size) for size in range(1, 6)])
+    await iterator.__anext__()
+    await asyncio.sleep(0.3)
+    # One job consumed, so at most max_in_flight + 1 prompts have been admitted.
+    assert len(admitted) <= 3
+    await iterator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_exports_each_job(tmp_path, make_director):
+    jobs = await collect(CadPipeline(make_director(), output_dir=str(tmp_path)), ["1", "2"])
+    assert sorted(Path(job.outputs["step"]).name for job in jobs) == ["job_0000.step", "job_0001.step"]
+
+
+class FakeRepairWorker:
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, code, validation_result, spec, model=None):
+        self.calls += 1
+        return {"code": GOOD_CODE.format(size=spec["part_name"]), "rationale": "define size"}
+
+
+@pytest.mark.asyncio
+async def test_single_repair_mode_skips_code_stage(make_director):
+    director = make_director(fail_first={"3"})
+    director.repair_mode = "single"
+    director.repair_worker = FakeRepairWorker()
+    jobs = await collect(CadPipeline(director), ["2", "3"])
+
+    by_prompt = {job.prompt: job for job in jobs}
+    assert by_prompt["3"].iterations == 2
+    assert by_prompt["3"].to_result()["status"] == "success"
+    assert director.repair_worker.calls == 1
+    assert director.feedback_worker.calls == 0
@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.model_stats import ModelStatsStore, close_stores
+from src.director.prompt_classifier import DIRECT, SPEC, classify_prompt, direct_specification
+from src.workers.base_worker import load_prompt
+from tests.conftest import BAD_CODE, GOOD_CODE, CodeWorkerStub
+
+@pytest.fixture
+def make_director(make_director):
+    def make(direct_answers=(), code_answers=()):
+        director = make_director(*code_answers, repair_mode="feedback")
+        director.prompt_routing = True
+        director.direct_code_worker = CodeWorkerStub(*direct_answers)
+        director.route_store = ModelStatsStore(":memory:")
+        return director
+
+    return make
+
+
+@pytest.mark.parametrize("prompt", [
+    "10 mm cube with a 3 mm hole",
+    "A cylinder 20mm in diameter and 40mm tall",
+    "washer, 12 mm outer diameter, 6 mm inner, 1.5 mm thick",
+    "Rectangular plate 100x50x5 mm with filleted corners and four holes",
+])
+def test_simple_prompts_take_the_direct_route(prompt):
+    classification = classify_prompt(prompt)
+    assert classification.route == DIRECT, classification.reasons
+
+
+@pytest.mark.parametrize("prompt, reason", [
+    ("A spur gear with 20 teeth, module 2, 10 mm thick", "complex geometry: gear"),
+    ("An L-shaped bracket with two mounting holes", "complex geometry: bracket"),
+    ("A box with a cylinder on top", "several bodies: box, cylinder"),
+    ("Something to hold my keys", "no basic body named"),
+    ("A block with a hole, a slot, a chamfer and a pocket", "4 features"),
+    ("A plate. It is 10 mm thick. It has a hole. The hole is centred.", "4 sentences"),
+])
+def test_complex_prompts_keep_the_spec_route(prompt, reason):
+    classification = classify_prompt(prompt)
+    assert classification.route == SPEC
+    assert reason in classification.reasons
+
+
+def test_direct_specification_carries_the_prompt():
+    spec = direct_specification("10 mm cube with a 3 mm hole")
+    assert spec == {"part_name": "cube", "description": "10 mm cube with a 3 mm hole", "route": DIRECT}
+    assert "CadQuery" in load_prompt("direct_code_worker_prompt.txt")
+
+
+@pytest.mark.asyncio
+async def test_direct_route_skips_the_spec_worker(make_director):
+    director = make_director(direct_answers=[BAD_CODE, GOOD_CODE])
+
+    result = await director.generate_from_prompt("10 mm cube with a 3 mm hole")
+
+    assert result["status"] == "success" and result["iterations"] == 2
+    assert result["route"] == DIRECT
+    assert director.spec_worker.calls == 0 and not director.code_worker.specs
+    assert director.direct_code_worker.specs[0]["description"] == "10 mm cube with a 3 mm hole"
+    result["model"].release()
+
+    stats = director.route_store.route_stats()
+    assert list(stats) == [DIRECT]
+    assert stats[DIRECT].generations == 1 and stats[DIRECT].success_rate == 1.0
+    assert stats[DIRECT].mean_iterations == 2 and stats[DIRECT].mean_latency > 0
+
+
+@pytest.mark.asyncio
+async def test_route_stats_per_route(make_director):
+    director = make_director(code_answers=[GOOD_CODE])
+    result = await director.generate_from_prompt("A spur gear with 20 teeth")
+    assert result["route"] == SPEC and director.spec_worker.calls == 1
+    result["model"].release()
+
+    director.direct_code_worker = CodeWorkerStub(*[BAD_CODE] * 10)
+    result = await director.generate_from_prompt("10 mm cube")
+    assert result["status"] == "error" and result["route"] == DIRECT
+
+    stats = director.route_store.route_stats()
+    assert stats[SPEC].success_rate == 1.0 and stats[SPEC].mean_iterations == 1
+    assert stats[DIRECT].success_rate == 0.0 and stats[DIRECT].total_iterations > 1
+
+
+@pytest.mark.asyncio
+async def test_routing_off_keeps_the_spec_route_unrecorded(make_director):
+    director = make_director(code_answers=[GOOD_CODE])
+    director.prompt_routing = False
+
+    result = await director.generate_from_prompt("10 mm cube with a 3 mm hole")
+
+    assert result["status"] == "success" and "route" not in result
+    assert director.spec_worker.calls == 1
+    assert director.route_store.route_stats() == {}
+    result["model"].release()
+
+
+@pytest.mark.asyncio
+async def test_directors_share_one_route_store(tmp_path, monkeypatch, make_director):
+    monkeypatch.setattr("src.director.cad_director.settings.model_stats_path", str(tmp_path / "stats.sqlite3"))
+    directors = [make_director(direct_answers=[GOOD_CODE]) for _ in range(2)]
+    for director in directors:
+        director.route_store = None
+        (await director.generate_from_prompt("10 mm cube"))["model"].release()
+
+    assert directors[0].route_store is directors[1].route_store
+    assert directors[0].route_store.route_stats()[DIRECT].generations == 2
+    close_stores()
+    assert ModelStatsStore(str(tmp_path / "stats.sqlite3")).route_stats()[DIRECT].generations == 2
@@ -0,0 +1,78 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.sweep import ParameterSweep, apply_parameters, expand_grid, extract_parameters, parse_range, parse_ranges
+
+SCRIPT = """import cadquery as cq
+
+# parameters
+width = 10  # mm
+thickness = 2.0
+label = "plate"
+
+result = cq.Workplane("XY").box(width, width, thickness)
+"""
+
+
+def test_extract_parameters_only_numeric_literals():
+    assert extract_parameters(SCRIPT) == {"width": 10, "thickness": 2.0}
+
+
+def test_apply_parameters_keeps_comments():
+    code = apply_parameters(SCRIPT, {"width": 20, "thickness": 3.5})
+    assert "width = 20  # mm" in code
+    assert "thickness = 3.5\n" in code
+    assert "# parameters" in code
+    assert extract_parameters(code) == {"width": 20, "thickness": 3.5}
+
+
+def test_apply_parameters_rejects_unknown_names():
+    with pytest.raises(ValueError, match="height"):
+        apply_parameters(SCRIPT, {"height": 5})
+
+
+def test_parse_range():
+    assert parse_range("2:10:2") == [2, 4, 6, 8, 10]
+    assert parse_range("0.5:1.5:0.5") == [0.5, 1.0, 1.5]
+    assert parse_range("4,6,8") == [4, 6, 8]
+    with pytest.raises(ValueError):
+        parse_range("10:2:2")
+    assert parse_ranges(["width=1,2", "thickness=1:2:1"]) == {"width": [1, 2], "thickness": [1, 2]}
+    assert len(expand_grid({"a": [1, 2, 3], "b": [1, 2]})) == 6
+
+
+@pytest.mark.asyncio
+async def test_sweep_runs_every_variant(tmp_path):
+    with ParameterSweep(workers=2) as sweep:
+        results = [
+            result async for result in sweep.run(SCRIPT, {"width": [10, 20], "thickness": [1, 2]}, str(tmp_path))
+        ]
+
+    assert sorted(result.index for result in results) == [0, 1, 2, 3]
+    for result in results:
+        assert result.valid
+        expected = result.parameters["width"] ** 2 * result.parameters["thickness"]
+        assert result.volume == pytest.approx(expected)
+        assert Path(result.outputs["step"]).exists()
+
+    with open(tmp_path / "sweep.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["index"] for row in rows] == ["0", "1", "2", "3"]
+    assert rows[3]["width"] == "20" and rows[3]["thickness"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_sweep_flags_invalid_variants():
+    with ParameterSweep(workers=1) as sweep:
+        results = [result async for result in sweep.run(SCRIPT, {"width": [10, 0]})]
+
+    by_width = {result.parameters["width"]: result for result in results}
+    assert by_width[10].valid
+    assert not by_width[0].valid
+    assert by_width[0].error
@@ -0,0 +1,96 @@
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.batch import run_batch
+from src.director.cad_director import CadDirector
+from src.utilities.llm_client import llm_client
+from src.utilities.usage import BudgetExceededError, TokenUsage, UsageTracker
+from tests.conftest import BAD_CODE, GOOD_CODE, SPEC
+
+def mock_backend(monkeypatch, codes, usage):
+    """Answer spec requests with SPEC, code requests from ``codes`` and anything else with feedback."""
+    codes = list(codes)
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        user_prompt = json.loads(request.content)["messages"][-1]["content"]
+        if user_prompt.startswith("Generate CadQuery code"):
+            content = codes.pop(0)
+        elif "cad_operations" in user_prompt:
+            content = "Define the missing variable."
+        else:
+            content = json.dumps(SPEC)
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}], "usage": usage})
+
+    monkeypatch.setattr(llm_client, "client", httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+
+
+def test_token_usage_from_response_prices_cached_tokens():
+    usage = TokenUsage.from_response(
+        {"prompt_tokens": 1000, "completion_tokens": 500, "prompt_tokens_details": {"cached_tokens": 400}},
+        "openai/gpt-4-turbo",
+    )
+    assert usage.total_tokens == 1500
+    assert usage.cached_tokens == 400
+    assert usage.cost > 0
+
+    reported = TokenUsage.from_response({"prompt_tokens": 10, "completion_tokens": 5, "cost": 0.25}, "openai/gpt-4-turbo")
+    assert reported.cost == 0.25
+
+
+def test_tracker_raises_once_over_budget():
+    tracker = UsageTracker(max_tokens=250)
+    tracker.record("SpecWorker", "m", TokenUsage(prompt_tokens=100, completion_tokens=50))
+    with pytest.raises(BudgetExceededError):
+        tracker.record("CodeWorker", "m", TokenUsage(prompt_tokens=100, completion_tokens=50))
+
+    # The call that crossed the budget is still accounted for.
+    assert tracker.total.total_tokens == 300
+    assert set(tracker.by_worker()) == {"SpecWorker", "CodeWorker"}
+
+
+@pytest.mark.asyncio
+async def test_generation_reports_usage_per_worker(monkeypatch):
+    mock_backend(monkeypatch, [BAD_CODE, GOOD_CODE], {"prompt_tokens": 100, "completion_tokens": 20, "cost": 0.001})
+
+    result = await CadDirector().generate_from_prompt("A 10 mm cube")
+
+    assert result["status"] == "success"
+    usage = result["usage"]
+    assert usage["calls"] == 4
+    assert usage["total"]["total_tokens"] == 480
+    assert usage["total"]["cost"] == pytest.approx(0.004)
+    assert usage["by_worker"]["CodeWorker"]["total_tokens"] == 240
+
+
+@pytest.mark.asyncio
+async def test_hard_budget_aborts_generation(monkeypatch):
+    mock_backend(monkeypatch, [BAD_CODE] * 5, {"prompt_tokens": 100, "completion_tokens": 20, "cost": 0.001})
+    monkeypatch.setattr("src.utilities.usage.settings.cost_budget", 0.0025)
+
+    result = await CadDirector().generate_from_prompt("A 10 mm cube")
+
+    assert result["status"] == "error"
+    assert "Cost budget exceeded" in result["message"]
+    assert result["usage"]["calls"] == 3
+    assert result["specification"] == SPEC
+
+
+@pytest.mark.asyncio
+async def test_batch_manifest_has_usage_totals(monkeypatch, tmp_path):
+    mock_backend(monkeypatch, [GOOD_CODE, GOOD_CODE], {"prompt_tokens": 50, "completion_tokens": 10, "cost": 0.002})
+
+    manifest = await run_batch(["first cube", "second cube"], str(tmp_path), export_format="stl")
+
+    assert manifest["succeeded"] == 2
+    assert manifest["usage"]["total_tokens"] == 240
+    assert manifest["usage"]["cost"] == pytest.approx(0.008)
+    assert [job["usage"]["calls"] for job in manifest["jobs"]] == [2, 2]
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert all(Path(job["outputs"]["stl"]).exists() for job in manifest["jobs"])
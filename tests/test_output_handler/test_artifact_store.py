@@ -0,0 +1,91 @@
+import os
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler import shape_io
+from src.output_handler.artifact_store import ArtifactStore, default_store
+from src.output_handler.exporter import export_model, export_model_with_name
+
+
+def bracket(width=40):
+    return cq.Workplane("XY").box(width, 20, 5).faces(">Z").workplane().hole(6).edges("|Z").fillet(2)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.output_handler.artifact_store.settings.artifact_store", True)
+    monkeypatch.setattr("src.output_handler.artifact_store.settings.artifact_store_dir", str(tmp_path / "store"))
+    return default_store()
+
+
+def test_digest_is_stable_and_ignores_meshes(tmp_path):
+    model = bracket()
+    digest = shape_io.digest(model)
+    assert shape_io.digest(bracket()) == digest
+
+    model.val().exportStl(str(tmp_path / "meshed.stl"))
+    assert shape_io.digest(model) == digest
+    assert shape_io.digest(bracket().translate((1, 0, 0))) != digest
+    assert shape_io.digest(bracket(41)) != digest
+
+
+def test_identical_models_are_stored_once(store, tmp_path):
+    first = export_model_with_name(bracket(), str(tmp_path / "job_a"), "part")
+    second = export_model_with_name(bracket(), str(tmp_path / "job_b"), "part")
+
+    assert store.writes == 1 and store.reuses == 1
+    assert os.path.samefile(first, second)
+    assert cq.importers.importStep(second).val().isValid()
+    assert os.path.samefile(store.lookup(str((tmp_path / "job_a" / "part").resolve()))["step"], first)
+
+
+def test_reexporting_an_unchanged_job_writes_nothing(store, tmp_path):
+    path = Path(export_model_with_name(bracket(), str(tmp_path), "part", job="catalog/part"))
+    mtime = path.stat().st_mtime_ns
+    index_size = store.index_path.stat().st_size
+
+    export_model_with_name(bracket(), str(tmp_path), "part", job="catalog/part")
+    assert store.writes == 1
+    assert path.stat().st_mtime_ns == mtime
+    assert store.index_path.stat().st_size == index_size
+
+    # A changed model replaces the job's artifact and output file
+    export_model_with_name(bracket(50), str(tmp_path), "part", job="catalog/part")
+    assert store.writes == 2
+    assert store.lookup("catalog/part")["step"].stem == shape_io.digest(bracket(50))
+    assert os.path.samefile(path, store.lookup("catalog/part")["step"])
+
+
+def test_index_survives_reload_and_compacts(store):
+    for width in range(30, 60):
+        store.record("catalog/part", "step", shape_io.digest(bracket(width)))
+        store.record("catalog/part", "stl", "same")
+    for index in range(200):
+        store.record(f"job_{index}", "step", "x")
+
+    reloaded = ArtifactStore(str(store.directory))
+    assert reloaded._index["catalog/part"] == {"step": shape_io.digest(bracket(59)), "stl": "same"}
+
+    store.record("catalog/part", "step", "y")
+    for width in range(300):
+        store.record("churn", "step", str(width))
+    lines = len(store.index_path.read_text().splitlines())
+    compacted = ArtifactStore(str(store.directory))
+    assert len(compacted.index_path.read_text().splitlines()) < lines
+    assert compacted._index["catalog/part"]["step"] == "y"
+    assert compacted._index["churn"]["step"] == "299"
+
+
+def test_content_names_do_not_collide(tmp_path):
+    # Store disabled: export_model still names files by content, so exports in the same second are kept apart.
+    first = export_model(bracket(), str(tmp_path))
+    second = export_model(bracket(41), str(tmp_path))
+    assert first != second
+    assert Path(first).exists() and Path(second).exists()
+    assert export_model(bracket(), str(tmp_path)) == first
@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler.exporter import export_bodies, export_model_with_name, model_bodies
+from src.output_handler.postprocess import PostProcessor
+
+
+def three_bodies():
+    """A compound of two disjoint solids on the stack next to a separate solid."""
+    pair = cq.Workplane("XY").box(10, 10, 10).union(cq.Workplane("XY").box(2, 2, 2).translate((20, 0, 0)))
+    return pair.add(cq.Workplane("XY").sphere(3).translate((0, 30, 0)).val())
+
+
+def test_model_bodies_expands_compounds():
+    bodies = model_bodies(three_bodies())
+    assert len(bodies) == 3
+    assert all(body.ShapeType() == "Solid" for body in bodies)
+
+
+@pytest.mark.parametrize("fmt", ["step", "stl"])
+def test_merged_export_keeps_every_body(tmp_path, fmt):
+    path = export_model_with_name(three_bodies(), str(tmp_path), "merged", format=fmt)
+    if fmt == "step":
+        assert len(cq.importers.importStep(path).val().Solids()) == 3
+    else:
+        assert Path(path).stat().st_size > 0
+
+
+@pytest.mark.parametrize("fmt", ["step", "stl"])
+def test_export_bodies_writes_files_and_manifest(tmp_path, fmt):
+    manifest = export_bodies(three_bodies(), str(tmp_path), "part", format=fmt, max_workers=3)
+
+    assert manifest["body_count"] == 3
+    assert json.loads(Path(manifest["manifest"]).read_text()) == {k: v for k, v in manifest.items() if k != "manifest"}
+    assert [body["file"] for body in manifest["bodies"]] == [f"part_body_{i:03d}.{fmt}" for i in range(3)]
+    for body in manifest["bodies"]:
+        assert (tmp_path / body["file"]).stat().st_size > 0
+    volumes = sorted(body["volume"] for body in manifest["bodies"])
+    assert volumes[0] == pytest.approx(8)
+    assert volumes[2] == pytest.approx(1000)
+    assert manifest["volume"] == pytest.approx(sum(volumes))
+    small = next(body for body in manifest["bodies"] if body["volume"] == pytest.approx(8))
+    assert small["bbox"] == pytest.approx([19, -1, -1, 21, 1, 1], abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_postprocessor_split_bodies(tmp_path):
+    results = await PostProcessor().run(three_bodies(), output_dir=str(tmp_path), formats=["step"], name="part", split_bodies=True)
+
+    result = results["export_step"]
+    assert result.success
+    assert result.output["body_count"] == 3
+    assert len(list(tmp_path.glob("part_body_*.step"))) == 3
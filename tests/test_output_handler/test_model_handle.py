@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler.model_handle import ModelHandle, ModelReleasedError
+
+
+def test_spill_and_reload(tmp_path):
+    model = cq.Workplane("XY").box(10, 20, 30).edges("|Z").fillet(2)
+    volume = model.val().Volume()
+    handle = ModelHandle(model, spill_dir=str(tmp_path))
+    del model
+
+    path = handle.spill()
+    assert handle.state == "spilled"
+    assert Path(path).parent == tmp_path and Path(path).stat().st_size > 0
+
+    reloaded = handle.get()
+    assert handle.state == "live"
+    assert reloaded.val().Volume() == pytest.approx(volume)
+    # Spilling again reuses the file.
+    assert handle.spill() == path
+
+
+def test_multi_object_workplanes_round_trip(tmp_path):
+    model = cq.Workplane("XY").pushPoints([(0, 0), (20, 0)]).box(5, 5, 5, combine=False)
+    handle = ModelHandle(model, spill_dir=str(tmp_path))
+
+    handle.spill()
+
+    assert len(handle.get().vals()) == 2
+
+
+def test_release_deletes_spill_file(tmp_path):
+    with ModelHandle(cq.Workplane("XY").box(1, 1, 1), spill_dir=str(tmp_path)) as handle:
+        path = handle.spill()
+
+    assert handle.state == "released"
+    assert not Path(path).exists()
+    with pytest.raises(ModelReleasedError):
+        handle.get()
+    handle.release()
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler import postprocess
+from src.output_handler.postprocess import PostProcessor, copy_model
+
+
+def make_model():
+    return cq.Workplane("XY").box(10, 10, 10).edges("|Z").fillet(1)
+
+
+def slow_export(delay):
+    def export(model, output_dir, name=None, format="step"):
+        time.sleep(delay)
+        return str(Path(output_dir) / f"{name or 'model'}.{format}")
+    return export
+
+
+@pytest.mark.asyncio
+async def test_export_does_not_wait_for_the_viewer(tmp_path, monkeypatch):
+    exported = threading.Event()
+
+    def viewer(model, screenshot_path=None):
+        # Stays "open" until the export has finished, or gives up.
+        assert exported.wait(timeout=5), "export waited for the viewer"
+
+    monkeypatch.setattr(postprocess.visualizer, "visualize_model", viewer)
+
+    def on_done(result):
+        if result.task == "export_step" and result.success:
+            exported.set()
+
+    results = await PostProcessor().run(make_model(), str(tmp_path), name="part", view=True, on_done=on_done)
+
+    assert results["export_step"].success
+    assert Path(results["export_step"].output).exists()
+    assert results["view"].success
+
+
+@pytest.mark.asyncio
+async def test_offscreen_render_is_not_concurrent_with_the_viewer(tmp_path, monkeypatch):
+    calls = []
+
+    def render(model, images):
+        calls.append(("render", threading.current_thread()))
+        return {path: path for path in images}
+
+    def viewer(model, screenshot_path=None):
+        calls.append(("view", threading.current_thread()))
+
+    monkeypatch.setattr(postprocess.visualizer, "render_offscreen", render)
+    monkeypatch.setattr(postprocess.visualizer, "visualize_model", viewer)
+
+    results = await PostProcessor().run(make_model(), None, thumbnail=str(tmp_path / "t.png"), view=True)
+
+    assert results["render"].success and results["view"].success
+    assert [task for task, _ in calls] == ["render", "view"]
+    assert {thread for _, thread in calls} == {threading.main_thread()}
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setattr(postprocess, "export_model", slow_export(0.3))
+
+    def render(model, images):
+        time.sleep(0.3)
+        return {path: path for path in images}
+
+    monkeypatch.setattr(postprocess.visualizer, "render_offscreen", render)
+
+    start = time.perf_counter()
+    results = await PostProcessor().run(
+        make_model(), str(tmp_path), formats=("step", "stl"),
+        thumbnail=str(tmp_path / "thumb.png"), screenshot=str(tmp_path / "shot.png"),
+    )
+    elapsed = time.perf_counter() - start
+
+    assert set(results) == {"export_step", "export_stl", "render"}
+    assert all(result.success for result in results.values())
+    # Sequential would be 0.9 s.
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_a_failing_task_does_not_fail_the_others(tmp_path, monkeypatch):
+    monkeypatch.setattr(postprocess.visualizer, "render_offscreen", lambda model, images: {})
+
+    results = await PostProcessor().run(make_model(), str(tmp_path), name="part", thumbnail=str(tmp_path / "t.png"))
+
+    assert results["export_step"].success
+    assert not results["render"].success
+    assert "t.png" in results["render"].error
+
+
+def test_tasks_get_independent_shapes():
+    model = make_model()
+    copy = copy_model(model)
+
+    assert copy.val() is not model.val()
+    assert not copy.val().wrapped.IsSame(model.val().wrapped)
+    assert copy.val().Volume() == pytest.approx(model.val().Volume())
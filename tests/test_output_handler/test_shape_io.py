@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output_handler import shape_io
+from src.output_handler.shape_io import ShapeIOError
+
+
+def bracket():
+    return cq.Workplane("XY").box(40, 20, 5).faces(">Z").workplane().hole(6).edges("|Z").fillet(2)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip_preserves_geometry(compress):
+    model = bracket()
+    data = shape_io.dumps(model, compress=compress)
+    restored = shape_io.loads(data)
+
+    assert type(restored) is type(model.val())
+    assert restored.Volume() == pytest.approx(model.val().Volume())
+    assert len(restored.Faces()) == len(model.val().Faces())
+
+
+def test_header_is_readable_without_decoding():
+    view = shape_io.dumps_view(bracket(), compress=True)
+    header = shape_io.read_header(view)
+
+    assert isinstance(view, memoryview)
+    assert header.shape_type == bracket().val().ShapeType()
+    assert header.solid_count == 1
+    assert header.compressed
+    assert header.bbox == pytest.approx([-20, -10, -2.5, 20, 10, 2.5], abs=1e-3)
+    assert header.volume == pytest.approx(bracket().val().Volume())
+
+
+def test_multi_solid_workplane_round_trips_as_compound(tmp_path):
+    pins = cq.Workplane("XY").rarray(10, 10, 3, 1).circle(2).extrude(5)
+    path = shape_io.dump(pins, tmp_path / "pins.shape", metadata=False)
+
+    assert shape_io.read_header(Path(path).read_bytes()).volume is None
+    assert shape_io.load_workplane(Path(path).read_bytes()).solids().size() == 3
+
+
+def test_rejects_foreign_and_truncated_data():
+    data = shape_io.dumps(bracket())
+    with pytest.raises(ShapeIOError, match="bad magic"):
+        shape_io.loads(b"ISO-10303-21;" + data)
+    with pytest.raises(ShapeIOError, match="Truncated"):
+        shape_io.loads(data[:-10])
@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.director.iteration_policy import BudgetIterationPolicy
+from src.utilities.code_normalizer import normalize_code
+
+CLEAN = 'import cadquery as cq\n\nresult = cq.Workplane("XY").box(10, 10, 2)\n'
+
+
+def test_clean_code_is_untouched():
+    normalized = normalize_code(CLEAN)
+    assert normalized.code == CLEAN
+    assert not normalized.changed
+
+
+def test_fenced_code_with_prose_is_extracted():
+    text = f"Here is the CadQuery code for the plate:\n\n```python\n{CLEAN}```\n\nThis creates a 10 x 10 plate."
+    normalized = normalize_code(text)
+    assert normalized.code == CLEAN
+    assert normalized.fixes == ["extracted the code from a markdown fence"]
+
+
+def test_unfenced_prose_lines_are_removed():
+    text = f"Sure! Here's the code you asked for:\n{CLEAN}\nThe result is a thin plate."
+    normalized = normalize_code(text)
+    assert normalized.code == CLEAN
+    assert normalized.fixes == ["removed 2 lines of text around the code"]
+
+
+def test_missing_imports_are_added():
+    normalized = normalize_code('result = cq.Workplane("XY").box(10, 10, math.sqrt(4))\n')
+    assert normalized.code.splitlines()[:2] == ["import cadquery as cq", "import math"]
+    assert normalized.fixes == ["added 'import cadquery as cq'", "added 'import math'"]
+
+
+def test_last_workplane_assignment_is_bound_to_result():
+    code = (
+        "import cadquery as cq\n"
+        "width = 10\n"
+        "base = cq.Workplane('XY').box(width, width, 2)\n"
+        "part = (base.faces('>Z').workplane()\n"
+        "    .hole(3))\n"
+        "show_object(part)\n"
+    )
+    normalized = normalize_code(code)
+    assert normalized.code.endswith("\nresult = part\n")
+    assert normalized.fixes == ["bound 'result' to the last Workplane assignment 'part'"]
+
+
+def test_genuine_syntax_errors_are_left_for_validation():
+    code = "import cadquery as cq\nresult = cq.Workplane().box(1, 1, 1).fillet(\n"
+    normalized = normalize_code(code)
+    assert normalized.code == code
+    assert not normalized.changed
+
+
+class FencedCodeWorker:
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, spec, feedback=None, model=None):
+        self.calls += 1
+        return "```python\nimport cadquery as cq\npart = cq.Workplane().box(1, 1, 1)\n```"
+
+
+@pytest.mark.asyncio
+async def test_director_validates_normalised_code_first_time():
+    director = CadDirector(iteration_policy=BudgetIterationPolicy(max_iterations=3, escalation_model=""))
+    director.code_normalization = True
+    director.code_worker = FencedCodeWorker()
+
+    result = await director._generate_and_validate({"part_name": "cube"})
+
+    assert result["status"] == "success"
+    assert result["iterations"] == 1
+    assert director.code_worker.calls == 1
+    assert result["code_fixes"] == [
+        "extracted the code from a markdown fence",
+        "bound 'result' to the last Workplane assignment 'part'",
+    ]
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers.incremental_executor import IncrementalExecutor
+from src.workers.validation_worker import ValidationWorker
+
+BASE = """import cadquery as cq
+length = 40.0
+body = cq.Workplane("XY").box(length, 20, 10).faces(">Z").shell(-1)
+"""
+
+
+def run(executor, code):
+    return executor.run(code, {"cq": cq, "show_object": lambda x: None})
+
+
+def test_retry_resumes_after_shared_prefix():
+    executor = IncrementalExecutor()
+    first = run(executor, BASE + "result = body.edges('|Z').fillet(2)\n")
+    assert executor.last_resumed_at == 0
+
+    # Comment and whitespace edits in the prefix must not defeat the cache.
+    second = run(executor, "# repaired\n" + BASE.replace("40.0", "40.0  ") + "result = body.edges('|Z').fillet(1)\n")
+    assert executor.last_resumed_at == 3
+    assert executor.last_statement_count == 4
+
+    scratch = run(IncrementalExecutor(), BASE + "result = body.edges('|Z').fillet(1)\n")
+    assert second["result"].val().Volume() == pytest.approx(scratch["result"].val().Volume())
+    assert first["result"].val().Volume() != pytest.approx(second["result"].val().Volume())
+
+
+def test_pending_wires_are_not_shared_between_runs():
+    executor = IncrementalExecutor()
+    prefix = "import cadquery as cq\nr = cq.Workplane('XY').lineTo(1, 0).lineTo(1, 1)\n"
+    first = run(executor, prefix + "result = r.close().extrude(1)\n")
+    second = run(executor, prefix + "result = r.close().extrude(2)\n")
+
+    assert executor.last_resumed_at == 2
+    assert first["result"].val().Volume() == pytest.approx(0.5)
+    assert second["result"].val().Volume() == pytest.approx(1.0)
+
+
+def test_script_functions_see_restored_namespace():
+    executor = IncrementalExecutor()
+    prefix = "import cadquery as cq\nsize = 2\ndef make():\n    return cq.Workplane().box(size, size, size)\n"
+    run(executor, prefix + "result = make()\n")
+    second = run(executor, prefix + "size = 3\nresult = make()\n")
+
+    assert executor.last_resumed_at == 3
+    assert second["result"].val().Volume() == pytest.approx(27)
+
+
+def test_shapes_moved_in_place_do_not_poison_the_checkpoint():
+    executor = IncrementalExecutor()
+    prefix = "import cadquery as cq\ns = cq.Solid.makeBox(1, 1, 1)\n"
+    run(executor, prefix + "s.move(cq.Location(cq.Vector(5, 0, 0)))\nresult = s\n")
+    second = run(executor, prefix + "result = s\n")
+
+    assert executor.last_resumed_at == 2
+    assert second["result"].Center().x == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_validation_worker_reports_failures_in_changed_suffix():
+    worker = ValidationWorker(incremental=True)
+    assert (await worker.execute(BASE + "result = body\n"))["success"]
+
+    outcome = await worker.execute(BASE + "result = body.edges('|Z').fillet(50)\n")
+    assert not outcome["success"]
+    assert worker.executor.last_resumed_at == 3
+
+
+def test_validation_with_a_timeout_keeps_using_checkpoints():
+    worker = ValidationWorker(incremental=True, cache=False, profile=False)
+    assert worker.validate(BASE + "result = body\n", timeout=30)["success"]
+
+    outcome = worker.validate(BASE + "result = body.edges('|Z').fillet(2)\n", timeout=30)
+    assert outcome["success"]
+    assert worker.executor.last_resumed_at == 3
+
+
+def test_timeout_stops_loops_in_process():
+    worker = ValidationWorker(incremental=True, cache=False, profile=False)
+    # A script's own ``except Exception`` must not swallow the timeout.
+    code = "import cadquery as cq\ntry:\n    while True:\n        pass\nexcept Exception:\n    pass\nresult = cq.Workplane().box(1, 1, 1)\n"
+
+    outcome = worker.validate(code, timeout=0.3)
+
+    assert not outcome["success"] and outcome["timed_out"]
+    assert "timed out" in outcome["error"]
+
+
+def test_full_execution_functions_see_script_globals():
+    worker = ValidationWorker(incremental=False, cache=False)
+    code = "import cadquery as cq\nsize = 2\ndef make():\n    return cq.Workplane().box(size, size, size)\nresult = make()\n"
+
+    outcome = worker.validate(code)
+
+    assert outcome["success"], outcome.get("error")
+    assert outcome["object"].val().Volume() == pytest.approx(8)
@@ -0,0 +1,80 @@
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.cad_director import CadDirector
+from src.utilities import llm_backends
+from src.utilities.llm_backends import DeterministicBackend, get_backend, register_backend
+from src.utilities.llm_client import llm_client, LocalLLMClient
+from src.workers.code_worker import CodeWorker
+from src.workers.feedback_worker import FeedbackWorker
+from src.workers.spec_worker import SpecWorker
+
+SPEC = {
+    "part_name": "Cube",
+    "description": "A 10 mm cube.",
+    "cad_operations": [{"type": "base_solid", "shape": "box", "parameters": {"length": 10, "width": 10, "height": 10}}],
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(llm_backends, "_instances", {})
+
+
+def test_backend_is_selected_per_worker(monkeypatch):
+    monkeypatch.setattr("src.utilities.llm_backends.settings.feedback_worker_backend", "local")
+
+    assert isinstance(FeedbackWorker().backend, LocalLLMClient)
+    assert CodeWorker().backend is llm_client
+    assert SpecWorker(backend="deterministic").backend is get_backend("deterministic")
+
+
+@pytest.mark.asyncio
+async def test_director_runs_offline_on_deterministic_backend(monkeypatch):
+    monkeypatch.setattr("src.utilities.llm_backends.settings.llm_backend", "deterministic")
+    backend = DeterministicBackend(responses=[
+        json.dumps(SPEC),
+        "import cadquery as cq\nresult = cq.Workplane('XY').box(size, 10, 10)\n",
+        "Define size before using it.",
+        "import cadquery as cq\nresult = cq.Workplane('XY').box(10, 10, 10)\n",
+    ])
+    register_backend("deterministic", backend)
+
+    result = await CadDirector().generate_from_prompt("A 10 mm cube")
+
+    assert result["status"] == "success"
+    assert result["iterations"] == 2
+    assert len(backend.calls) == 4
+    assert result["usage"]["calls"] == 4
+    assert result["usage"]["total"]["cost"] == 0
+    # The deterministic backend does not advertise structured output.
+    assert backend.calls[0]["response_format"] is None
+
+
+@pytest.mark.asyncio
+async def test_local_client_talks_to_local_server():
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = {"choices": [{"message": {"content": "Check the fillet radius."}}],
+                "usage": {"prompt_tokens": 200, "completion_tokens": 10}}
+        return httpx.Response(200, json=body)
+
+    backend = LocalLLMClient()
+    backend.client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    content, usage = await backend.chat_completion_with_usage([{"role": "user", "content": "why?"}])
+
+    assert content == "Check the fillet radius."
+    assert str(requests[0].url) == "http://localhost:8080/v1/chat/completions"
+    assert "authorization" not in requests[0].headers
+    assert json.loads(requests[0].content)["model"] == "local-model"
+    assert usage.total_tokens == 210
+    assert usage.cost == 0
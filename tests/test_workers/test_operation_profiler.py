@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers.operation_profiler import OperationProfiler
+from src.workers.validation_worker import ValidationWorker
+
+CODE = """import cadquery as cq
+plate = cq.Workplane("XY").box(60, 40, 8)
+for size in (3, 4, 5):
+    plate = plate.faces(">Z").workplane().hole(size)
+profile = cq.Sketch().rect(10, 10).vertices().fillet(2)
+result = plate.edges("|Z").fillet(3)
+"""
+
+
+def run(code):
+    with OperationProfiler("<generated>") as profiler:
+        exec(compile(code, "<generated>", "exec"), {"cq": cq})
+    return profiler.profile
+
+
+def test_operations_are_aggregated_per_line():
+    profile = run(CODE)
+    by_key = {(stats.line, stats.operation): stats for stats in profile.operations}
+
+    assert by_key[(2, "Workplane.box")].calls == 1
+    assert by_key[(2, "Workplane.box")].faces == 6
+    assert by_key[(4, "Workplane.hole")].calls == 3
+    assert (5, "Sketch.fillet") in by_key
+    fillet = by_key[(6, "Workplane.fillet")]
+    # Concentric holes replace each other: 6 box faces + 1 bore + 4 rounds.
+    assert fillet.faces == 11 and fillet.edges > 12
+    assert profile.slowest(1)[0].total_time == max(stats.total_time for stats in profile.operations)
+
+
+def test_folded_stacks_nest_internal_calls():
+    folded = run(CODE).to_folded()
+    lines = folded.splitlines()
+
+    assert all(line.startswith("script;") and line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    # Work that hole() delegates to other Workplane methods shows up under its script line.
+    assert any(line.startswith("script;line 4: Workplane.hole;Workplane.") for line in lines)
+
+
+def test_patches_are_removed_and_other_threads_unaffected():
+    original = cq.Workplane.box
+    with OperationProfiler():
+        assert cq.Workplane.box is not original
+    assert cq.Workplane.box is original
+
+    with pytest.raises(RuntimeError):
+        with OperationProfiler():
+            with OperationProfiler():
+                pass
+    assert cq.Workplane.box is original
+
+
+def test_failing_script_still_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.workers.validation_worker.settings.validation_profile_dir", str(tmp_path))
+    monkeypatch.setattr("src.workers.validation_worker.settings.slow_operation_seconds", 0.0)
+    worker = ValidationWorker(incremental=False, cache=False, profile=True)
+
+    result = worker.validate(CODE + "result = result.edges('>Z').fillet(50)\n")
+
+    assert result["success"] is False
+    assert any(operation["line"] == 7 and operation["operation"] == "Workplane.fillet" for operation in result["profile"]["operations"])
+    assert "line 7: Workplane.fillet" in result["slow_operations"]
+    assert Path(result["profile_path"]).read_text().startswith("script;")
+
+
+def test_validation_attaches_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.workers.validation_worker.settings.validation_profile_dir", str(tmp_path))
+    worker = ValidationWorker(incremental=False, cache=False, profile=True)
+
+    result = worker.validate(CODE)
+
+    assert result["success"] is True
+    assert result["profile"]["operations"][0]["total_time"] >= result["profile"]["operations"][-1]["total_time"]
+    assert result["slow_operations"] is None
+    assert Path(result["profile_path"]).parent == tmp_path
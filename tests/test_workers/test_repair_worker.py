@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.director.iteration_policy import BudgetIterationPolicy
+from src.utilities.llm_backends import DeterministicBackend
+from src.workers.repair_worker import RepairWorker
+from tests.conftest import BAD_CODE, GOOD_CODE, SPEC
+
+def test_parse_response_splits_rationale_and_code():
+    repair = RepairWorker.parse_response(f"RATIONALE: The size was never defined.\n{GOOD_CODE}")
+    assert repair == {"code": GOOD_CODE, "rationale": "The size was never defined."}
+
+
+def test_parse_response_drops_fences_and_allows_no_rationale():
+    repair = RepairWorker.parse_response(f"```python\n{GOOD_CODE}```")
+    assert repair == {"code": GOOD_CODE, "rationale": None}
+
+
+@pytest.mark.asyncio
+async def test_repair_prompt_carries_code_and_error():
+    backend = DeterministicBackend([f"RATIONALE: define the size\n{GOOD_CODE}"])
+    worker = RepairWorker(backend=backend)
+
+    repair = await worker.execute(BAD_CODE, {"success": False, "error": "name 'size' is not defined"}, SPEC)
+
+    assert repair["code"] == GOOD_CODE
+    prompt = backend.calls[0]["messages"][1]["content"]
+    assert "name 'size' is not defined" in prompt
+    assert BAD_CODE in prompt
+    assert '"part_name": "Cube"' in prompt
+
+
+class FailingFeedbackWorker:
+    async def execute(self, code, validation_result, spec, model=None):
+        raise AssertionError("feedback is not used in single repair mode")
+
+
+@pytest.mark.asyncio
+async def test_single_repair_mode_validates_repaired_code_directly(make_director):
+    policy = BudgetIterationPolicy(max_iterations=3, escalation_model="")
+    director = make_director(BAD_CODE, iteration_policy=policy, repair_mode="single")
+    director.feedback_worker = FailingFeedbackWorker()
+    backend = DeterministicBackend([f"RATIONALE: define the size\n{GOOD_CODE}"])
+    director.repair_worker = RepairWorker(backend=backend)
+
+    result = await director._generate_and_validate(SPEC)
+
+    assert result["status"] == "success"
+    assert result["code"] == GOOD_CODE
+    assert result["iterations"] == 2
+    # One code call and one repair call, instead of code + feedback + code.
+    assert len(director.code_worker.specs) == 1
+    assert len(backend.calls) == 1
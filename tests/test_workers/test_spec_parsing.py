@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utilities.json_extractor import extract_json_object, JSONExtractionError
+from src.workers.spec_worker import SpecWorker
+
+CORPUS = yaml.safe_load(
+    (project_root / "benchmarks" / "corpus" / "spec_responses.yaml").read_text(encoding="utf-8")
+)
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[e["name"] for e in CORPUS])
+def test_corpus(entry):
+    if entry["expect"] == "valid":
+        spec = extract_json_object(entry["response"])
+        assert spec["part_name"]
+        assert spec["cad_operations"]
+    else:
+        with pytest.raises(JSONExtractionError):
+            extract_json_object(entry["response"])
+
+
+def test_repairs_python_literals_and_trailing_commas():
+    spec = extract_json_object("{'a': True, 'b': None, 'c': [1, 2,],}")
+    assert spec == {"a": True, "b": None, "c": [1, 2]}
+
+
+def test_strings_are_left_untouched():
+    text = '{"selector": "edges(\\"|Z\\")", "note": "True // not a comment, {x}"}'
+    assert extract_json_object(text) == {"selector": 'edges("|Z")', "note": "True // not a comment, {x}"}
+
+
+def test_single_quoted_string_with_double_quotes():
+    assert extract_json_object("{'selector': 'edges(\"|Z\")'}") == {"selector": 'edges("|Z")'}
+
+
+def test_outermost_object_is_returned():
+    spec = extract_json_object('Result: {"outer": {"inner": 1}} and {"other": 2}')
+    assert spec == {"outer": {"inner": 1}}
+
+
+def test_spec_worker_rejects_missing_keys():
+    worker = SpecWorker()
+    with pytest.raises(ValueError, match="cad_operations"):
+        worker._parse_json_response('Here you go: {"part_name": "x", "description": "y"}')
@@ -0,0 +1,97 @@
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.openrouter_models import OpenRouterModel
+from src.utilities.llm_client import llm_client
+from src.workers.spec_schema import validate_spec, SpecValidationError, SPEC_JSON_SCHEMA
+from src.workers.spec_worker import SpecWorker
+
+VALID_SPEC = {
+    "part_name": "Plate",
+    "description": "A 40 x 20 x 5 mm plate.",
+    "cad_operations": [
+        {"type": "base_solid", "shape": "box", "parameters": {"length": 40, "height": 20, "thickness": 5}},
+        {"type": "revolve", "angle": 90},
+    ],
+}
+
+
+def mock_backend(monkeypatch, handler):
+    """Route the shared client to an in-process OpenAI-compatible mock."""
+    requests = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        return handler(payload)
+
+    monkeypatch.setattr(llm_client, "client", httpx.AsyncClient(transport=httpx.MockTransport(record)))
+    return requests
+
+
+def completion(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}], "usage": {}})
+
+
+def test_schema_reports_precise_paths():
+    spec = {
+        "part_name": "Bracket",
+        "description": "d",
+        "cad_operations": [
+            {"type": "cut_extrude",
+             "workplane": {"origin": [0, 0], "x_direction": [1, 0, 0], "normal": [0, 0, 1]},
+             "sketch": [{"type": "circle", "parameters": {"radius": 1}}],
+             "extrude": {"distance": -1}},
+        ],
+    }
+    with pytest.raises(SpecValidationError) as exc:
+        validate_spec(spec)
+    assert exc.value.errors == [
+        "cad_operations[0].workplane.origin: List should have at least 3 items after validation, not 2"
+    ]
+
+
+def test_unknown_operation_types_are_accepted():
+    assert validate_spec(VALID_SPEC).cad_operations[1].type == "revolve"
+
+
+@pytest.mark.asyncio
+async def test_structured_output_requested_for_capable_model(monkeypatch):
+    requests = mock_backend(monkeypatch, lambda payload: completion(json.dumps(VALID_SPEC)))
+
+    spec = await SpecWorker(model=OpenRouterModel.GOOGLE_GEMINI_FLASH).execute("a plate")
+
+    assert spec == VALID_SPEC
+    assert requests[0]["response_format"]["json_schema"]["schema"] == SPEC_JSON_SCHEMA
+
+
+@pytest.mark.asyncio
+async def test_plain_request_for_other_models(monkeypatch):
+    requests = mock_backend(monkeypatch, lambda payload: completion("Sure:\n" + json.dumps(VALID_SPEC)))
+
+    spec = await SpecWorker(model=OpenRouterModel.MISTRAL_7B_INSTRUCT).execute("a plate")
+
+    assert spec["part_name"] == "Plate"
+    assert "response_format" not in requests[0]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_backend_rejects_schema(monkeypatch):
+    def handler(payload):
+        if "response_format" in payload:
+            return httpx.Response(400, json={"error": "response_format not supported"})
+        return completion(json.dumps(VALID_SPEC))
+
+    requests = mock_backend(monkeypatch, handler)
+
+    spec = await SpecWorker(model=OpenRouterModel.OPENAI_GPT_OSS).execute("a plate")
+
+    assert spec["part_name"] == "Plate"
+    assert len(requests) == 2
@@ -0,0 +1,103 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.workers import validation_cache
+from src.workers.validation_cache import ValidationCache, code_key
+from src.workers.validation_worker import ValidationWorker
+
+CODE = """import cadquery as cq
+plate = cq.Workplane("XY").box(60, 40, 8)
+plate = plate.faces(">Z").workplane().rarray(40, 20, 2, 2).hole(5)
+result = plate.edges("|Z").fillet(3)
+"""
+
+REFORMATTED = """import cadquery as cq
+
+# Mounting plate
+plate = cq.Workplane('XY').box(60, 40, 8)
+plate = plate.faces('>Z').workplane().rarray(40, 20, 2, 2).hole(5)   # four holes
+result = plate.edges('|Z').fillet(3)
+"""
+
+
+def test_key_ignores_comments_and_formatting():
+    assert code_key(CODE) == code_key(REFORMATTED)
+    assert code_key(CODE) != code_key(CODE.replace("hole(5)", "hole(6)"))
+
+
+def test_key_changes_with_cadquery_or_validator_version(monkeypatch):
+    key = code_key(CODE)
+    monkeypatch.setattr(validation_cache, "_ENVIRONMENT", validation_cache._ENVIRONMENT.replace("validator=", "validator=0"))
+    assert code_key(CODE) != key
+
+
+def test_repeat_validation_is_served_from_brep(tmp_path):
+    worker = ValidationWorker(incremental=False, cache=ValidationCache(str(tmp_path), 10 * 1024 * 1024))
+
+    start = time.perf_counter()
+    first = worker.validate(CODE)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    second = worker.validate(REFORMATTED)
+    warm = time.perf_counter() - start
+
+    assert first["success"] and second["success"]
+    assert worker.cache.hits == 1
+    assert second["object"].val().Volume() == pytest.approx(first["object"].val().Volume())
+    assert warm < cold
+
+
+def test_failures_are_cached_with_their_message(tmp_path):
+    worker = ValidationWorker(incremental=False, cache=ValidationCache(str(tmp_path), 10 * 1024 * 1024))
+    bad = "import cadquery as cq\nresult = cq.Workplane('XY').box(size, 1, 1)\n"
+
+    first = worker.validate(bad)
+    second = worker.validate(bad)
+
+    assert not second["success"]
+    assert second["error"] == first["error"] == "name 'size' is not defined"
+    assert worker.cache.hits == 1
+
+
+def test_a_crashed_validation_process_is_not_cached(tmp_path):
+    worker = ValidationWorker(incremental=False, cache=ValidationCache(str(tmp_path), 10 * 1024 * 1024))
+    crash = "import os, signal\nos.kill(os.getpid(), signal.SIGKILL)\n"
+
+    outcome = worker.validate(crash, timeout=30)
+
+    assert not outcome["success"] and "Validation process died" in outcome["error"]
+    assert len(worker.cache) == 0
+
+
+def test_entries_survive_restart_and_evict_least_recently_used(tmp_path):
+    cache = ValidationCache(str(tmp_path), 10 * 1024 * 1024)
+    worker = ValidationWorker(incremental=False, cache=cache)
+    codes = [f"import cadquery as cq\nresult = cq.Workplane('XY').box({size}, 2, 2)\n" for size in (1, 2, 3)]
+    for code in codes:
+        worker.validate(code)
+    entry_size = cache.total_bytes // 3
+
+    reopened = ValidationCache(str(tmp_path), max_bytes=int(entry_size * 2.5))
+    assert len(reopened) == 3
+    assert reopened.get(codes[0]) is not None   # now the most recently used
+
+    reopened.put(codes[1], {"success": False, "error": "overwritten"})
+    assert reopened.total_bytes <= reopened.max_bytes
+    assert reopened.get(codes[2]) is None        # least recently used, evicted
+    assert reopened.get(codes[0])["success"]
+
+
+def test_cache_can_be_switched_off(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.workers.validation_worker.settings.validation_cache", True)
+    monkeypatch.setattr("src.workers.validation_worker.settings.validation_cache_dir", str(tmp_path / "cache"))
+
+    assert ValidationWorker(incremental=False, cache=False).cache is None
+    assert not (tmp_path / "cache").exists()
+    assert ValidationWorker(incremental=False).cache is not None